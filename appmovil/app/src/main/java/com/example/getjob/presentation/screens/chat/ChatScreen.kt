@@ -449,8 +449,9 @@ fun MessageInputField(
 
 fun formatTime(timestamp: String): String {
     return try {
-        // Formato simple: "HH:mm"
-        timestamp.substring(11, 16)
+        // "HH:mm" en la hora local del teléfono (el backend envía UTC)
+        val date = com.example.getjob.utils.ServerDateTime.parse(timestamp) ?: return ""
+        java.text.SimpleDateFormat("HH:mm", java.util.Locale.getDefault()).format(date)
     } catch (e: Exception) {
         ""
     }
@@ -285,8 +285,7 @@ fun StatusCard(
     val timeInfo = remember(expiresAt, isPlusActive) {
         if (isPlusActive && expiresAt != null) {
             try {
-                val inputFormat = java.text.SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss", java.util.Locale.getDefault())
-                val expiryDate = inputFormat.parse(expiresAt)
+                val expiryDate = com.example.getjob.utils.ServerDateTime.parse(expiresAt)
                 val now = java.util.Date()
                 expiryDate?.let {
                     val diffInMillis = it.time - now.time
@@ -775,9 +774,8 @@ fun PaymentDialog(
 
 fun formatDate(dateString: String): String {
     return try {
-        val inputFormat = SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss", Locale.getDefault())
         val outputFormat = SimpleDateFormat("dd/MM/yyyy", Locale.getDefault())
-        val date = inputFormat.parse(dateString)
+        val date = com.example.getjob.utils.ServerDateTime.parse(dateString)
         date?.let { outputFormat.format(it) } ?: dateString
     } catch (e: Exception) {
         dateString
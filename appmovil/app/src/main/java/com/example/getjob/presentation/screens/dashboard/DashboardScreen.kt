@@ -273,8 +273,7 @@ fun ModoPlusChip(
     val formattedDate = remember(plusExpiresAt) {
         if (isPlusActive && plusExpiresAt != null) {
             try {
-                val dateFormat = java.text.SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss", java.util.Locale.getDefault())
-                val date = dateFormat.parse(plusExpiresAt)
+                val date = com.example.getjob.utils.ServerDateTime.parse(plusExpiresAt)
                 val outputFormat = java.text.SimpleDateFormat("dd/MM/yyyy", java.util.Locale.getDefault())
                 outputFormat.format(date ?: java.util.Date())
             } catch (e: Exception) {
@@ -518,10 +517,8 @@ fun ServiceFiltersSection(
 
 fun formatCreatedDate(createdAt: String): String {
     return try {
-        val dateTime = java.time.LocalDateTime.parse(
-            createdAt.replace(" ", "T").substringBefore("."),
-            java.time.format.DateTimeFormatter.ISO_LOCAL_DATE_TIME
-        )
+        // Fecha del backend (UTC) en la hora local del teléfono
+        val dateTime = com.example.getjob.utils.ServerDateTime.toLocalDateTime(createdAt) ?: return "Ahora"
         val now = java.time.LocalDateTime.now()
         val today = now.toLocalDate()
         val createdDate = dateTime.toLocalDate()
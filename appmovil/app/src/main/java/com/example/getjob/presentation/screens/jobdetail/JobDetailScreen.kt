@@ -48,10 +48,8 @@ import kotlinx.coroutines.launch
 // Función auxiliar para formatear fecha (similar a DashboardScreen)
 fun formatCreatedDate(createdAt: String): String {
     return try {
-        val dateTime = java.time.LocalDateTime.parse(
-            createdAt.replace(" ", "T").substringBefore("."),
-            java.time.format.DateTimeFormatter.ISO_LOCAL_DATE_TIME
-        )
+        // Fecha del backend (UTC) en la hora local del teléfono
+        val dateTime = com.example.getjob.utils.ServerDateTime.toLocalDateTime(createdAt) ?: return "Ahora"
         val now = java.time.LocalDateTime.now()
         val today = now.toLocalDate()
         val createdDate = dateTime.toLocalDate()
@@ -48,9 +48,8 @@ import java.util.concurrent.TimeUnit
 // Función auxiliar para formatear fecha (compatible con API 24+)
 fun formatCreatedDate(createdAt: String): String {
     return try {
-        // Parsear fecha usando SimpleDateFormat (compatible con API 24+)
-        val inputFormat = java.text.SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss", java.util.Locale.getDefault())
-        val date = inputFormat.parse(createdAt.replace(" ", "T").substringBefore(".")) ?: return "Ahora"
+        // Fecha del backend (UTC) en la hora local del teléfono (compatible con API 24+)
+        val date = com.example.getjob.utils.ServerDateTime.parse(createdAt) ?: return "Ahora"
         
         val calendar = java.util.Calendar.getInstance()
         calendar.time = date
@@ -362,9 +362,8 @@ fun ClientProfileHeader(
 
 private fun formatDate(dateString: String): String {
     return try {
-        val inputFormat = java.text.SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss", java.util.Locale.getDefault())
         val outputFormat = java.text.SimpleDateFormat("dd/MM/yyyy", java.util.Locale.getDefault())
-        val date = inputFormat.parse(dateString)
+        val date = com.example.getjob.utils.ServerDateTime.parse(dateString)
         date?.let { outputFormat.format(it) } ?: dateString
     } catch (e: Exception) {
         dateString
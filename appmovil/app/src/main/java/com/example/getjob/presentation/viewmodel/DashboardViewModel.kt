@@ -296,14 +296,12 @@ class DashboardViewModel : ViewModel() {
                         
                         // Verificar si fue completado esta semana
                         try {
-                            val dateFormat = java.text.SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss", java.util.Locale.getDefault())
-                            val completedDate = job.completed_at?.let { dateFormat.parse(it) }
+                            val completedDate = com.example.getjob.utils.ServerDateTime.parse(job.completed_at)
                             completedDate != null && completedDate.time >= startOfWeek.timeInMillis
                         } catch (e: Exception) {
                             // Si no hay fecha de completado, usar created_at como fallback
                             try {
-                                val dateFormat = java.text.SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss", java.util.Locale.getDefault())
-                                val createdDate = dateFormat.parse(job.created_at)
+                                val createdDate = com.example.getjob.utils.ServerDateTime.parse(job.created_at)
                                 createdDate != null && createdDate.time >= startOfWeek.timeInMillis
                             } catch (e2: Exception) {
                                 false
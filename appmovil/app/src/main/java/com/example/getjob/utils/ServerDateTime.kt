@@ -0,0 +1,39 @@
+package com.example.getjob.utils
+
+import java.text.ParsePosition
+import java.text.SimpleDateFormat
+import java.util.Date
+import java.util.Locale
+import java.util.TimeZone
+
+/**
+ * Fechas que envía el backend
+ *
+ * El backend guarda y envía todas las fechas en UTC, en ISO 8601 con zona
+ * ("2026-10-19T17:30:00Z", a veces con fracción de segundos). Las que llegan
+ * sin zona (respuestas cacheadas de versiones anteriores) también se leen
+ * como UTC. Para mostrarlas se convierten a la zona del teléfono.
+ */
+object ServerDateTime {
+    private const val PATTERN = "yyyy-MM-dd'T'HH:mm:ss"
+
+    /**
+     * Instante de una fecha del backend (null si falta o no se puede leer)
+     */
+    fun parse(value: String?): Date? {
+        if (value.isNullOrBlank()) return null
+        val format = SimpleDateFormat(PATTERN, Locale.US).apply {
+            timeZone = TimeZone.getTimeZone("UTC")
+        }
+        // Solo fecha y hora: la fracción de segundos y la "Z" quedan sin leer
+        return format.parse(value.trim().replace(" ", "T"), ParsePosition(0))
+    }
+
+    /**
+     * Fecha del backend en la hora local del teléfono (para comparar con LocalDateTime.now())
+     */
+    fun toLocalDateTime(value: String?): java.time.LocalDateTime? {
+        val date = parse(value) ?: return null
+        return date.toInstant().atZone(java.time.ZoneId.systemDefault()).toLocalDateTime()
+    }
+}
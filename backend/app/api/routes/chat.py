@@ -2,15 +2,18 @@ from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, HTTPExce
 from sqlalchemy.orm import Session
 from typing import List, Dict, Optional, Tuple
 import json
+from app.config import settings
 from app.database import get_db
 from app.utils.dependencies import get_current_user
 from app.models.user import User
 from app.models.job import Job
 from app.schemas.message import MessageCreate, MessageResponse
 from app.services.chat_service import ChatService
+from app.utils.fast_json import compact_mode, list_response, message_row
+from app.utils.query_budget import BudgetedRoute, query_budget, statement_budget
 from app.utils.security import decode_access_token
 
-router = APIRouter(prefix="/api/chat", tags=["Chat"])
+router = APIRouter(prefix="/api/chat", tags=["Chat"], route_class=BudgetedRoute)
 
 # Almacenar conexiones WebSocket activas por (job_id, application_id)
 # application_id puede ser None para chats generales (trabajo aceptado)
@@ -120,6 +123,11 @@ async def websocket_endpoint(websocket: WebSocket, job_id: int):
             "message": "Conectado al chat"
         })
         
+        # La conexión puede durar horas: la sesión del handshake se libera aquí y
+        # cada mensaje abre la suya, así create_message lee el trabajo actual
+        # (worker_id, estado) y no el que quedó en el identity map al conectarse
+        db.close()
+        
         # Escuchar mensajes
         try:
             while True:
@@ -135,50 +143,12 @@ async def websocket_endpoint(websocket: WebSocket, job_id: int):
                     image_url=message_data.get("image_url", None)
                 )
                 
-                message = ChatService.create_message(db, message_create, user.id)
-                message_response = ChatService.message_to_response(message)
-                
-                # Enviar mensaje a todos los conectados a este job + application_id
-                if connection_key in active_connections:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.info(
-                        f"Enviando mensaje WebSocket a {len(active_connections[connection_key])} "
-                        f"conexiones para job {job_id} (application_id={resolved_application_id})"
-                    )
-                    
-                    disconnected = []
-                    for conn in active_connections[connection_key]:
-                        try:
-                            # Usar model_dump con mode='json' para serializar datetime correctamente
-                            # Si model_dump no existe (Pydantic v1), usar dict() con conversión manual
-                            try:
-                                message_dict = message_response.model_dump(mode='json')
-                            except AttributeError:
-                                # Fallback para Pydantic v1
-                                from datetime import datetime
-                                message_dict = message_response.dict()
-                                # Convertir datetime a string manualmente
-                                if 'created_at' in message_dict and isinstance(message_dict['created_at'], datetime):
-                                    message_dict['created_at'] = message_dict['created_at'].isoformat()
-                            
-                            await conn.send_json({
-                                "type": "message",
-                                "data": message_dict
-                            })
-                            logger.info(f"Mensaje WebSocket enviado exitosamente")
-                        except Exception as e:
-                            logger.error(f"Error al enviar mensaje WebSocket: {str(e)}")
-                            import traceback
-                            logger.error(f"Traceback: {traceback.format_exc()}")
-                            disconnected.append(conn)
-                    
-                    # Remover conexiones desconectadas
-                    for conn in disconnected:
-                        active_connections[connection_key].remove(conn)
-                        logger.warning(f"Conexión WebSocket desconectada removida")
-                    if not active_connections[connection_key]:
-                        del active_connections[connection_key]
+                # El mensaje llega a la sala (incluida esta conexión) por el outbox
+                # Sesión nueva: trabajo, postulación, trabajador, remitente, INSERT y outbox
+                with statement_budget(6, "WS /api/chat/ws/{job_id}: mensaje"), SessionLocal() as message_db:
+                    ChatService.create_message(message_db, message_create, user.id)
+                from app.services.outbox import outbox_dispatcher
+                outbox_dispatcher.kick()
         
         except WebSocketDisconnect:
             # Remover conexión al desconectarse
@@ -193,18 +163,23 @@ async def websocket_endpoint(websocket: WebSocket, job_id: int):
 
 
 @router.get("/{job_id}/messages", response_model=List[MessageResponse])
+@query_budget(5)
 async def get_messages(
     job_id: int,
     application_id: Optional[int] = None,
+    compact: bool = Depends(compact_mode),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Obtiene el historial de mensajes de un trabajo (opcionalmente filtrado por aplicación)"""
     messages = ChatService.get_messages_by_job(db, job_id, current_user.id, application_id)
-    return [ChatService.message_to_response(msg) for msg in messages]
+    if not settings.FAST_JSON_RESPONSES and not compact:
+        return [ChatService.message_to_response(msg) for msg in messages]
+    return list_response(messages, message_row, compact=compact)
 
 
 @router.post("/{job_id}/send", response_model=MessageResponse)
+@query_budget(6)
 async def send_message(
     job_id: int,
     message_create: MessageCreate,
@@ -214,116 +189,42 @@ async def send_message(
     """Envía un mensaje (endpoint REST alternativo)"""
     message_create.job_id = job_id
     message = ChatService.create_message(db, message_create, current_user.id)
-    message_response = ChatService.message_to_response(message)
     
-    # Enviar a conexiones WebSocket activas (solo las del mismo trabajo + application_id)
-    connection_key: ConnectionKey = (job_id, message.application_id)
+    # La sala de chat y el dashboard del cliente reciben el mensaje por el outbox
+    # (escrito en la misma transacción); kick() lo entrega ya en este proceso
+    from app.services.outbox import outbox_dispatcher
+    outbox_dispatcher.kick()
+    
+    return ChatService.message_to_response(message)
+
+
+async def broadcast_to_room(connection_key: ConnectionKey, payload: dict) -> int:
+    """Envía payload a las conexiones de la sala (job_id, application_id) de este proceso
     
+    Retorna a cuántas conexiones se envió. Las conexiones rotas se eliminan.
+    """
     import logging
     logger = logging.getLogger(__name__)
-    logger.info(f"🔍 Buscando conexiones WebSocket para job_id={job_id}, application_id={message.application_id}")
-    logger.info(f"🔍 Connection key: {connection_key}")
-    logger.info(f"🔍 Conexiones activas totales: {len(active_connections)}")
-    logger.info(f"🔍 Keys disponibles: {list(active_connections.keys())}")
-    
-    if connection_key in active_connections:
-        logger.info(
-            f"✅ Enviando mensaje a {len(active_connections[connection_key])} conexiones WebSocket "
-            f"para job {job_id} (application_id={message.application_id})"
-        )
-        
-        disconnected = []
-        for conn in active_connections[connection_key]:
-            try:
-                # Usar model_dump con mode='json' para serializar datetime correctamente
-                # Si model_dump no existe (Pydantic v1), usar dict() con json_encoders
-                try:
-                    message_dict = message_response.model_dump(mode='json')
-                except AttributeError:
-                    # Fallback para Pydantic v1
-                    from datetime import datetime
-                    import json
-                    message_dict = message_response.dict()
-                    # Convertir datetime a string manualmente
-                    if 'created_at' in message_dict and isinstance(message_dict['created_at'], datetime):
-                        message_dict['created_at'] = message_dict['created_at'].isoformat()
-                
-                await conn.send_json({
-                    "type": "message",
-                    "data": message_dict
-                })
-                logger.info(f"✅✅✅ Mensaje enviado exitosamente a una conexión WebSocket")
-            except Exception as e:
-                logger.error(f"❌❌❌ Error al enviar mensaje a WebSocket: {str(e)}")
-                logger.error(f"❌❌❌ Tipo de error: {type(e).__name__}")
-                import traceback
-                logger.error(f"❌❌❌ Traceback: {traceback.format_exc()}")
-                disconnected.append(conn)
-        
-        # Remover conexiones desconectadas
-        for conn in disconnected:
-            active_connections[connection_key].remove(conn)
-            logger.warning(f"⚠️ Conexión WebSocket desconectada removida")
-        if not active_connections[connection_key]:
-            del active_connections[connection_key]
-    else:
-        logger.warning(f"⚠️⚠️⚠️ NO HAY CONEXIONES WEBSOCKET ACTIVAS para connection_key={connection_key}")
-        logger.warning(f"⚠️⚠️⚠️ Esto significa que ningún cliente está conectado por WebSocket")
-    
-    # Enviar notificación al dashboard del cliente (si es que el mensaje no fue enviado por el cliente)
-    # Esto permite que el cliente vea nuevos mensajes en su dashboard sin necesidad de recargar
-    # IMPORTANTE: Hacer esto de forma asíncrona para no bloquear la respuesta
-    import asyncio
-    from app.api.routes.notifications import send_dashboard_notification
-    from app.models.job import Job
-    from app.models.worker import Worker
-    from sqlalchemy.orm import joinedload
     
-    # Obtener el trabajo con relaciones cargadas para incluir info del trabajador
-    job = db.query(Job).options(
-        joinedload(Job.worker).joinedload(Worker.user)
-    ).filter(Job.id == job_id).first()
+    connections = active_connections.get(connection_key)
+    if not connections:
+        return 0
     
-    if job and job.client_id != current_user.id:
-        # Preparar datos del trabajador para la notificación
-        worker_info = None
-        if job.worker and job.worker.user:
-            worker_info = {
-                "id": job.worker.id,
-                "full_name": job.worker.user.full_name,
-                "phone": job.worker.user.phone,
-                "profile_image_url": job.worker.user.profile_image_url,
-                "is_verified": job.worker.is_verified
-            }
-        
-        # Si el mensaje fue enviado por un trabajador, incluir su info
-        sender_info = None
-        if current_user.role.value == "worker":
-            sender_info = {
-                "id": current_user.id,
-                "full_name": current_user.full_name,
-                "phone": current_user.phone,
-                "profile_image_url": current_user.profile_image_url
-            }
-        
-        notification_data = {
-            "job_id": job_id,
-            "application_id": message.application_id,
-            "message_id": message.id,
-            "sender_id": current_user.id,
-            "sender_name": current_user.full_name,
-            "sender_info": sender_info,  # Info completa del trabajador que envió el mensaje
-            "worker_info": worker_info,  # Info del trabajador asignado al trabajo
-            "content": message.content[:100] if message.content else "",  # Primeros 100 caracteres
-            "created_at": message.created_at.isoformat() if message.created_at else None
-        }
-        
-        # Enviar notificación de forma asíncrona (no bloquear la respuesta)
+    sent = 0
+    disconnected = []
+    for conn in list(connections):
         try:
-            await send_dashboard_notification(job.client_id, "new_message", notification_data)
-            logger.info(f"📬 Notificación de nuevo mensaje enviada al dashboard del cliente (user_id={job.client_id})")
+            await conn.send_json(payload)
+            sent += 1
         except Exception as e:
-            logger.error(f"❌ Error al enviar notificación al dashboard: {e}")
+            logger.error(f"Error al enviar mensaje WebSocket: {str(e)}")
+            disconnected.append(conn)
     
-    return message_response
-
+    # Remover conexiones desconectadas
+    for conn in disconnected:
+        if conn in connections:
+            connections.remove(conn)
+            logger.warning(f"Conexión WebSocket desconectada removida")
+    if not connections and connection_key in active_connections:
+        del active_connections[connection_key]
+    return sent
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
@@ -7,16 +7,22 @@ from app.models.user import User
 from app.schemas.commission import CommissionResponse, CommissionSubmitPayment
 from app.services.commission_service import CommissionService
 from app.services.worker_service import WorkerService
+from app.utils.caching import conditional_response
 
 router = APIRouter(prefix="/api/commissions", tags=["Commissions"])
 
 
 @router.get("/pending", response_model=List[CommissionResponse])
 async def get_pending_commissions(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Obtiene comisiones pendientes del trabajador actual"""
+    """Obtiene comisiones pendientes del trabajador actual
+    
+    Soporta If-None-Match: responde 304 si los datos no cambiaron desde el último poll.
+    """
     from app.models.user import UserRole
     
     # Validar que el usuario sea trabajador
@@ -26,6 +32,10 @@ async def get_pending_commissions(
             detail="Solo los trabajadores pueden ver sus comisiones"
         )
     
+    cached = conditional_response(request, response, current_user, "commissions:pending")
+    if cached:
+        return cached
+    
     worker = WorkerService.get_worker_by_user_id(db, current_user.id)
     
     if not worker:
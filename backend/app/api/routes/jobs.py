@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.config import settings
 from app.database import get_db
 from app.utils.dependencies import get_current_user
 from app.models.user import User
@@ -9,11 +10,19 @@ from app.schemas.job import JobCreate, JobResponse, JobUpdate, JobAccept, JobAdd
 from app.schemas.job_application import JobApplicationResponse
 from app.schemas.rating import RatingCreate, RatingResponse
 from app.services.job_service import JobService
+from app.services.outbox import outbox_dispatcher
+from app.utils.caching import conditional_response
+from app.utils.fast_json import (
+    application_row, compact_mode, item_response, job_row, list_response, redacted_job_row, representation_scope
+)
+from app.utils.sparse_fields import Fields, application_fields, job_fields
+from app.utils.query_budget import BudgetedRoute, query_budget
 
-router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"], route_class=BudgetedRoute)
 
 
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
 async def create_job(
     job_create: JobCreate,
     current_user: User = Depends(get_current_user),
@@ -34,21 +43,36 @@ async def create_job(
 
 
 @router.get("/available", response_model=List[JobResponse])
+@query_budget(3)
 async def get_available_jobs(
     service_type: Optional[str] = None,
     search: Optional[str] = None,
+    sort: str = "relevance",
+    limit: int = Query(50, ge=1, le=100),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+    compact: bool = Depends(compact_mode),
+    fields: Fields = Depends(job_fields),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Obtiene trabajos disponibles (pendientes) - Solo para trabajadores
     
+    - sort="relevance" (por defecto): ranking por tipo de servicio del trabajador,
+      distancia (si envía lat/lon), antigüedad, tarifa y reputación del cliente
+    - sort="recent": más recientes primero
+    - Con search se usa siempre el orden por recientes
+    
+    Se responde desde el índice en memoria de trabajos pendientes (ver pending_job_index),
+    así que fields= solo reduce la respuesta (no hay consulta que reducir).
+    
     Si el trabajador NO tiene Modo Plus activo:
     - Ve títulos, tipo de servicio, quizá distrito
     - NO ve teléfono ni dirección exacta ni otros datos de contacto
     """
     from app.models.user import UserRole
+    from app.services.subscription_expiry import plus_active
     from app.services.worker_service import WorkerService
-    from datetime import datetime
     
     # Verificar que el usuario es trabajador
     if current_user.role != UserRole.WORKER:
@@ -57,16 +81,24 @@ async def get_available_jobs(
             detail="Solo los trabajadores pueden ver trabajos disponibles"
         )
     
-    # Verificar si tiene Modo Plus activo
+    # Verificar si tiene Modo Plus activo (flag y vencimiento: la tarea de
+    # expiración puede no haber apagado todavía is_plus_active)
     worker = WorkerService.get_worker_by_user_id(db, current_user.id)
-    is_plus = False
-    if worker:
-        now = datetime.utcnow()
-        is_plus = bool(worker.is_plus_active and worker.plus_expires_at and worker.plus_expires_at > now)
+    is_plus = plus_active(worker)
+    
+    if sort not in ("relevance", "recent"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Orden inválido. Opciones: relevance, recent"
+        )
     
     # Obtener trabajos con manejo de errores
     try:
-        jobs = JobService.get_available_jobs(db, service_type, search)
+        from app.services.job_feed_service import JobFeedService
+        if sort == "relevance" and not (search and search.strip()):
+            jobs = JobFeedService.get_ranked_jobs(db, worker, service_type, limit, lat, lon)
+        else:
+            jobs = JobFeedService.get_recent_jobs(db, service_type, search, limit)
     except Exception as e:
         import logging
         import traceback
@@ -79,22 +111,34 @@ async def get_available_jobs(
         )
     
     # Si no tiene Plus, redactar datos sensibles del cliente
-    if not is_plus:
-        for job in jobs:
-            if job.client:
-                job.client.phone = None
-                # No redactamos address porque es parte del JobBase, pero podríamos hacerlo
-                # Por ahora dejamos address visible pero sin phone
+    # Las respuestas vienen del índice compartido: se redacta al serializar, sin tocarlas
+    # No redactamos address porque es parte del JobBase, pero podríamos hacerlo
+    # Por ahora dejamos address visible pero sin phone
+    if not settings.FAST_JSON_RESPONSES and not is_plus:
+        jobs = [
+            job.model_copy(update={"client": job.client.model_copy(update={"phone": None})})
+            if job.client else job
+            for job in jobs
+        ]
     
-    return jobs
+    return list_response(jobs, job_row if is_plus else redacted_job_row, compact=compact, fields=fields)
 
 
 @router.get("/my-jobs", response_model=List[JobResponse])
+@query_budget(3)
 async def get_my_jobs(
+    request: Request,
+    response: Response,
+    compact: bool = Depends(compact_mode),
+    fields: Fields = Depends(job_fields),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Obtiene los trabajos del usuario actual (trabajador o cliente)"""
+    """Obtiene los trabajos del usuario actual (trabajador o cliente)
+    
+    Soporta If-None-Match: responde 304 si los datos no cambiaron desde el último poll.
+    En modo compacto se omiten los null y el bloque del propio usuario (client o worker).
+    """
     from app.services.worker_service import WorkerService
     from app.models.user import UserRole
     
@@ -105,6 +149,12 @@ async def get_my_jobs(
             detail="Solo los trabajadores y clientes pueden ver sus trabajos"
         )
     
+    cached = conditional_response(
+        request, response, current_user, representation_scope("jobs:my-jobs", compact, fields)
+    )
+    if cached:
+        return cached
+    
     if current_user.role == UserRole.WORKER:
         # Si es trabajador, obtener sus trabajos asignados
         worker = WorkerService.get_worker_by_user_id(db, current_user.id)
@@ -113,18 +163,30 @@ async def get_my_jobs(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No tienes un perfil de trabajador"
             )
-        return JobService.get_worker_jobs(db, worker.id)
+        jobs = JobService.get_worker_jobs(db, worker.id, fields)
+        own_block = "worker"
     else:
         # Si es cliente, obtener sus trabajos creados
-        return JobService.get_client_jobs(db, current_user.id)
+        jobs = JobService.get_client_jobs(db, current_user.id, fields)
+        own_block = "client"
+    return list_response(jobs, job_row, response, compact=compact, omit=(own_block,), fields=fields)
 
 
 @router.get("/my-applications", response_model=List[JobApplicationResponse])
+@query_budget(3)
 async def get_my_applications(
+    request: Request,
+    response: Response,
+    compact: bool = Depends(compact_mode),
+    fields: Fields = Depends(application_fields),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Obtiene las aplicaciones del trabajador actual"""
+    """Obtiene las aplicaciones del trabajador actual
+    
+    Soporta If-None-Match: responde 304 si los datos no cambiaron desde el último poll.
+    En modo compacto se omiten los null y el bloque worker (es el propio trabajador).
+    """
     from app.models.user import UserRole
     from app.services.worker_service import WorkerService
     
@@ -135,6 +197,12 @@ async def get_my_applications(
             detail="Solo los trabajadores pueden ver sus aplicaciones"
         )
     
+    cached = conditional_response(
+        request, response, current_user, representation_scope("jobs:my-applications", compact, fields)
+    )
+    if cached:
+        return cached
+    
     # Obtener el worker_id del usuario actual
     worker = WorkerService.get_worker_by_user_id(db, current_user.id)
     
@@ -144,16 +212,19 @@ async def get_my_applications(
             detail="No tienes un perfil de trabajador"
         )
     
-    applications = JobService.get_worker_applications(db, worker.id)
+    applications = JobService.get_worker_applications(db, worker.id, fields)
     
-    # Usar from_attributes=True para mapear automáticamente desde ORM
-    # Las relaciones ya están cargadas (worker, job)
-    return applications
+    # Modelos de lectura con el trabajador ya incluido
+    return list_response(
+        applications, application_row, response, compact=compact, omit=("worker",), fields=fields
+    )
 
 
 @router.get("/{job_id}", response_model=JobResponse)
+@query_budget(4)
 async def get_job(
     job_id: int,
+    fields: Fields = Depends(job_fields),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -200,10 +271,11 @@ async def get_job(
             detail="No tienes permiso para ver este trabajo"
         )
     
-    return job
+    return item_response(job, job_row, fields)
 
 
 @router.post("/{job_id}/apply", response_model=JobResponse)
+@query_budget(6)  # 5 + la lectura del trabajo si el índice de este proceso aún no lo tiene
 async def apply_to_job(
     job_id: int,
     current_user: User = Depends(get_current_user),
@@ -236,13 +308,19 @@ async def apply_to_job(
             detail="Debes estar disponible para aplicar a trabajos. Activa tu disponibilidad en tu perfil."
         )
     
-    # Aplicar al trabajo (NO cambia el estado)
-    JobService.apply_to_job(db, job_id, worker.id)
+    # Aplicar al trabajo (NO cambia el estado); el Modo Plus se valida con este perfil
+    JobService.apply_to_job(db, job_id, worker)
+    # El aviso al cliente va por el outbox (misma transacción): entregarlo ya
+    outbox_dispatcher.kick()
     
-    # Devolver el trabajo actualizado
-    return JobService.get_job_by_id(db, job_id)
+    # Aplicar no modifica el trabajo (sigue PENDING): devolver el snapshot del
+    # índice en memoria y consultar la BD solo si el trabajo no está indexado
+    from app.services.pending_job_index import pending_job_index
+    snapshot = pending_job_index.get(job_id)
+    return snapshot if snapshot is not None else JobService.get_job_by_id(db, job_id)
 
 @router.post("/{job_id}/accept-worker/{application_id}", response_model=JobResponse)
+@query_budget(6)
 async def client_accept_worker(
     job_id: int,
     application_id: int,
@@ -259,12 +337,17 @@ async def client_accept_worker(
             detail="Solo los clientes pueden aceptar trabajadores"
         )
     
-    return JobService.client_accept_worker(db, job_id, application_id, current_user.id)
+    job = JobService.client_accept_worker(db, job_id, application_id, current_user.id)
+    outbox_dispatcher.kick()
+    return job
 
 
 @router.get("/{job_id}/applications", response_model=List[JobApplicationResponse])
+@query_budget(3)
 async def get_job_applications(
     job_id: int,
+    compact: bool = Depends(compact_mode),
+    fields: Fields = Depends(application_fields),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -278,21 +361,20 @@ async def get_job_applications(
             detail="Solo los clientes pueden ver las aplicaciones"
         )
     
-    applications = JobService.get_job_applications(db, job_id, current_user.id)
+    applications = JobService.get_job_applications(db, job_id, current_user.id, fields)
     
-    # Usar from_attributes=True para mapear automáticamente desde ORM
-    # Las relaciones ya están cargadas (worker con user)
-    return applications
+    # Modelos de lectura con el trabajador ya incluido
+    return list_response(applications, application_row, compact=compact, fields=fields)
 
 
 @router.post("/{job_id}/start-route", response_model=JobResponse)
+@query_budget(6)
 async def start_route(
     job_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Inicia ruta al cliente"""
-    from app.services.worker_service import WorkerService
     from app.models.user import UserRole
     
     # Validar que es trabajador
@@ -302,25 +384,20 @@ async def start_route(
             detail="Solo los trabajadores pueden iniciar ruta"
         )
     
-    # Obtener el worker_id del usuario actual
-    worker = WorkerService.get_worker_by_user_id(db, current_user.id)
-    if not worker:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No tienes un perfil de trabajador"
-        )
-    
-    return JobService.update_job_status(db, job_id, JobStatus.IN_ROUTE, worker.id)
+    # La guarda "trabajador asignado" va dentro del UPDATE de la transición
+    job = JobService.update_job_status(db, job_id, JobStatus.IN_ROUTE, current_user)
+    outbox_dispatcher.kick()
+    return job
 
 
 @router.post("/{job_id}/confirm-arrival", response_model=JobResponse)
+@query_budget(6)
 async def confirm_arrival(
     job_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Confirma llegada al sitio"""
-    from app.services.worker_service import WorkerService
     from app.models.user import UserRole
     
     # Validar que es trabajador
@@ -330,25 +407,20 @@ async def confirm_arrival(
             detail="Solo los trabajadores pueden confirmar llegada"
         )
     
-    # Obtener el worker_id del usuario actual
-    worker = WorkerService.get_worker_by_user_id(db, current_user.id)
-    if not worker:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No tienes un perfil de trabajador"
-        )
-    
-    return JobService.update_job_status(db, job_id, JobStatus.ON_SITE, worker.id)
+    # La guarda "trabajador asignado" va dentro del UPDATE de la transición
+    job = JobService.update_job_status(db, job_id, JobStatus.ON_SITE, current_user)
+    outbox_dispatcher.kick()
+    return job
 
 
 @router.post("/{job_id}/start-service", response_model=JobResponse)
+@query_budget(6)
 async def start_service(
     job_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Inicia el servicio"""
-    from app.services.worker_service import WorkerService
     from app.models.user import UserRole
     
     # Validar que es trabajador
@@ -358,18 +430,14 @@ async def start_service(
             detail="Solo los trabajadores pueden iniciar servicio"
         )
     
-    # Obtener el worker_id del usuario actual
-    worker = WorkerService.get_worker_by_user_id(db, current_user.id)
-    if not worker:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No tienes un perfil de trabajador"
-        )
-    
-    return JobService.update_job_status(db, job_id, JobStatus.IN_PROGRESS, worker.id)
+    # La guarda "trabajador asignado" va dentro del UPDATE de la transición
+    job = JobService.update_job_status(db, job_id, JobStatus.IN_PROGRESS, current_user)
+    outbox_dispatcher.kick()
+    return job
 
 
 @router.post("/{job_id}/add-extra", response_model=JobResponse)
+@query_budget(6)
 async def add_extra(
     job_id: int,
     extra_data: JobAddExtra,
@@ -406,13 +474,13 @@ async def add_extra(
 
 
 @router.post("/{job_id}/complete", response_model=JobResponse)
+@query_budget(6)
 async def complete_job(
     job_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Finaliza el trabajo (crea comisión automáticamente)"""
-    from app.services.worker_service import WorkerService
     from app.models.user import UserRole
     
     # Validar que es trabajador
@@ -422,83 +490,32 @@ async def complete_job(
             detail="Solo los trabajadores pueden completar trabajos"
         )
     
-    # Obtener el worker_id del usuario actual
-    worker = WorkerService.get_worker_by_user_id(db, current_user.id)
-    if not worker:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No tienes un perfil de trabajador"
-        )
-    
-    return JobService.update_job_status(db, job_id, JobStatus.COMPLETED, worker.id)
+    # La guarda "trabajador asignado" va dentro del UPDATE de la transición
+    job = JobService.update_job_status(db, job_id, JobStatus.COMPLETED, current_user)
+    outbox_dispatcher.kick()
+    return job
 
 
 @router.post("/{job_id}/cancel", response_model=JobResponse)
+@query_budget(6)
 async def cancel_job(
     job_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Cancela un trabajo - Solo el cliente puede cancelar su trabajo"""
-    from app.models.user import UserRole
-    
-    # Obtener el trabajo
-    job = JobService.get_job_by_id(db, job_id)
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Trabajo no encontrado"
-        )
-    
-    # Validar permisos: Solo el cliente puede cancelar su trabajo
-    if current_user.role == UserRole.CLIENT:
-        if job.client_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Solo puedes cancelar tus propios trabajos"
-            )
-        # El cliente solo puede cancelar si el trabajo no está completado
-        if job.status == JobStatus.COMPLETED:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No puedes cancelar un trabajo que ya está completado"
-            )
-        if job.status == JobStatus.CANCELLED:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Este trabajo ya está cancelado"
-            )
-    elif current_user.role == UserRole.WORKER:
-        # El trabajador solo puede cancelar si el trabajo está en estado PENDING o ACCEPTED
-        from app.services.worker_service import WorkerService
-        worker = WorkerService.get_worker_by_user_id(db, current_user.id)
-        if not worker or job.worker_id != worker.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes permiso para cancelar este trabajo"
-            )
-        # Validar que el trabajo no esté ya cancelado
-        if job.status == JobStatus.CANCELLED:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Este trabajo ya está cancelado"
-            )
-        # Validar que el trabajo no esté completado
-        if job.status == JobStatus.COMPLETED:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No puedes cancelar un trabajo que ya está completado"
-            )
-        if job.status not in [JobStatus.PENDING, JobStatus.ACCEPTED]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No puedes cancelar un trabajo que ya está en progreso"
-            )
+    """Cancela un trabajo
     
-    return JobService.update_job_status(db, job_id, JobStatus.CANCELLED)
+    Cliente: sus propios trabajos mientras no estén completados.
+    Trabajador: el trabajo asignado, solo si está PENDING o ACCEPTED.
+    Las reglas están en la tabla de transiciones (app.services.job_state_machine).
+    """
+    job = JobService.update_job_status(db, job_id, JobStatus.CANCELLED, current_user)
+    outbox_dispatcher.kick()
+    return job
 
 
 @router.post("/{job_id}/rate", response_model=RatingResponse)
+@query_budget(6)
 async def rate_job(
     job_id: int,
     rating_data: RatingCreate,
@@ -530,6 +547,7 @@ async def rate_job(
 
 
 @router.post("/{job_id}/rate-worker", response_model=RatingResponse)
+@query_budget(5)
 async def rate_worker(
     job_id: int,
     rating_data: RatingCreate,
@@ -551,6 +569,7 @@ async def rate_worker(
 
 
 @router.get("/{job_id}/rating", response_model=RatingResponse)
+@query_budget(2)
 async def get_job_rating(
     job_id: int,
     current_user: User = Depends(get_current_user),
@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import List
+from app.config import settings
 from app.database import get_db
 from app.utils.dependencies import get_current_user
 from app.models.user import User, UserRole
 from app.schemas.commission import CommissionResponse, CommissionReview
+from app.schemas.job import JobBatchStatusRequest, JobBatchStatusResponse
 from app.services.commission_service import CommissionService
+from app.services.job_service import JobService
 
 router = APIRouter(prefix="/api/manager", tags=["Manager"])
 
@@ -52,3 +56,117 @@ async def reject_payment(
     verify_manager(current_user)
     return CommissionService.reject_payment(db, commission_id, current_user.id, review_data)
 
+
+
+@router.post("/jobs/batch-status", response_model=JobBatchStatusResponse)
+async def batch_update_job_status(
+    batch: JobBatchStatusRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Manager cambia el estado de muchos trabajos en una sola transacción
+    
+    Cada item se valida contra la máquina de estados; los rechazados se
+    reportan en results sin afectar al resto del lote.
+    """
+    verify_manager(current_user)
+    results = JobService.update_jobs_status_batch(
+        db,
+        [(item.job_id, item.target_status) for item in batch.items],
+        current_user.role,
+        current_user.id
+    )
+    from app.services.outbox import outbox_dispatcher
+    outbox_dispatcher.kick()
+    applied = sum(1 for result in results if result["applied"])
+    return {"applied": applied, "rejected": len(results) - applied, "results": results}
+
+
+@router.get("/maintenance/stale-jobs")
+async def get_stale_job_sweep_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    """Métricas del barrido de trabajos PENDING vencidos (este proceso)"""
+    verify_manager(current_user)
+    from app.services.stale_job_sweeper import stale_job_sweep_metrics
+    return {
+        **stale_job_sweep_metrics.snapshot(),
+        "max_age_hours": settings.STALE_JOB_MAX_AGE_HOURS,
+        "interval_seconds": settings.STALE_JOB_SWEEP_INTERVAL_SECONDS,
+        "batch_size": settings.STALE_JOB_SWEEP_BATCH_SIZE,
+    }
+
+
+@router.post("/maintenance/stale-jobs/sweep")
+async def sweep_stale_jobs(
+    current_user: User = Depends(get_current_user)
+):
+    """Ejecuta el barrido de trabajos vencidos ahora (sin esperar al intervalo)"""
+    verify_manager(current_user)
+    from starlette.concurrency import run_in_threadpool
+    from app.services.stale_job_sweeper import StaleJobSweeper
+    from app.services.outbox import outbox_dispatcher
+    result = await run_in_threadpool(StaleJobSweeper.run_once)
+    outbox_dispatcher.kick()
+    return {"swept": result["swept"], "batches": result["batches"]}
+
+
+@router.get("/maintenance/scheduler")
+async def get_scheduler_status(
+    current_user: User = Depends(get_current_user)
+):
+    """Tareas periódicas de este proceso: programación, tiempos y errores"""
+    verify_manager(current_user)
+    from app.scheduler import scheduler
+    return scheduler.snapshot()
+
+
+@router.get("/maintenance/slow-queries")
+async def get_slow_queries(
+    current_user: User = Depends(get_current_user)
+):
+    """Consultas SQL lentas recientes de este proceso (sentencia, origen y plan)"""
+    verify_manager(current_user)
+    from app.utils.slow_queries import slow_query_log
+    return slow_query_log.snapshot()
+
+
+@router.delete("/maintenance/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(
+    current_user: User = Depends(get_current_user)
+):
+    """Vacía el registro de consultas lentas (por ejemplo, tras aplicar un índice)"""
+    verify_manager(current_user)
+    from app.utils.slow_queries import slow_query_log
+    slow_query_log.clear()
+
+
+@router.get("/maintenance/profiles")
+async def get_request_profiles(
+    current_user: User = Depends(get_current_user)
+):
+    """Perfiles recientes de requests de este proceso (sin las pilas)"""
+    verify_manager(current_user)
+    from app.utils.profiling import profile_store
+    return {
+        "enabled": settings.PROFILING_ENABLED,
+        "sample_rate": settings.PROFILING_SAMPLE_RATE,
+        "profiles": profile_store.summaries(),
+    }
+
+
+@router.get("/maintenance/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_request_profile(
+    profile_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """Pilas de un perfil en formato collapsed (flamegraph.pl, speedscope)"""
+    verify_manager(current_user)
+    from app.utils.profiling import profile_store
+    session = profile_store.get(profile_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Perfil no encontrado"
+        )
+    return PlainTextResponse(session.collapsed())
@@ -42,6 +42,9 @@ async def dashboard_websocket_endpoint(websocket: WebSocket):
     - Nuevas aplicaciones de trabajadores
     - Cambios de estado en trabajos
     - Etc.
+    
+    Las notificaciones llegan desde el outbox (app.services.outbox) e incluyen
+    data.event_id. Al reconectar, ?last_event_id=N reenvía las posteriores a N.
     """
     await websocket.accept()
     
@@ -81,6 +84,14 @@ async def dashboard_websocket_endpoint(websocket: WebSocket):
             "user_id": user.id
         })
         
+        # Replay: notificaciones que el cliente no recibió mientras estaba desconectado
+        # (el cliente envía el último event_id que procesó)
+        last_event_id = websocket.query_params.get("last_event_id")
+        if last_event_id and last_event_id.isdigit():
+            from app.services.outbox import OutboxService, dashboard_message
+            for event in OutboxService.events_for_user(db, user.id, int(last_event_id)):
+                await websocket.send_json(dashboard_message(event))
+        
         # Mantener conexión abierta y escuchar mensajes
         try:
             while True:
@@ -131,10 +142,11 @@ async def send_dashboard_notification(user_id: int, notification_type: str, data
             "data": data
         }
         
-        # Intentar serializar datetime si existe
+        # Intentar serializar datetime si existe (UTC con "Z", igual que la API)
         from datetime import datetime
+        from app.schemas.datetimes import utc_isoformat
         if 'created_at' in data and isinstance(data.get('created_at'), datetime):
-            data['created_at'] = data['created_at'].isoformat()
+            data['created_at'] = utc_isoformat(data['created_at'])
         
         await websocket.send_json(notification)
         logger.info(f"✅ Notificación '{notification_type}' enviada a user_id={user_id}")
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
 from app.utils.dependencies import get_current_user
 from app.models.user import User
 from app.services.subscription_service import SubscriptionService
+from app.utils.caching import conditional_response
 from app.schemas.subscription import (
     CreateSubscriptionRequest,
     SubscriptionResponse,
@@ -30,9 +31,16 @@ async def subscribe(
 
 @router.get("/me/status", response_model=SubscriptionStatusResponse)
 async def get_my_subscription_status(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    """Estado del Modo Plus del trabajador actual (soporta If-None-Match / 304)"""
+    cached = conditional_response(request, response, current_user, "subscriptions:me/status")
+    if cached:
+        return cached
+    
     worker, is_active, last_sub = SubscriptionService.get_status(db, current_user.id)
     return SubscriptionStatusResponse(
         is_plus_active=is_active,
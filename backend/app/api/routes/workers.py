@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel, validator
+from app.config import settings
 from app.database import get_db
 from app.utils.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.worker import WorkerCreate, WorkerResponse, WorkerUpdate
 from app.services.worker_service import WorkerService
+from app.utils.fast_json import compact_mode, item_response, list_response, worker_row
+from app.utils.sparse_fields import Fields, worker_fields
 
 
 class VerificationRequest(BaseModel):
@@ -66,6 +69,7 @@ async def register_worker(
 
 @router.get("/me", response_model=WorkerResponse)
 async def get_my_profile(
+    fields: Fields = Depends(worker_fields),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -87,7 +91,7 @@ async def get_my_profile(
             detail="No tienes un perfil de trabajador"
         )
     
-    return worker
+    return item_response(worker, worker_row, fields)
 
 
 @router.put("/me", response_model=WorkerResponse)
@@ -118,7 +122,11 @@ async def update_my_profile(
 
 
 @router.get("/{worker_id}", response_model=WorkerResponse)
-async def get_worker(worker_id: int, db: Session = Depends(get_db)):
+async def get_worker(
+    worker_id: int,
+    fields: Fields = Depends(worker_fields),
+    db: Session = Depends(get_db)
+):
     """Obtiene un trabajador por ID"""
     worker = WorkerService.get_worker_by_id(db, worker_id)
     
@@ -128,19 +136,42 @@ async def get_worker(worker_id: int, db: Session = Depends(get_db)):
             detail="Trabajador no encontrado"
         )
     
-    return worker
+    return item_response(worker, worker_row, fields)
 
 
 @router.get("/search/list", response_model=List[WorkerResponse])
 async def search_workers(
+    response: Response,
     service_type: Optional[str] = None,
     district: Optional[str] = None,
     is_available: Optional[bool] = None,
     is_verified: Optional[bool] = None,
+    sort: str = "verified",
+    limit: int = Query(settings.SEARCH_PAGE_SIZE_DEFAULT, ge=1, le=settings.SEARCH_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    compact: bool = Depends(compact_mode),
+    fields: Fields = Depends(worker_fields),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Busca trabajadores con filtros"""
-    return WorkerService.search_workers(db, service_type, district, is_available, is_verified)
+    """Busca trabajadores con filtros (paginado por cursor)
+    
+    - sort: "verified" (verificados primero, luego recientes), "rating" (score bayesiano) o "recent"
+    - limit: tamaño de página (máximo SEARCH_PAGE_SIZE_MAX)
+    - cursor: valor del header X-Next-Cursor de la respuesta anterior
+    - fields: campos a incluir (p. ej. full_name,district,reputation_avg); reduce también la consulta
+    
+    Si hay más resultados, la respuesta incluye el header X-Next-Cursor.
+    """
+    from app.utils.pagination import NEXT_CURSOR_HEADER
+    
+    workers, next_cursor = WorkerService.search_workers(
+        db, service_type, district, is_available, is_verified,
+        sort=sort, limit=limit, cursor=cursor, fields=fields
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return list_response(workers, worker_row, response, compact=compact, fields=fields)
 
 
 @router.post("/me/verify", response_model=WorkerResponse)
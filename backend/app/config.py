@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -11,6 +11,9 @@ class Settings(BaseSettings):
     MYSQL_USER: str = "root"
     MYSQL_PASSWORD: str = ""  # Laragon por defecto no tiene contraseña, o la que hayas configurado
     MYSQL_DATABASE: str = "getjob_db"
+    # URL completa de SQLAlchemy; si se define reemplaza a las variables MYSQL_*
+    # (ej. sqlite:///./loadtest.db como reemplazo local en benchmarks/load_test.py)
+    DATABASE_URL: Optional[str] = None
     
     # JWT Configuration
     # IMPORTANTE: En producción, SECRET_KEY DEBE estar en .env o variable de entorno
@@ -19,6 +22,93 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Búsqueda de trabajadores
+    # Tiempo máximo de ejecución de la consulta en MySQL (hint MAX_EXECUTION_TIME)
+    SEARCH_QUERY_TIMEOUT_MS: int = 2000
+    SEARCH_PAGE_SIZE_DEFAULT: int = 20
+    SEARCH_PAGE_SIZE_MAX: int = 100
+    
+    # Reputación (agregados de calificaciones)
+    # Score bayesiano: (PRIOR_WEIGHT * PRIOR_MEAN + suma) / (PRIOR_WEIGHT + cantidad)
+    # Evita que un trabajador con una sola calificación de 5 supere a uno con 50 de 4.9
+    REPUTATION_PRIOR_MEAN: float = 3.5
+    REPUTATION_PRIOR_WEIGHT: int = 5
+    
+    # Caché HTTP (ETag) de endpoints consultados por polling
+    # Vida máxima de un ETag aunque data_version no cambie (segundos)
+    ETAG_MAX_STALENESS_SECONDS: int = 60
+    
+    # Serialización rápida de listas (app/utils/fast_json.py)
+    # False vuelve a serializar con el response_model de Pydantic
+    FAST_JSON_RESPONSES: bool = True
+    
+    # Compresión de respuestas (app/utils/compression.py): br si hay brotli, si no gzip
+    # Respuestas menores a MINIMUM_SIZE bytes se envían sin comprimir
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Calidad baja-media: rápida para respuestas dinámicas
+    
+    # Métricas por endpoint en formato Prometheus (app/utils/metrics.py, GET /metrics)
+    # Con METRICS_TOKEN, /metrics exige Authorization: Bearer <token> (el scraper lo envía)
+    # En producción el token es obligatorio: sin METRICS_TOKEN, /metrics responde 404
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+    
+    # Registro de consultas lentas (app/utils/slow_queries.py, visible para el manager)
+    # EXPLAIN: además guarda el plan de los SELECT lentos (una consulta extra por cada uno)
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_BUFFER_SIZE: int = 200
+    SLOW_QUERY_MAX_STATEMENT_LENGTH: int = 4000
+    SLOW_QUERY_EXPLAIN: bool = False
+    
+    # Perfilado de requests (app/utils/profiling.py): header X-Profile: 1 de un manager
+    # o una fracción SAMPLE_RATE de todos los requests. Deshabilitado no agrega costo
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_BUFFER_SIZE: int = 20
+    
+    # Presupuesto de sentencias SQL por endpoint (app/utils/query_budget.py, @query_budget)
+    # warn: advertencia en el log al excederlo | raise: QueryBudgetExceeded (tests) | off
+    # Sin valor: warn en development, off en el resto
+    QUERY_BUDGET_MODE: Optional[str] = None
+    
+    # Scheduler de tareas periódicas (app/scheduler.py)
+    # Con varios procesos, solo el que tiene el lock de MySQL (GET_LOCK) corre las tareas de líder
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_LEADER_LOCK_NAME: str = "servifast_scheduler"
+    SCHEDULER_JITTER_SECONDS: float = 5.0
+    SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+    
+    # Barrido de trabajos PENDING vencidos (tarea del scheduler)
+    # Se cancelan los creados hace más de STALE_JOB_MAX_AGE_HOURS o con scheduled_at ya pasado
+    STALE_JOB_SWEEP_ENABLED: bool = True
+    STALE_JOB_MAX_AGE_HOURS: int = 72
+    STALE_JOB_SWEEP_INTERVAL_SECONDS: int = 300
+    STALE_JOB_SWEEP_BATCH_SIZE: int = 500
+    
+    # Vencimiento del Modo Plus (tarea del scheduler con heap de vencimientos)
+    # CHECK: cada cuánto se mira la cima del heap (en memoria, sin consultar la BD)
+    # RELOAD: cada cuánto se recarga el heap desde la BD (cubre suscripciones de otros procesos)
+    SUBSCRIPTION_EXPIRY_ENABLED: bool = True
+    SUBSCRIPTION_EXPIRY_CHECK_SECONDS: int = 15
+    SUBSCRIPTION_EXPIRY_RELOAD_SECONDS: int = 600
+    
+    # Outbox de notificaciones en tiempo real (app/services/outbox.py)
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 200
+    # Antigüedad a partir de la cual un hueco de ids ya no puede llenarse (commit tardío)
+    OUTBOX_SETTLE_SECONDS: int = 10
+    OUTBOX_RETENTION_MINUTES: int = 60
+    
+    # Idempotency-Key (app/utils/idempotency.py)
+    # TTL: cuánto se guarda la respuesta para reintentos
+    # LOCK_TIMEOUT: tras cuánto una clave "en curso" se considera abandonada (proceso caído)
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: int = 60
+    
     # Environment
     ENVIRONMENT: str = "development"  # development | production
     
@@ -49,6 +139,8 @@ class Settings(BaseSettings):
     @property
     def database_url(self) -> str:
         """Construye la URL de conexión a la base de datos"""
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         # Construye la URL desde variables individuales
         # Si no hay contraseña, no incluirla en la URL
         if self.MYSQL_PASSWORD:
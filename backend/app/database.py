@@ -1,19 +1,59 @@
-from sqlalchemy import create_engine
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from sqlalchemy import DateTime, Numeric, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
 # Crear engine de SQLAlchemy
 # echo=True solo en desarrollo para ver queries SQL en consola
+# (en cualquier entorno las consultas lentas quedan en app/utils/slow_queries.py)
+# Hora: todas las columnas DATETIME guardan UTC. Los modelos usan datetime.utcnow y
+# cada conexión MySQL fija time_zone = '+00:00', así NOW() (server_default de los
+# INSERT por SQL directo) usa el mismo reloj. Los datos anteriores (hora local del
+# servidor) se convierten con migrations/migration_2026_10_19_timestamps_to_utc.sql
+# SQLite (DATABASE_URL=sqlite:///...) solo como reemplazo local en benchmarks:
+# la conexión se comparte entre hilos y espera el lock de escritura en vez de fallar
+# (CURRENT_TIMESTAMP de SQLite ya es UTC)
+if settings.database_url.startswith("sqlite"):
+    connect_args = {"check_same_thread": False, "timeout": 30}
+else:
+    connect_args = {"init_command": "SET time_zone = '+00:00'"}
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,  # Verifica conexiones antes de usarlas
     pool_recycle=300,    # Recicla conexiones cada 5 minutos
-    echo=settings.is_development  # Ver queries SQL solo en desarrollo
+    echo=settings.is_development,  # Ver queries SQL solo en desarrollo
+    connect_args=connect_args
 )
 
 # SessionLocal: clase para crear sesiones de BD
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: después del commit los objetos conservan los valores que
+# ya están en memoria, así devolverlos en la respuesta no dispara un SELECT por
+# objeto. Los timestamps se generan en Python (default/onupdate=datetime.utcnow en
+# los modelos). A cambio nada se recarga solo: las sesiones deben ser cortas (un
+# request en get_db, una operación en tareas y WebSockets, que abren una sesión
+# por mensaje) para no leer filas que otro proceso ya cambió.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def match_stored_precision(instance) -> None:
+    """Ajusta los valores de una entidad nueva a la precisión de sus columnas
+
+    Sin refresh después del commit la entidad devuelve lo que se le asignó:
+    "50.5" o una fecha con microsegundos, mientras que la BD guarda "50.50" y
+    segundos enteros (DECIMAL(p,s) y DATETIME sin fracción). Llamar antes del
+    INSERT deja en memoria exactamente lo que se va a guardar.
+    """
+    for column in instance.__table__.columns:
+        value = getattr(instance, column.key, None)
+        if value is None:
+            continue
+        if isinstance(column.type, Numeric) and column.type.scale is not None and isinstance(value, Decimal):
+            setattr(instance, column.key, value.quantize(Decimal(1).scaleb(-column.type.scale), rounding=ROUND_HALF_UP))
+        elif isinstance(column.type, DateTime) and isinstance(value, datetime):
+            setattr(instance, column.key, value.replace(microsecond=0))
+
 
 # Base: clase base para todos los modelos
 Base = declarative_base()
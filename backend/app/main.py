@@ -1,8 +1,17 @@
 import logging
-from fastapi import FastAPI
+import secrets
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.database import engine, Base
 from app.config import settings
+from app.scheduler import scheduler
+from app.utils.compression import CompressionMiddleware
+from app.utils.idempotency import IdempotencyMiddleware
+from app.utils.metrics import MetricsMiddleware, TimedJSONResponse, metrics
+from app.utils.query_budget import budget_mode
+from app.utils.sql_hooks import install_sql_hooks
 
 # Importar modelos para que SQLAlchemy los reconozca
 # Importamos el módulo completo en lugar de modelos individuales
@@ -15,11 +24,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Arranque y apagado de la aplicación (despachador del outbox y scheduler de tareas periódicas)"""
+    logger.info(f"ServiFast API iniciando en modo: {settings.ENVIRONMENT}")
+    if settings.DATABASE_URL:
+        logger.info(f"Base de datos: {engine.url.render_as_string(hide_password=True)}")
+    else:
+        logger.info(f"Base de datos: {settings.MYSQL_DATABASE}@{settings.MYSQL_HOST}")
+    
+    # Validaciones de seguridad en producción
+    if settings.is_production:
+        if settings.SECRET_KEY == "dev-secret-key-cambiar-en-produccion":
+            logger.error("⚠️  SECRET_KEY no configurado! Usando valor por defecto (INSEGURO)")
+            logger.error("⚠️  Configura SECRET_KEY en .env o variable de entorno")
+        
+        if not settings.ALLOWED_ORIGINS or "*" in settings.ALLOWED_ORIGINS:
+            logger.warning("⚠️  CORS permite todos los orígenes en producción (INSEGURO)")
+            logger.warning("⚠️  Configura ALLOWED_ORIGINS específicos en .env")
+        
+        if settings.METRICS_ENABLED and not settings.METRICS_TOKEN:
+            logger.warning("⚠️  METRICS_TOKEN no configurado: /metrics queda deshabilitado")
+    
+    # Entrega del outbox a las conexiones de este proceso (siempre: los avisos en
+    # tiempo real no dependen del scheduler). La marca de agua se fija antes de servir
+    from app.services.outbox import outbox_dispatcher
+    await outbox_dispatcher.start()
+    
+    # Tareas periódicas (vencimientos, limpieza) fuera del camino de los requests
+    if settings.SCHEDULER_ENABLED:
+        from app.services.maintenance_tasks import register_maintenance_tasks
+        if not scheduler.tasks:
+            register_maintenance_tasks(scheduler)
+        scheduler.start()
+    
+    yield
+    
+    if settings.SCHEDULER_ENABLED:
+        await scheduler.stop(timeout=settings.SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS)
+    await outbox_dispatcher.stop()
+
+
 # Crear aplicación FastAPI (similar a @SpringBootApplication)
 app = FastAPI(
     title="ServiFast API",
     description="API para conectar trabajadores con clientes",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # json.dumps de las respuestas cuenta como serialización en /metrics
+    default_response_class=TimedJSONResponse
 )
 
 # CORS: Configuración según entorno
@@ -40,12 +94,42 @@ else:
         logger.error("ALLOWED_ORIGINS no configurado en producción!")
         allowed_origins = []
 
+# Idempotency-Key en los POST que la app móvil reintenta (jobs, apply, chat, subscribe).
+# Se agrega antes que CORS para quedar por dentro: las respuestas repetidas también llevan CORS
+app.add_middleware(IdempotencyMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor de paginación, ETag de endpoints de polling, marca de respuesta idempotente repetida
+    # e id del perfil de un request perfilado
+    expose_headers=["X-Next-Cursor", "ETag", "Idempotent-Replayed", "X-Profile-Id"],
+)
+
+# Compresión gzip/brotli negociada: va por fuera de todo, así se comprime una sola
+# vez la respuesta final (las guardadas por IdempotencyMiddleware quedan sin comprimir)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Métricas por plantilla de ruta: el más externo, la latencia incluye la compresión
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Perfilado estadístico bajo demanda (opt-in): por fuera de todo para cubrir el request completo
+if settings.PROFILING_ENABLED:
+    from app.utils.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
+
+# Un solo hook de cursor para las sentencias SQL: métricas por request, consultas
+# lentas con su origen (Service.method) para el manager y presupuesto de sentencias
+# de los endpoints con @query_budget (N+1 a la vista)
+install_sql_hooks(
+    metrics=settings.METRICS_ENABLED,
+    slow_queries=settings.SLOW_QUERY_LOG_ENABLED,
+    query_budget=budget_mode() != "off"
 )
 
 
@@ -66,25 +150,6 @@ app.add_middleware(
 # Base.metadata.create_all(bind=engine)
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Evento que se ejecuta al iniciar la aplicación"""
-    logger.info(f"ServiFast API iniciando en modo: {settings.ENVIRONMENT}")
-    logger.info(f"Base de datos: {settings.MYSQL_DATABASE}@{settings.MYSQL_HOST}")
-    
-    # Validaciones de seguridad en producción
-    if settings.is_production:
-        if settings.SECRET_KEY == "dev-secret-key-cambiar-en-produccion":
-            logger.error("⚠️  SECRET_KEY no configurado! Usando valor por defecto (INSEGURO)")
-            logger.error("⚠️  Configura SECRET_KEY en .env o variable de entorno")
-        
-        if not settings.ALLOWED_ORIGINS or "*" in settings.ALLOWED_ORIGINS:
-            logger.warning("⚠️  CORS permite todos los orígenes en producción (INSEGURO)")
-            logger.warning("⚠️  Configura ALLOWED_ORIGINS específicos en .env")
-    
-    # Aquí puedes agregar lógica de inicialización si es necesario
-
-
 @app.get("/")
 async def root():
     """Endpoint de prueba"""
@@ -100,6 +165,18 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Métricas por endpoint en formato de texto de Prometheus"""
+    # En producción no se publica sin token (las rutas y latencias describen la API)
+    if not settings.METRICS_ENABLED or (settings.is_production and not settings.METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if settings.METRICS_TOKEN and not secrets.compare_digest(request.headers.get("authorization", ""), expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de métricas inválido")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 # Incluir routers (controllers)
 from app.api.routes import auth, workers, jobs, commissions, manager, chat, location, subscriptions, notifications
 
@@ -9,6 +9,8 @@ from app.models.job_notes import JobNotes
 from app.models.rating import Rating
 from app.models.message import Message
 from app.models.subscription import WorkerSubscription, SubscriptionPlan, SubscriptionStatus
+from app.models.outbox import OutboxEvent
+from app.models.idempotency import IdempotencyKey
 
 __all__ = [
     "User",
@@ -28,4 +30,6 @@ __all__ = [
     "WorkerSubscription",
     "SubscriptionPlan",
     "SubscriptionStatus",
+    "OutboxEvent",
+    "IdempotencyKey",
 ]
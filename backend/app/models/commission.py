@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, Numeric, Enum, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 import enum
 from app.database import Base
 
@@ -28,8 +29,8 @@ class Commission(Base):
     reviewed_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     reviewed_at = Column(DateTime)
     notes = Column(Text)  # Notas del manager si rechaza
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow)
 
     # Relaciones
     worker = relationship("Worker", back_populates="commissions")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from datetime import datetime
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """Respuesta guardada para una Idempotency-Key (reintentos de la app móvil)
+
+    Ver app/utils/idempotency.py. response_status es NULL mientras la primera
+    solicitud con la clave está en curso.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_user_key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    key = Column(String(100), nullable=False)
+    request_hash = Column(String(64), nullable=False)  # sha256 de método + ruta + cuerpo
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    expires_at = Column(DateTime, nullable=False)
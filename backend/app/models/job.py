@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, Enum, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Enum, Numeric, DateTime, ForeignKey, Computed, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 import enum
 from decimal import Decimal
 from app.database import Base
@@ -17,6 +18,15 @@ class JobStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Estados en los que el trabajo ocupa al trabajador asignado
+ACTIVE_JOB_STATUSES = (
+    JobStatus.ACCEPTED,
+    JobStatus.IN_ROUTE,
+    JobStatus.ON_SITE,
+    JobStatus.IN_PROGRESS,
+)
+
+
 class PaymentMethod(str, enum.Enum):
     """Métodos de pago"""
     YAPE = "yape"
@@ -26,6 +36,14 @@ class PaymentMethod(str, enum.Enum):
 class Job(Base):
     """Modelo de Trabajo"""
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Un trabajador solo puede tener un trabajo activo a la vez.
+        # Los NULL no cuentan para UNIQUE, así que solo compiten los trabajos activos
+        Index("uq_jobs_active_worker", "active_worker_id", unique=True),
+        # Barrido de trabajos PENDING vencidos (por antigüedad o por fecha programada)
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+        Index("ix_jobs_status_scheduled_at", "status", "scheduled_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     client_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -44,8 +62,21 @@ class Job(Base):
     scheduled_at = Column(DateTime)
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow)
+    # Columna generada: worker_id mientras el trabajo está activo, NULL en otro caso.
+    # Enum(JobStatus) guarda el nombre del miembro ('ACCEPTED'), no su valor
+    active_worker_id = Column(
+        Integer,
+        Computed(
+            "CASE WHEN status IN ("
+            + ", ".join(f"'{job_status.name}'" for job_status in ACTIVE_JOB_STATUSES)
+            + ") THEN worker_id END",
+            # VIRTUAL: MySQL no permite columnas STORED sobre worker_id (FK con ON DELETE SET NULL)
+            persisted=False
+        ),
+        nullable=True
+    )
 
     # Relaciones
     client = relationship("User", foreign_keys=[client_id], back_populates="client_jobs")
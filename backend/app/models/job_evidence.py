@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 import enum
 from app.database import Base
 
@@ -19,7 +20,7 @@ class JobEvidence(Base):
     job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
     image_url = Column(String(500), nullable=False)
     type = Column(Enum(EvidenceType), nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
 
     # Relaciones
     job = relationship("Job", back_populates="evidence")
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 from app.database import Base
 
 
@@ -12,7 +13,7 @@ class JobNotes(Base):
     job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, unique=True)
     description = Column(Text, nullable=False)  # Describe lo realizado
     materials_used = Column(Text)  # Materiales utilizados (opcional)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
 
     # Relaciones
     job = relationship("Job", back_populates="notes")
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 from app.database import Base
 
 
@@ -15,7 +16,7 @@ class Message(Base):
     content = Column(Text, nullable=False)
     has_image = Column(Boolean, default=False)  # Flag para indicar si el mensaje tiene imagen
     image_url = Column(String(500), nullable=True)  # URL de la imagen si tiene
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
 
     # Relaciones
     job = relationship("Job", back_populates="messages")
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from datetime import datetime
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    """Evento pendiente de entrega en tiempo real (outbox transaccional)
+
+    Se inserta en la misma transacción que el cambio de dominio (mensaje,
+    cambio de estado) y lo entrega el despachador de app.services.outbox.
+    - event_type "dashboard": notificación al dashboard de user_id
+      (payload = {"type": ..., "data": {...}})
+    - event_type "chat.message": mensaje para la sala (job_id, application_id)
+    """
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Replay del dashboard al reconectar: eventos de un usuario posteriores a un id
+        Index("ix_outbox_events_user_id_id", "user_id", "id"),
+        Index("ix_outbox_events_created_at", "created_at"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_type = Column(String(50), nullable=False)
+    user_id = Column(Integer, nullable=True)         # Destinatario (eventos de dashboard)
+    job_id = Column(Integer, nullable=True)
+    application_id = Column(Integer, nullable=True)  # Sala de chat por aplicación
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
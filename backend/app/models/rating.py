@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, CheckConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 from app.database import Base
 
 
@@ -14,7 +15,7 @@ class Rating(Base):
     worker_comment = Column(Text)
     client_rating = Column(Integer)  # Calificación del cliente al trabajador (1-5)
     client_comment = Column(Text)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
 
     # Constraint para validar rango de calificaciones
     __table_args__ = (
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, Numeric, Enum, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 from decimal import Decimal
 import enum
 from app.database import Base
@@ -31,8 +32,8 @@ class WorkerSubscription(Base):
     payment_code = Column(String(50))  # código simulado de Yape
     valid_from = Column(DateTime, nullable=False)
     valid_until = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow)
 
     worker = relationship("Worker", back_populates="subscriptions")
 
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Numeric
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 import enum
 from app.database import Base
+from app.config import settings
 
 
 class UserRole(str, enum.Enum):
@@ -32,8 +34,21 @@ class User(Base):
     full_name = Column(String(255), nullable=True)  # Nombre completo
     phone = Column(String(20), nullable=True)  # Teléfono de contacto
     profile_image_url = Column(String(500), nullable=True)  # URL de foto de perfil
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Reputación como cliente: agregados de las calificaciones recibidas de trabajadores
+    # (Rating.worker_rating). Se mantienen incrementalmente en RatingService
+    reputation_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reputation_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    reputation_avg = Column(Numeric(3, 2), nullable=True)
+    reputation_score = Column(
+        Numeric(4, 3), nullable=False,
+        default=settings.REPUTATION_PRIOR_MEAN, server_default=str(settings.REPUTATION_PRIOR_MEAN)
+    )
+    # Contador de cambios de los datos que el usuario consulta por polling
+    # (trabajos, aplicaciones, suscripción, comisiones). Lo incrementan los
+    # servicios y se usa para calcular ETags (ver app/utils/caching.py)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow)
 
     # Relaciones (como @OneToOne o @OneToMany en JPA)
     worker = relationship("Worker", back_populates="user", uselist=False)
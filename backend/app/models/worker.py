@@ -1,12 +1,23 @@
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, JSON, Index, Numeric
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 from app.database import Base
+from app.config import settings
 
 
 class Worker(Base):
     """Modelo de Trabajador"""
     __tablename__ = "workers"
+    __table_args__ = (
+        # Índices para la búsqueda paginada (/api/workers/search/list):
+        # el ordenamiento (is_verified DESC, id DESC) se resuelve recorriendo el índice
+        Index("ix_workers_verified_id", "is_verified", "id"),
+        Index("ix_workers_available_verified_id", "is_available", "is_verified", "id"),
+        Index("ix_workers_reputation_score_id", "reputation_score", "id"),
+        # Carga de vencimientos próximos del Modo Plus (app.services.subscription_expiry)
+        Index("ix_workers_plus_active_expires_at", "is_plus_active", "plus_expires_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True)
@@ -22,8 +33,17 @@ class Worker(Base):
     verification_photo_url = Column(String(500))  # URL de la foto de verificación (DNI, etc.)
     is_plus_active = Column(Boolean, nullable=False, default=False, server_default="0")
     plus_expires_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Reputación: agregados de las calificaciones recibidas de clientes (Rating.client_rating)
+    # Se mantienen incrementalmente en RatingService; rebuild_reputation.py los recalcula
+    reputation_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reputation_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    reputation_avg = Column(Numeric(3, 2), nullable=True)  # NULL si no tiene calificaciones
+    reputation_score = Column(
+        Numeric(4, 3), nullable=False,
+        default=settings.REPUTATION_PRIOR_MEAN, server_default=str(settings.REPUTATION_PRIOR_MEAN)
+    )  # Score bayesiano, usado para ordenar por calificación
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow)
 
     # Relaciones
     user = relationship("User", back_populates="worker")
@@ -0,0 +1,349 @@
+"""
+Scheduler en proceso para tareas periódicas de mantenimiento
+
+Reemplaza los loops asyncio sueltos y los scripts ejecutados a mano. Cada
+tarea se registra con:
+- Un intervalo (cada N segundos) o una expresión cron de 5 campos
+  ("minuto hora día-del-mes mes día-de-la-semana"; soporta *, */n, a-b y listas)
+- Jitter: segundos aleatorios que se suman a cada espera, para que varios
+  procesos (o varias tareas con el mismo intervalo) no golpeen la BD a la vez
+- leader_only: solo la ejecuta el proceso líder
+
+Elección de líder: con varios workers de uvicorn/gunicorn, las tareas que
+modifican la BD deben correr en un solo proceso. El líder es el que obtiene
+el lock con nombre de MySQL (GET_LOCK) en una conexión dedicada. El lock se
+libera solo si esa conexión se cierra (el proceso muere), y otro proceso lo
+toma en su próximo intento. En otros motores (SQLite en desarrollo) hay un
+solo proceso y siempre es líder.
+
+Las funciones síncronas se ejecutan en el threadpool de Starlette; las
+corutinas en el event loop. Al apagar se dejan de programar ejecuciones y se
+espera (con timeout) a que terminen las que están en curso.
+"""
+import asyncio
+import inspect
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+from sqlalchemy import text
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CronExpression:
+    """Expresión cron de 5 campos (UTC): minuto hora día mes día-de-la-semana"""
+
+    # (mínimo, máximo) de cada campo; día de la semana 0 = domingo
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Expresión cron inválida (se esperan 5 campos): {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse_field(part, low, high) for part, (low, high) in zip(parts, self.FIELDS)
+        )
+        # Como en cron: si día y día-de-la-semana están restringidos, basta con uno
+        self._days_any = parts[2] == "*"
+        self._weekdays_any = parts[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                step = int(step_text)
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start_text, end_text = item.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = end = int(item)
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Campo cron fuera de rango: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # datetime.weekday(): lunes = 0; cron: domingo = 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._days_any:
+            return weekday_ok
+        if self._weekdays_any:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Próximo instante (al minuto) estrictamente posterior a after"""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Como máximo un año de búsqueda, saltando días u horas completas cuando no coinciden
+        limit = moment + timedelta(days=366)
+        while moment <= limit:
+            if moment.month not in self.months or not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            return moment
+        raise ValueError(f"La expresión cron no coincide con ninguna fecha: {self.expression!r}")
+
+
+class ScheduledTask:
+    """Tarea registrada en el scheduler, con sus métricas de ejecución"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        interval_seconds: Optional[float] = None,
+        cron: Optional[str] = None,
+        jitter_seconds: float = 0.0,
+        leader_only: bool = True,
+        run_at_start: bool = False
+    ):
+        if (interval_seconds is None) == (cron is None):
+            raise ValueError(f"La tarea {name} necesita un intervalo o una expresión cron (solo uno)")
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.cron = CronExpression(cron) if cron else None
+        self.jitter_seconds = jitter_seconds
+        self.leader_only = leader_only
+        self.run_at_start = run_at_start
+
+        # Métricas
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0  # Ejecuciones omitidas por no ser líder
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds: Optional[float] = None
+        self.last_run_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.next_run_at: Optional[datetime] = None
+        self.running = False
+
+    def delay_until_next(self, now: datetime) -> float:
+        """Segundos hasta la próxima ejecución (incluye jitter)"""
+        if self.cron is not None:
+            delay = (self.cron.next_after(now) - now).total_seconds()
+        else:
+            delay = self.interval_seconds
+        if self.jitter_seconds:
+            delay += random.uniform(0, self.jitter_seconds)
+        self.next_run_at = now + timedelta(seconds=delay)
+        return delay
+
+    def record(self, elapsed: float, error: Optional[BaseException] = None) -> None:
+        self.runs += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        self.last_seconds = elapsed
+        self.last_run_at = datetime.utcnow()
+        if error is not None:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "schedule": self.cron.expression if self.cron else f"every {self.interval_seconds:g}s",
+            "leader_only": self.leader_only,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "avg_ms": round(self.total_seconds / self.runs * 1000, 1) if self.runs else None,
+            "max_ms": round(self.max_seconds * 1000, 1) if self.runs else None,
+            "last_ms": round(self.last_seconds * 1000, 1) if self.last_seconds is not None else None,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+            "next_run_at": self.next_run_at,
+        }
+
+
+class LeaderLock:
+    """Lock de líder entre procesos con GET_LOCK de MySQL (conexión dedicada)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._connection = None
+        self._is_leader = False
+
+    def _engine(self):
+        # Se lee al usarlo: los scripts y benchmarks pueden reemplazar el engine
+        from app import database
+        return database.engine
+
+    def check(self) -> bool:
+        """True si este proceso es el líder (intenta tomar el lock si nadie lo tiene)"""
+        engine = self._engine()
+        if engine.dialect.name != "mysql":
+            return True
+
+        try:
+            if self._connection is None:
+                self._connection = engine.connect()
+            if self._is_leader:
+                # El lock sigue siendo nuestro mientras la conexión siga viva
+                held = self._connection.execute(
+                    text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": self.name}
+                ).scalar()
+                self._is_leader = bool(held)
+            if not self._is_leader:
+                acquired = self._connection.execute(
+                    text("SELECT GET_LOCK(:name, 0)"), {"name": self.name}
+                ).scalar()
+                self._is_leader = acquired == 1
+                if self._is_leader:
+                    logger.info(f"Scheduler: este proceso es el líder ({self.name})")
+            # Cerrar la transacción implícita de los SELECT (el lock es de la sesión, no de la transacción)
+            self._connection.commit()
+        except Exception:
+            logger.exception("Scheduler: error al verificar el lock de líder")
+            self._drop_connection()
+        return self._is_leader
+
+    def release(self) -> None:
+        if self._connection is not None and self._is_leader:
+            try:
+                self._connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.name})
+            except Exception:
+                logger.warning("Scheduler: no se pudo liberar el lock de líder")
+        self._drop_connection()
+
+    def _drop_connection(self) -> None:
+        self._is_leader = False
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader or self._engine().dialect.name != "mysql"
+
+
+class Scheduler:
+    """Ejecuta tareas periódicas en el event loop de la aplicación"""
+
+    def __init__(self, leader_lock_name: str):
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self.leader = LeaderLock(leader_lock_name)
+        self._runners: List[asyncio.Task] = []
+        self._in_flight: Set[asyncio.Future] = set()
+        self._stopping: Optional[asyncio.Event] = None
+
+    def add_interval(self, name: str, func: Callable, seconds: float, **options) -> ScheduledTask:
+        """Registra una tarea que corre cada `seconds` segundos"""
+        return self._add(ScheduledTask(name, func, interval_seconds=seconds, **options))
+
+    def add_cron(self, name: str, func: Callable, expression: str, **options) -> ScheduledTask:
+        """Registra una tarea con expresión cron de 5 campos (UTC)"""
+        return self._add(ScheduledTask(name, func, cron=expression, **options))
+
+    def _add(self, task: ScheduledTask) -> ScheduledTask:
+        if task.name in self.tasks:
+            raise ValueError(f"Tarea ya registrada: {task.name}")
+        self.tasks[task.name] = task
+        return task
+
+    def start(self) -> None:
+        """Lanza un runner por tarea (llamar dentro del event loop)"""
+        self._stopping = asyncio.Event()
+        for task in self.tasks.values():
+            self._runners.append(asyncio.create_task(self._run_forever(task), name=f"scheduler:{task.name}"))
+        logger.info(f"Scheduler iniciado con {len(self.tasks)} tareas: {', '.join(self.tasks)}")
+
+    async def stop(self, timeout: float) -> None:
+        """Apagado ordenado: no programa más ejecuciones y espera las que están en curso"""
+        if self._stopping is None:
+            return
+        self._stopping.set()
+
+        if self._in_flight:
+            logger.info(f"Scheduler: esperando {len(self._in_flight)} tareas en curso")
+            _, pending = await asyncio.wait(self._in_flight, timeout=timeout)
+            if pending:
+                logger.warning(f"Scheduler: {len(pending)} tareas no terminaron en {timeout}s")
+
+        for runner in self._runners:
+            runner.cancel()
+        await asyncio.gather(*self._runners, return_exceptions=True)
+        self._runners.clear()
+
+        from starlette.concurrency import run_in_threadpool
+        await run_in_threadpool(self.leader.release)
+        logger.info("Scheduler detenido")
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Espera `seconds` o hasta el apagado; retorna False si hay que detenerse"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=max(seconds, 0))
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    async def _run_forever(self, task: ScheduledTask) -> None:
+        if not task.run_at_start:
+            if not await self._sleep(task.delay_until_next(datetime.utcnow())):
+                return
+        while not self._stopping.is_set():
+            await self.run_once(task)
+            if not await self._sleep(task.delay_until_next(datetime.utcnow())):
+                return
+
+    async def run_once(self, task: ScheduledTask) -> None:
+        """Ejecuta la tarea una vez (si corresponde a este proceso) y registra métricas"""
+        from starlette.concurrency import run_in_threadpool
+
+        if task.leader_only and not await run_in_threadpool(self.leader.check):
+            task.skipped += 1
+            return
+
+        task.running = True
+        started = time.perf_counter()
+        error = None
+        if inspect.iscoroutinefunction(task.func):
+            execution = asyncio.ensure_future(task.func())
+        else:
+            execution = asyncio.ensure_future(run_in_threadpool(task.func))
+        self._in_flight.add(execution)
+        try:
+            # shield: cancelar el runner (apagado) no interrumpe una ejecución a medias
+            await asyncio.shield(execution)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+            logger.exception(f"Scheduler: la tarea {task.name} falló")
+        finally:
+            if execution.done():
+                self._in_flight.discard(execution)
+            else:
+                execution.add_done_callback(self._in_flight.discard)
+            task.running = False
+            task.record(time.perf_counter() - started, error)
+
+    def snapshot(self) -> dict:
+        return {
+            "is_leader": self.leader.is_leader,
+            "tasks": [task.snapshot() for task in self.tasks.values()],
+        }
+
+
+scheduler = Scheduler(settings.SCHEDULER_LEADER_LOCK_NAME)
@@ -1,8 +1,8 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
 from decimal import Decimal
 from app.models.commission import CommissionStatus
+from app.schemas.datetimes import UTCDateTime
 
 
 # Schemas para Commission (DTOs)
@@ -30,12 +30,12 @@ class CommissionResponse(CommissionBase):
     job_id: int
     payment_code: Optional[str] = None
     payment_proof_url: Optional[str] = None
-    submitted_at: Optional[datetime] = None
+    submitted_at: Optional[UTCDateTime] = None
     reviewed_by: Optional[int] = None
-    reviewed_at: Optional[datetime] = None
+    reviewed_at: Optional[UTCDateTime] = None
     notes: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
     job: Optional[JobInfo] = None  # Información del trabajo
 
     class Config:
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import Annotated
+from pydantic import AfterValidator, PlainSerializer
+
+
+# Fechas de la API
+#
+# La BD guarda todas las fechas en UTC sin zona (DATETIME naive, la sesión de
+# MySQL corre en +00:00). Hacia afuera viajan con zona explícita ("Z") para que
+# la app las convierta a la hora local del teléfono en vez de leerlas como
+# hora local. Las fechas que llegan con zona se pasan a UTC antes de guardarse;
+# las que llegan sin zona se toman como UTC.
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Fecha en UTC sin zona, como se guarda en la BD"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def utc_isoformat(value: datetime) -> str:
+    """ISO 8601 en UTC con "Z" (las fechas sin zona se toman como UTC)"""
+    return to_utc_naive(value).isoformat() + "Z"
+
+
+UTCDateTime = Annotated[
+    datetime,
+    AfterValidator(to_utc_naive),
+    PlainSerializer(utc_isoformat, return_type=str, when_used="json"),
+]
@@ -1,8 +1,8 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 from typing import Optional, List
-from datetime import datetime
 from decimal import Decimal
 from app.models.job import JobStatus, PaymentMethod
+from app.schemas.datetimes import UTCDateTime
 
 
 # Schemas para Job (DTOs)
@@ -17,7 +17,7 @@ class JobBase(BaseModel):
     address: str
     latitude: Optional[Decimal] = None
     longitude: Optional[Decimal] = None
-    scheduled_at: Optional[datetime] = None
+    scheduled_at: Optional[UTCDateTime] = None
 
 
 class JobCreate(JobBase):
@@ -64,10 +64,10 @@ class JobResponse(JobBase):
     status: JobStatus
     extras: Decimal = Decimal("0.00")  # Default para evitar errores con NULL
     total_amount: Decimal = Decimal("0.00")  # Default para evitar errores con NULL
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    created_at: datetime
-    updated_at: datetime
+    started_at: Optional[UTCDateTime] = None
+    completed_at: Optional[UTCDateTime] = None
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
     client: Optional[ClientInfo] = None  # Información del cliente
     worker: Optional[WorkerInfo] = None  # Información del trabajador
 
@@ -82,7 +82,7 @@ class JobUpdate(BaseModel):
     status: Optional[JobStatus] = None
     extras: Optional[Decimal] = None
     total_amount: Optional[Decimal] = None
-    scheduled_at: Optional[datetime] = None
+    scheduled_at: Optional[UTCDateTime] = None
 
 
 class JobAccept(BaseModel):
@@ -102,3 +102,30 @@ class JobAddExtra(BaseModel):
             raise ValueError("El monto del extra debe ser mayor que cero")
         return v
 
+
+class JobBatchItem(BaseModel):
+    """Un cambio de estado dentro de un lote"""
+    job_id: int
+    target_status: JobStatus
+
+
+class JobBatchStatusRequest(BaseModel):
+    """Lote de cambios de estado (manager)"""
+    items: List[JobBatchItem] = Field(..., min_length=1, max_length=1000)
+
+
+class JobBatchItemResult(BaseModel):
+    """Resultado de un cambio de estado del lote"""
+    job_id: int
+    target_status: JobStatus
+    applied: bool
+    status_code: int  # 200 si se aplicó; 400/403/404/409 con el motivo en detail
+    detail: Optional[str] = None
+    previous_status: Optional[JobStatus] = None
+
+
+class JobBatchStatusResponse(BaseModel):
+    """Resultados del lote, en el mismo orden que los items enviados"""
+    applied: int
+    rejected: int
+    results: List[JobBatchItemResult]
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
 from app.schemas.job import WorkerInfo
+from app.schemas.datetimes import UTCDateTime
 
 
 class JobApplicationResponse(BaseModel):
@@ -10,8 +10,8 @@ class JobApplicationResponse(BaseModel):
     job_id: int
     worker_id: int
     is_accepted: bool
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
     worker: Optional[WorkerInfo] = None  # Información del trabajador
     
     class Config:
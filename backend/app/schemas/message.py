@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+from app.schemas.datetimes import UTCDateTime
 
 
 class MessageBase(BaseModel):
@@ -33,7 +33,7 @@ class MessageResponse(MessageBase):
     application_id: Optional[int] = None  # ID de la aplicación
     sender_id: int
     sender: Optional[SenderInfo] = None
-    created_at: datetime
+    created_at: UTCDateTime
     
     class Config:
         from_attributes = True
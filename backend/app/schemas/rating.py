@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional
-from datetime import datetime
+from app.schemas.datetimes import UTCDateTime
 
 
 class RatingCreate(BaseModel):
@@ -17,7 +17,7 @@ class RatingResponse(BaseModel):
     worker_comment: Optional[str] = None
     client_rating: Optional[int] = None
     client_comment: Optional[str] = None
-    created_at: datetime
+    created_at: UTCDateTime
 
     class Config:
         from_attributes = True
@@ -1,8 +1,8 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 from app.models.subscription import SubscriptionPlan, SubscriptionStatus
+from app.schemas.datetimes import UTCDateTime
 
 
 class CreateSubscriptionRequest(BaseModel):
@@ -16,9 +16,9 @@ class SubscriptionResponse(BaseModel):
     days: int
     amount: Decimal
     status: SubscriptionStatus
-    valid_from: datetime
-    valid_until: datetime
-    created_at: datetime
+    valid_from: UTCDateTime
+    valid_until: UTCDateTime
+    created_at: UTCDateTime
 
     class Config:
         from_attributes = True
@@ -26,6 +26,6 @@ class SubscriptionResponse(BaseModel):
 
 class SubscriptionStatusResponse(BaseModel):
     is_plus_active: bool
-    plus_expires_at: Optional[datetime] = None
+    plus_expires_at: Optional[UTCDateTime] = None
     current_plan: Optional[SubscriptionResponse] = None
 
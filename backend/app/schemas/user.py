@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from datetime import datetime
 from app.models.user import UserRole
+from app.schemas.datetimes import UTCDateTime
 
 
 # Schema para respuesta de login
@@ -38,8 +38,8 @@ class UserResponse(UserBase):
     """Schema para respuesta de usuario (sin password)"""
     id: int
     # full_name y phone ya están en UserBase, no hace falta redeclararlos
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
 
     class Config:
         from_attributes = True  # Permite crear desde ORM (SQLAlchemy)
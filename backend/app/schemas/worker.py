@@ -1,7 +1,8 @@
 from pydantic import BaseModel, field_validator
 from typing import Optional, List
-from datetime import datetime
+from decimal import Decimal
 import json
+from app.schemas.datetimes import UTCDateTime
 
 
 # Schemas para Worker (DTOs)
@@ -36,15 +37,19 @@ class WorkerResponse(WorkerBase):
     
     Incluye is_verified y verification_photo_url solo para lectura.
     Incluye is_plus_active y plus_expires_at para mostrar estado de Modo Plus.
+    Incluye los agregados de reputación (precalculados, sin GROUP BY por request).
     """
     id: int
     user_id: int
     is_verified: bool = False  # Solo lectura, no se puede modificar desde cliente
     verification_photo_url: Optional[str] = None  # Solo lectura
     is_plus_active: bool = False  # Estado de Modo Plus
-    plus_expires_at: Optional[datetime] = None  # Fecha de expiración de Modo Plus
-    created_at: datetime
-    updated_at: datetime
+    plus_expires_at: Optional[UTCDateTime] = None  # Fecha de expiración de Modo Plus
+    reputation_count: int = 0  # Cantidad de calificaciones recibidas
+    reputation_avg: Optional[Decimal] = None  # Promedio (None si no tiene calificaciones)
+    reputation_score: Optional[Decimal] = None  # Score bayesiano (para rankings)
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
 
     @field_validator('services', mode='before')
     @classmethod
@@ -44,7 +44,6 @@ class AuthService:
             
             db.add(new_user)
             db.commit()
-            db.refresh(new_user)
             
             return new_user
         except HTTPException:
@@ -151,8 +150,11 @@ class AuthService:
             if "phone" in update_data:
                 user.phone = update_data["phone"]
             
+            # El perfil propio aparece embebido en /my-jobs
+            from app.utils.caching import bump_data_version
+            bump_data_version(db, [user.id])
+            
             db.commit()
-            db.refresh(user)
             
             return user
         except HTTPException:
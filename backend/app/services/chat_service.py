@@ -1,11 +1,11 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from fastapi import HTTPException, status
 from app.models.message import Message
 from app.models.job import Job
 from app.models.user import User
 from app.schemas.message import MessageCreate, MessageResponse, SenderInfo
-from sqlalchemy.orm import joinedload
+from app.services.read_models import MessageRow, load_messages
 
 
 class ChatService:
@@ -68,28 +68,64 @@ class ChatService:
         )
         
         db.add(new_message)
+        # flush: el evento del outbox necesita el id y va en la misma transacción
+        db.flush()
+        ChatService._publish_message(db, new_message, job, is_worker)
         db.commit()
-        db.refresh(new_message)
         
         return new_message
     
     @staticmethod
-    def get_messages_by_job(db: Session, job_id: int, user_id: int, application_id: Optional[int] = None) -> List[Message]:
-        """Obtiene los mensajes de un trabajo (opcionalmente filtrados por aplicación)"""
+    def _publish_message(db: Session, message: Message, job: Job, sent_by_worker: bool) -> None:
+        """Evento de outbox para la sala de chat y el dashboard del cliente (sin commit)"""
+        from app.services.outbox import OutboxService, CHAT_MESSAGE
+        
+        sender = message.sender
+        sender_info = None
+        if sent_by_worker and sender:
+            sender_info = {
+                "id": sender.id,
+                "full_name": sender.full_name,
+                "phone": sender.phone,
+                "profile_image_url": sender.profile_image_url
+            }
+        
+        OutboxService.publish(
+            db,
+            CHAT_MESSAGE,
+            {
+                "message": ChatService.message_to_response(message).model_dump(mode="json"),
+                "client_id": job.client_id,
+                "sender_name": sender.full_name if sender else None,
+                "sender_info": sender_info,
+            },
+            job_id=message.job_id,
+            application_id=message.application_id
+        )
+    
+    @staticmethod
+    def get_messages_by_job(db: Session, job_id: int, user_id: int, application_id: Optional[int] = None) -> List[MessageRow]:
+        """Obtiene los mensajes de un trabajo (opcionalmente filtrados por aplicación)
+        
+        Las verificaciones de acceso leen solo las columnas que comparan y los
+        mensajes se cargan como modelos de lectura (MessageRow, con el remitente).
+        """
         from app.models.job_application import JobApplication
-        from app.services.worker_service import WorkerService
+        from app.models.worker import Worker
         
         # Verificar que el trabajo existe
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = db.query(Job.client_id, Job.worker_id).filter(Job.id == job_id).first()
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Trabajo no encontrado"
             )
         
+        is_client = job.client_id == user_id
+        
         # Si hay application_id, verificar acceso a esa aplicación
         if application_id:
-            application = db.query(JobApplication).filter(
+            application = db.query(JobApplication.worker_id).filter(
                 JobApplication.id == application_id,
                 JobApplication.job_id == job_id
             ).first()
@@ -101,54 +137,37 @@ class ChatService:
                 )
             
             # Verificar acceso: cliente o trabajador de la aplicación
-            is_client = job.client_id == user_id
-            worker = WorkerService.get_worker_by_user_id(db, user_id)
-            is_worker = worker is not None and worker.id == application.worker_id
-            
-            if not is_client and not is_worker:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="No tienes acceso a este chat"
-                )
-            
-            # Filtrar mensajes por application_id
-            messages = db.query(Message)\
-                .options(joinedload(Message.sender))\
-                .filter(
-                    Message.job_id == job_id,
-                    Message.application_id == application_id
-                )\
-                .order_by(Message.created_at.asc())\
-                .all()
+            allowed_worker_id = application.worker_id
         else:
             # Sin application_id: verificar acceso general (para compatibilidad)
-            is_client = job.client_id == user_id
-            is_worker = False
-            if job.worker_id is not None:
-                worker = WorkerService.get_worker_by_user_id(db, user_id)
-                is_worker = worker is not None and worker.id == job.worker_id
-            
-            if not is_client and not is_worker:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="No tienes acceso a este chat"
-                )
-            
-            # Mensajes sin application_id (compatibilidad)
-            messages = db.query(Message)\
-                .options(joinedload(Message.sender))\
-                .filter(
-                    Message.job_id == job_id,
-                    Message.application_id.is_(None)
-                )\
-                .order_by(Message.created_at.asc())\
-                .all()
-        
-        return messages
+            allowed_worker_id = job.worker_id
+        
+        is_worker = False
+        if not is_client and allowed_worker_id is not None:
+            worker_id = db.query(Worker.id).filter(Worker.user_id == user_id).scalar()
+            is_worker = worker_id is not None and worker_id == allowed_worker_id
+        
+        if not is_client and not is_worker:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No tienes acceso a este chat"
+            )
+        
+        # Filtrar por application_id; sin él, mensajes sin application_id (compatibilidad)
+        application_filter = (
+            Message.application_id == application_id if application_id
+            else Message.application_id.is_(None)
+        )
+        return load_messages(
+            db,
+            Message.job_id == job_id,
+            application_filter,
+            order_by=(Message.created_at.asc(),)
+        )
     
     @staticmethod
-    def message_to_response(message: Message) -> MessageResponse:
-        """Convierte un modelo Message a MessageResponse"""
+    def message_to_response(message: Union[Message, MessageRow]) -> MessageResponse:
+        """Convierte un Message (o un MessageRow) a MessageResponse"""
         sender_info = None
         if message.sender:
             sender_info = SenderInfo(
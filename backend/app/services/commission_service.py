@@ -7,6 +7,7 @@ from fastapi import HTTPException, status
 from app.models.commission import Commission, CommissionStatus
 from app.models.user import UserRole
 from app.schemas.commission import CommissionSubmitPayment, CommissionReview
+from app.utils.caching import bump_data_version
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,13 @@ logger = logging.getLogger(__name__)
 class CommissionService:
     """Servicio de comisiones (equivalente a @Service en Spring Boot)"""
     
+    @staticmethod
+    def _bump_worker_version(db: Session, worker_id: int) -> None:
+        """Invalida el ETag de /commissions/pending del trabajador (sin commit)"""
+        from sqlalchemy import select
+        from app.models.worker import Worker
+        bump_data_version(db, select(Worker.user_id).where(Worker.id == worker_id))
+    
     @staticmethod
     def get_pending_commissions(db: Session, worker_id: int) -> List[Commission]:
         """Obtiene comisiones pendientes de un trabajador"""
@@ -68,9 +76,9 @@ class CommissionService:
             commission.payment_code = payment_data.payment_code
             commission.payment_proof_url = payment_data.payment_proof_url
             commission.submitted_at = datetime.utcnow()  # Más eficiente que consulta a BD
+            CommissionService._bump_worker_version(db, commission.worker_id)
             
             db.commit()
-            db.refresh(commission)
             
             return commission
         except HTTPException:
@@ -126,9 +134,9 @@ class CommissionService:
             commission.reviewed_at = datetime.utcnow()  # Más eficiente que consulta a BD
             if review_data.notes:
                 commission.notes = review_data.notes
+            CommissionService._bump_worker_version(db, commission.worker_id)
             
             db.commit()
-            db.refresh(commission)
             
             logger.info(f"Comisión {commission_id} aprobada por manager {manager_id}")
             return commission
@@ -196,9 +204,9 @@ class CommissionService:
             commission.payment_code = None
             commission.payment_proof_url = None
             commission.submitted_at = None
+            CommissionService._bump_worker_version(db, commission.worker_id)
             
             db.commit()
-            db.refresh(commission)
             
             logger.info(f"Comisión {commission_id} rechazada por manager {manager_id}: {review_data.notes}")
             return commission
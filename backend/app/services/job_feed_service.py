@@ -0,0 +1,123 @@
+import math
+import heapq
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.models.worker import Worker
+from app.schemas.job import JobResponse
+from app.services.pending_job_index import JobCandidate, pending_job_index
+
+
+class JobFeedService:
+    """Feed de trabajos disponibles para un trabajador (rankeado o por recencia)"""
+
+    # Pesos de cada señal en el score final (suman 1)
+    WEIGHTS = {
+        "service": 0.35,   # El tipo de servicio está entre los servicios del trabajador
+        "distance": 0.25,  # Cercanía (si el trabajador envía su ubicación)
+        "recency": 0.20,   # Trabajos más nuevos primero
+        "price": 0.10,     # Tarifa base más alta
+        "client": 0.10,    # Reputación del cliente
+    }
+    PRICE_REFERENCE = 200.0  # Tarifa a partir de la cual la señal de precio es máxima
+    RECENCY_HALF_LIFE_HOURS = 24.0  # Cada 24h la señal de recencia se reduce a la mitad
+    DISTANCE_SCALE_KM = 5.0  # A 5 km la señal de distancia vale 0.5
+
+    @staticmethod
+    def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """Distancia haversine en km"""
+        lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+    @staticmethod
+    def score(
+        candidate: JobCandidate,
+        worker_services: set,
+        now: datetime,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
+    ) -> float:
+        """Score de relevancia de un trabajo para un trabajador (0 a 1)"""
+        weights = JobFeedService.WEIGHTS
+
+        service = 1.0 if candidate.service_type in worker_services else 0.0
+
+        # Sin ubicación (del trabajador o del trabajo) la señal es neutra
+        distance = 0.5
+        if latitude is not None and longitude is not None \
+                and candidate.latitude is not None and candidate.longitude is not None:
+            km = JobFeedService._distance_km(latitude, longitude, candidate.latitude, candidate.longitude)
+            distance = 1.0 / (1.0 + km / JobFeedService.DISTANCE_SCALE_KM)
+
+        age_hours = max((now - candidate.created_at).total_seconds() / 3600.0, 0.0)
+        recency = 0.5 ** (age_hours / JobFeedService.RECENCY_HALF_LIFE_HOURS)
+
+        price = min(candidate.base_fee / JobFeedService.PRICE_REFERENCE, 1.0)
+
+        # Reputación en escala 1-5 normalizada a 0-1
+        client = min(max((candidate.client_score - 1.0) / 4.0, 0.0), 1.0)
+
+        return (
+            weights["service"] * service
+            + weights["distance"] * distance
+            + weights["recency"] * recency
+            + weights["price"] * price
+            + weights["client"] * client
+        )
+
+    @staticmethod
+    def _worker_services(worker: Optional[Worker]) -> set:
+        """Servicios del trabajador como set (services puede venir como string JSON)"""
+        import json
+
+        services = worker.services if worker else None
+        if isinstance(services, str):
+            try:
+                services = json.loads(services)
+            except (json.JSONDecodeError, TypeError):
+                services = [services]
+        return set(services or [])
+
+    @staticmethod
+    def get_ranked_jobs(
+        db: Session,
+        worker: Optional[Worker],
+        service_type: Optional[str] = None,
+        limit: int = 50,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
+    ) -> List[JobResponse]:
+        """Obtiene los trabajos pendientes más relevantes para el trabajador
+        
+        Se responde desde el índice en memoria de trabajos pendientes;
+        la BD solo se consulta cuando el índice necesita reconciliarse.
+        """
+        pending_job_index.ensure_fresh(db)
+
+        service_filter = service_type.strip() if service_type and service_type.strip() else None
+        worker_services = JobFeedService._worker_services(worker)
+        now = datetime.utcnow()
+
+        top = heapq.nlargest(
+            limit,
+            pending_job_index.entries(service_filter),
+            key=lambda entry: (
+                JobFeedService.score(entry.candidate, worker_services, now, latitude, longitude),
+                entry.candidate.id
+            )
+        )
+        return [entry.response for entry in top]
+
+    @staticmethod
+    def get_recent_jobs(
+        db: Session,
+        service_type: Optional[str] = None,
+        search_query: Optional[str] = None,
+        limit: int = 50
+    ) -> List[JobResponse]:
+        """Trabajos pendientes más recientes primero (con búsqueda de texto opcional)"""
+        pending_job_index.ensure_fresh(db)
+
+        service_filter = service_type.strip() if service_type and service_type.strip() else None
+        return [entry.response for entry in pending_job_index.recent(service_filter, search_query, limit)]
@@ -1,12 +1,14 @@
 import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from fastapi import HTTPException, status
+from datetime import datetime
 from decimal import Decimal
 from app.models.job import Job, JobStatus
 from app.models.commission import Commission, CommissionStatus
 from app.schemas.job import JobCreate, JobUpdate, JobAddExtra
+from app.services.read_models import ApplicationRow, JobRow, load_applications, load_jobs
 
 logger = logging.getLogger(__name__)
 
@@ -53,17 +55,32 @@ class JobService:
         job_data = job_create.dict()
         job_data.pop("client_id", None)  # Remover si existe (no debería)
         
+        # Sin refresh: fechas y montos se fijan con la precisión que guarda la BD
+        # para que la respuesta y el índice de pendientes coincidan con lo leído después
+        from app.database import match_stored_precision
+        now = datetime.utcnow()
         new_job = Job(
             **job_data,
             client_id=client_id,  # Usar el client_id del parámetro
             status=JobStatus.PENDING,
             extras=Decimal("0.00"),
-            total_amount=job_create.base_fee
+            total_amount=job_create.base_fee,
+            created_at=now,
+            updated_at=now
         )
+        match_stored_precision(new_job)
         
         db.add(new_job)
+        
+        # Invalidar el ETag de /my-jobs del cliente
+        from app.utils.caching import bump_data_version
+        bump_data_version(db, [client_id])
+        
         db.commit()
-        db.refresh(new_job)
+        
+        # Mantener el índice en memoria de trabajos pendientes
+        from app.services.pending_job_index import pending_job_index
+        pending_job_index.add(new_job)
         
         return new_job
     
@@ -77,8 +94,13 @@ class JobService:
         ).filter(Job.id == job_id).first()
     
     @staticmethod
-    def get_available_jobs(db: Session, service_type: Optional[str] = None, search_query: Optional[str] = None) -> List[Job]:
-        """Obtiene trabajos disponibles (pendientes, NO aceptados)"""
+    def get_available_jobs(
+        db: Session,
+        service_type: Optional[str] = None,
+        search_query: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Job]:
+        """Obtiene trabajos disponibles (pendientes, NO aceptados), más recientes primero"""
         from sqlalchemy import or_
         
         query = db.query(Job).filter(
@@ -103,11 +125,18 @@ class JobService:
                 )
             )
         
-        return query.order_by(Job.created_at.desc()).all()  # Más recientes primero
+        query = query.order_by(Job.created_at.desc())  # Más recientes primero
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
     
     @staticmethod
-    def get_worker_jobs(db: Session, worker_id: int) -> List[Job]:
-        """Obtiene los trabajos activos de un trabajador (excluye completados y cancelados)"""
+    def get_worker_jobs(db: Session, worker_id: int, fields: Optional[Sequence[str]] = None) -> List[JobRow]:
+        """Obtiene los trabajos activos de un trabajador (excluye completados y cancelados)
+        
+        Retorna modelos de lectura (JobRow), no entidades: solo para responder.
+        Con fields solo se leen esos campos (fields= de la ruta).
+        """
         from sqlalchemy import case
         
         # Solo trabajos activos: ACCEPTED, IN_ROUTE, ON_SITE, IN_PROGRESS
@@ -129,17 +158,24 @@ class JobService:
             else_=999
         )
         
-        return db.query(Job).filter(
+        return load_jobs(
+            db,
             Job.worker_id == worker_id,
-            Job.status.in_(active_statuses)
-        ).order_by(
-            status_priority.asc(),  # Prioridad menor = más importante
-            Job.created_at.desc()  # Más recientes primero
-        ).all()
+            Job.status.in_(active_statuses),
+            order_by=(
+                status_priority.asc(),  # Prioridad menor = más importante
+                Job.created_at.desc()  # Más recientes primero
+            ),
+            fields=fields
+        )
     
     @staticmethod
-    def get_client_jobs(db: Session, client_id: int) -> List[Job]:
-        """Obtiene los trabajos de un cliente ordenados por relevancia (activos primero, luego por fecha)"""
+    def get_client_jobs(db: Session, client_id: int, fields: Optional[Sequence[str]] = None) -> List[JobRow]:
+        """Obtiene los trabajos de un cliente ordenados por relevancia (activos primero, luego por fecha)
+        
+        Retorna modelos de lectura (JobRow), no entidades: solo para responder.
+        Con fields solo se leen esos campos (fields= de la ruta).
+        """
         from sqlalchemy import case
         
         # Priorizar trabajos activos sobre completados/cancelados
@@ -160,94 +196,86 @@ class JobService:
             else_=2
         )
         
-        return db.query(Job).filter(
-            Job.client_id == client_id
-        ).order_by(
-            status_priority.asc(),  # Activos primero
-            Job.created_at.desc()  # Más recientes primero
-        ).all()
+        return load_jobs(
+            db,
+            Job.client_id == client_id,
+            order_by=(
+                status_priority.asc(),  # Activos primero
+                Job.created_at.desc()  # Más recientes primero
+            ),
+            fields=fields
+        )
     
     @staticmethod
-    def apply_to_job(db: Session, job_id: int, worker_id: int):
+    def apply_to_job(db: Session, job_id: int, worker) -> int:
         """Aplica a un trabajo (trabajador aplica, pero NO cambia el estado)
         
-        Valida que:
-        - El trabajo exista y esté en estado PENDING
-        - El trabajador no haya aplicado ya
-        - El trabajo no tenga ya un trabajador asignado
-        - El trabajador tenga Modo Plus activo
+        worker es el perfil del usuario autenticado (ya cargado en la ruta),
+        así que el Modo Plus se valida en memoria, sin consultar la BD.
+        
+        La aplicación se inserta primero, en un solo INSERT ... SELECT:
+            INSERT INTO job_applications (job_id, worker_id, is_accepted, created_at, updated_at)
+            SELECT id, ?, 0, ?, ? FROM jobs WHERE id = ? AND status = 'PENDING' AND worker_id IS NULL
+        - Si el trabajo no está disponible, el SELECT no devuelve filas (rowcount 0)
+        - Si el trabajador ya aplicó, uq_job_worker_application lanza IntegrityError
+        Solo en esos casos se consulta el trabajo para devolver el error correcto.
+        
+        Retorna el id de la aplicación creada.
         """
         from app.models.job_application import JobApplication
-        from app.models.worker import Worker
+        from app.services.outbox import OutboxService
+        from app.services.subscription_expiry import plus_active
+        from app.utils.caching import bump_data_version
+        from sqlalchemy import insert, select, literal
         from sqlalchemy.exc import IntegrityError
-        from datetime import datetime
         
+        # Validar Modo Plus con el perfil del usuario autenticado (el flag puede
+        # seguir encendido hasta que la tarea de expiración procese el vencimiento)
+        if not plus_active(worker):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Necesitas un plan Modo Plus activo para aplicar a trabajos"
+            )
+        
+        # Timestamps explícitos (UTC, como el default de los modelos): el INSERT ... SELECT
+        # no pasa por los defaults de Python
+        now = literal(datetime.utcnow())
         try:
-            job = db.query(Job).filter(Job.id == job_id).first()
-            
-            if not job:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Trabajo no encontrado"
-                )
-            
-            # Validar que el trabajo esté en estado PENDING
-            if job.status != JobStatus.PENDING:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Este trabajo ya no está disponible"
-                )
-            
-            # Validar que el trabajo no tenga ya un trabajador asignado
-            if job.worker_id is not None:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Este trabajo ya tiene un trabajador asignado"
-                )
-            
-            # Obtener worker y validar Modo Plus
-            worker = db.query(Worker).filter(Worker.id == worker_id).first()
-            if not worker:
-                raise HTTPException(status_code=404, detail="No tienes un perfil de trabajador")
-
-            now = datetime.utcnow()
-            if not (worker.is_plus_active and worker.plus_expires_at and worker.plus_expires_at > now):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Necesitas un plan Modo Plus activo para aplicar a trabajos"
+            result = db.execute(
+                insert(JobApplication).from_select(
+                    ["job_id", "worker_id", "is_accepted", "created_at", "updated_at"],
+                    select(Job.id, literal(worker.id), literal(False), now, now).where(
+                        Job.id == job_id,
+                        Job.status == JobStatus.PENDING,
+                        Job.worker_id.is_(None)
+                    )
                 )
+            )
             
-            # Validar que el trabajador no haya aplicado ya
-            existing_application = db.query(JobApplication).filter(
-                JobApplication.job_id == job_id,
-                JobApplication.worker_id == worker_id
-            ).first()
+            if result.rowcount != 1:
+                db.rollback()
+                JobService._raise_apply_conflict(db, job_id)
             
-            if existing_application:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Ya has aplicado a este trabajo"
-                )
+            # Invalidar el ETag de /my-applications del trabajador
+            bump_data_version(db, [worker.user_id])
             
-            # Crear aplicación (NO cambia el estado del trabajo)
-            application = JobApplication(
-                job_id=job_id,
-                worker_id=worker_id,
-                is_accepted=False
-            )
+            # Aviso al dashboard del cliente (outbox, misma transacción)
+            OutboxService.notify_job_parties(db, [job_id], "new_application", {
+                "application_id": result.lastrowid,
+                "worker_id": worker.id,
+                "worker_name": worker.full_name,
+            }, worker=False)
             
-            db.add(application)
             db.commit()
-            db.refresh(application)
             
-            return application
+            return result.lastrowid
         except HTTPException:
             # Re-lanzar HTTPException
             raise
         except IntegrityError:
-            # Condición de carrera: aplicación duplicada
+            # uq_job_worker_application: el trabajador ya aplicó
             db.rollback()
-            logger.warning(f"Intento de aplicación duplicada: trabajo {job_id}, trabajador {worker_id}")
+            logger.warning(f"Intento de aplicación duplicada: trabajo {job_id}, trabajador {worker.id}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Ya has aplicado a este trabajo"
@@ -261,104 +289,112 @@ class JobService:
                 detail="Error interno del servidor"
             )
     
+    @staticmethod
+    def _raise_apply_conflict(db: Session, job_id: int) -> None:
+        """Explica por qué el INSERT ... SELECT de la aplicación no insertó filas"""
+        job = db.query(Job).filter(Job.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Trabajo no encontrado"
+            )
+        
+        # Validar que el trabajo esté en estado PENDING
+        if job.status != JobStatus.PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Este trabajo ya no está disponible"
+            )
+        
+        # Validar que el trabajo no tenga ya un trabajador asignado
+        if job.worker_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Este trabajo ya tiene un trabajador asignado"
+            )
+        
+        # El trabajo cambió entre el INSERT y esta consulta
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El trabajo fue modificado por otra operación, intenta nuevamente"
+        )
+    
     @staticmethod
     def client_accept_worker(db: Session, job_id: int, application_id: int, client_id: int) -> Job:
         """Cliente acepta un trabajador (cambia el estado a ACCEPTED)
         
-        Valida que:
-        - El trabajo pertenezca al cliente
-        - El trabajo esté en estado PENDING
-        - El trabajo no tenga ya un trabajador asignado
-        - La aplicación pertenezca al trabajo
-        - El trabajador no esté ya asignado a otro trabajo activo
+        La aceptación es un único UPDATE condicional:
+            UPDATE jobs SET worker_id = (worker de la aplicación), status = 'ACCEPTED'
+            WHERE id = ? AND client_id = ? AND status = 'PENDING' AND worker_id IS NULL
+              AND EXISTS (aplicación del trabajo)
+        Si dos aceptaciones compiten, solo una afecta la fila; la otra ve rowcount 0.
+        La regla "un trabajo activo por trabajador" la garantiza el índice único
+        uq_jobs_active_worker (IntegrityError si el trabajador ya tiene uno).
+        
+        Solo cuando el UPDATE no afecta filas se consulta el estado para
+        devolver el mismo error que antes (404, 403 o 400).
         """
         from app.models.job_application import JobApplication
+        from app.services.outbox import OutboxService
+        from app.utils.caching import bump_job_parties
+        from sqlalchemy import update, select, exists
         from sqlalchemy.exc import IntegrityError
-        import logging
         
-        logger = logging.getLogger(__name__)
+        application_filter = (
+            JobApplication.id == application_id,
+            JobApplication.job_id == job_id
+        )
         
         try:
-            job = db.query(Job).filter(Job.id == job_id).first()
-            
-            if not job:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Trabajo no encontrado"
-                )
-            
-            # Validar que el cliente sea el dueño del trabajo
-            if job.client_id != client_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="No tienes permiso para aceptar trabajadores en este trabajo"
-                )
-            
-            # Validar que el trabajo esté en estado PENDING
-            if job.status != JobStatus.PENDING:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Este trabajo ya no está disponible"
+            result = db.execute(
+                update(Job)
+                .where(
+                    Job.id == job_id,
+                    Job.client_id == client_id,
+                    Job.status == JobStatus.PENDING,
+                    Job.worker_id.is_(None),
+                    exists().where(*application_filter)
                 )
-            
-            # Validar que el trabajo no tenga ya un trabajador asignado
-            if job.worker_id is not None:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Este trabajo ya tiene un trabajador asignado"
-                )
-            
-            # Obtener la aplicación y validar que pertenezca al trabajo
-            application = db.query(JobApplication).filter(
-                JobApplication.id == application_id,
-                JobApplication.job_id == job_id
-            ).first()
-            
-            if not application:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Aplicación no encontrada o no pertenece a este trabajo"
+                .values(
+                    worker_id=select(JobApplication.worker_id).where(*application_filter).scalar_subquery(),
+                    status=JobStatus.ACCEPTED
                 )
+                .execution_options(synchronize_session=False)
+            )
             
-            # Validar que el trabajador no esté ya asignado a otro trabajo activo
-            # (opcional: podrías permitir múltiples trabajos simultáneos)
-            active_jobs = db.query(Job).filter(
-                Job.worker_id == application.worker_id,
-                Job.status.in_([
-                    JobStatus.ACCEPTED,
-                    JobStatus.IN_ROUTE,
-                    JobStatus.ON_SITE,
-                    JobStatus.IN_PROGRESS
-                ])
-            ).first()
+            if result.rowcount != 1:
+                db.rollback()
+                JobService._raise_accept_conflict(db, job_id, application_id, client_id)
             
-            if active_jobs:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Este trabajador ya tiene un trabajo activo"
-                )
+            # Marcar aplicación como aceptada (misma transacción)
+            db.execute(
+                update(JobApplication)
+                .where(*application_filter)
+                .values(is_accepted=True)
+                .execution_options(synchronize_session=False)
+            )
             
-            # Marcar aplicación como aceptada
-            application.is_accepted = True
+            # Invalidar ETags del cliente, del trabajador y de los demás postulantes
+            bump_job_parties(db, job_id)
             
-            # Asignar trabajador al trabajo y cambiar estado
-            job.worker_id = application.worker_id
-            job.status = JobStatus.ACCEPTED
+            # Aviso al trabajador aceptado (outbox, misma transacción)
+            OutboxService.notify_job_parties(db, [job_id], "job_status_changed", {
+                "status": JobStatus.ACCEPTED.value,
+                "application_id": application_id,
+            }, client=False)
             
             db.commit()
-            db.refresh(job)
-            
-            return job
         except HTTPException:
             # Re-lanzar HTTPException
             raise
         except IntegrityError:
-            # Condición de carrera: dos aceptaciones simultáneas
+            # uq_jobs_active_worker: el trabajador ya tiene otro trabajo activo
             db.rollback()
-            logger.warning(f"Intento de aceptar trabajador duplicado para trabajo {job_id}")
+            logger.warning(f"Trabajador con trabajo activo al aceptar trabajo {job_id}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Este trabajo ya tiene un trabajador asignado"
+                detail="Este trabajador ya tiene un trabajo activo"
             )
         except Exception as e:
             # Rollback en caso de error
@@ -368,48 +404,112 @@ class JobService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error interno del servidor"
             )
+        
+        # El trabajo dejó de estar pendiente: quitarlo del índice en memoria
+        from app.services.pending_job_index import pending_job_index
+        pending_job_index.remove(job_id)
+        
+        # El UPDATE no sincronizó la sesión: recargar el trabajo aceptado
+        # (una sola consulta, con cliente y trabajador para la respuesta)
+        from sqlalchemy.orm import joinedload
+        return db.query(Job).options(
+            joinedload(Job.client),
+            joinedload(Job.worker)
+        ).populate_existing().filter(Job.id == job_id).one()
     
     @staticmethod
-    def get_job_applications(db: Session, job_id: int, client_id: int) -> List:
-        """Obtiene las aplicaciones de trabajadores para un trabajo (solo para el cliente)"""
+    def _raise_accept_conflict(db: Session, job_id: int, application_id: int, client_id: int) -> None:
+        """Explica por qué el UPDATE condicional de aceptación no afectó filas"""
         from app.models.job_application import JobApplication
-        from sqlalchemy.orm import joinedload
         
-        # Verificar que el trabajo existe y pertenece al cliente
         job = db.query(Job).filter(Job.id == job_id).first()
+        
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Trabajo no encontrado"
             )
         
+        # Validar que el cliente sea el dueño del trabajo
         if job.client_id != client_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes permiso para ver las aplicaciones de este trabajo"
+                detail="No tienes permiso para aceptar trabajadores en este trabajo"
+            )
+        
+        # Validar que el trabajo esté en estado PENDING
+        if job.status != JobStatus.PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Este trabajo ya no está disponible"
+            )
+        
+        # Validar que el trabajo no tenga ya un trabajador asignado
+        if job.worker_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Este trabajo ya tiene un trabajador asignado"
             )
         
-        # Obtener todas las aplicaciones con información del trabajador
-        from app.models.worker import Worker
-        applications = db.query(JobApplication).options(
-            joinedload(JobApplication.worker).joinedload(Worker.user)
-        ).filter(JobApplication.job_id == job_id).order_by(JobApplication.created_at.desc()).all()
+        # Solo queda que la aplicación no pertenezca al trabajo
+        application_exists = db.query(JobApplication.id).filter(
+            JobApplication.id == application_id,
+            JobApplication.job_id == job_id
+        ).first()
+        if not application_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Aplicación no encontrada o no pertenece a este trabajo"
+            )
         
-        return applications
+        # El trabajo cambió entre el UPDATE y esta consulta
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El trabajo fue modificado por otra operación, intenta nuevamente"
+        )
     
     @staticmethod
-    def get_worker_applications(db: Session, worker_id: int) -> List:
-        """Obtiene las aplicaciones de un trabajador con relaciones cargadas"""
+    def get_job_applications(
+        db: Session, job_id: int, client_id: int, fields: Optional[Sequence[str]] = None
+    ) -> List[ApplicationRow]:
+        """Obtiene las aplicaciones de trabajadores para un trabajo (solo para el cliente)"""
         from app.models.job_application import JobApplication
-        from sqlalchemy.orm import joinedload
         
-        # Obtener todas las aplicaciones con información del trabajo y worker
-        applications = db.query(JobApplication).options(
-            joinedload(JobApplication.job).joinedload(Job.client),
-            joinedload(JobApplication.worker)
-        ).filter(JobApplication.worker_id == worker_id).order_by(JobApplication.created_at.desc()).all()
+        # Verificar que el trabajo existe y pertenece al cliente (solo se lee client_id)
+        job_client_id = db.query(Job.client_id).filter(Job.id == job_id).scalar()
+        if job_client_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Trabajo no encontrado"
+            )
+        
+        if job_client_id != client_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No tienes permiso para ver las aplicaciones de este trabajo"
+            )
+        
+        # Aplicaciones con la información del trabajador (modelos de lectura)
+        return load_applications(
+            db,
+            JobApplication.job_id == job_id,
+            order_by=(JobApplication.created_at.desc(),),
+            fields=fields
+        )
+    
+    @staticmethod
+    def get_worker_applications(
+        db: Session, worker_id: int, fields: Optional[Sequence[str]] = None
+    ) -> List[ApplicationRow]:
+        """Obtiene las aplicaciones de un trabajador (modelos de lectura con el trabajador)"""
+        from app.models.job_application import JobApplication
         
-        return applications
+        return load_applications(
+            db,
+            JobApplication.worker_id == worker_id,
+            order_by=(JobApplication.created_at.desc(),),
+            fields=fields
+        )
     
     @staticmethod
     def worker_has_applied_to_job(db: Session, worker_id: int, job_id: int) -> bool:
@@ -424,102 +524,28 @@ class JobService:
         return application is not None
     
     @staticmethod
-    def update_job_status(db: Session, job_id: int, new_status: JobStatus, worker_id: Optional[int] = None) -> Job:
-        """Actualiza el estado de un trabajo con validación de transiciones y trabajador
+    def update_job_status(db: Session, job_id: int, new_status: JobStatus, user) -> Job:
+        """Actualiza el estado de un trabajo según la máquina de estados
         
-        Valida transiciones de estado y permisos del trabajador.
-        Crea comisión automáticamente al completar el trabajo.
-        """
-        import logging
-        from sqlalchemy.exc import IntegrityError
+        La transición (orígenes válidos, guarda de actor, timestamps y hooks como
+        la comisión al completar) sale de la tabla de app.services.job_state_machine
+        y se aplica con un único UPDATE compare-and-set.
         
-        logger = logging.getLogger(__name__)
+        user es el usuario autenticado: su rol elige la transición y su id la guarda.
+        """
+        from app.services.job_state_machine import JobStateMachine
+        return JobStateMachine.apply(db, job_id, new_status, user)
+    
+    @staticmethod
+    def update_jobs_status_batch(db: Session, items, role, user_id: Optional[int] = None) -> List[dict]:
+        """Aplica muchos cambios de estado (job_id, destino) en una sola transacción
         
-        try:
-            job = db.query(Job).filter(Job.id == job_id).first()
-            
-            if not job:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Trabajo no encontrado"
-                )
-            
-            # Validar que el trabajo no esté cancelado (no se puede modificar un trabajo cancelado)
-            if job.status == JobStatus.CANCELLED:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No se puede modificar un trabajo cancelado"
-                )
-            
-            # Validar que el trabajo no esté completado (excepto si se está cancelando)
-            if job.status == JobStatus.COMPLETED and new_status != JobStatus.CANCELLED:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No se puede modificar un trabajo completado"
-                )
-            
-            # Validar que el trabajador asignado sea el que hace la acción (si se proporciona worker_id)
-            if worker_id is not None:
-                if job.worker_id != worker_id:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="No tienes permiso para modificar este trabajo"
-                    )
-            
-            # Validar transiciones de estado válidas
-            valid_transitions = {
-                JobStatus.PENDING: [JobStatus.ACCEPTED, JobStatus.CANCELLED],
-                JobStatus.ACCEPTED: [JobStatus.IN_ROUTE, JobStatus.CANCELLED],
-                JobStatus.IN_ROUTE: [JobStatus.ON_SITE, JobStatus.CANCELLED],
-                JobStatus.ON_SITE: [JobStatus.IN_PROGRESS, JobStatus.CANCELLED],
-                JobStatus.IN_PROGRESS: [JobStatus.COMPLETED, JobStatus.CANCELLED],
-                JobStatus.COMPLETED: [],  # Estado final, no se puede cambiar
-                JobStatus.CANCELLED: []  # Estado final, no se puede cambiar
-            }
-            
-            current_status = job.status
-            if new_status not in valid_transitions.get(current_status, []):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"No se puede cambiar de {current_status.value} a {new_status.value}. Transición inválida."
-                )
-            
-            # Actualizar estado
-            job.status = new_status
-            
-            # Actualizar timestamps según el estado
-            # Usar datetime.utcnow() en lugar de consulta a BD (más eficiente)
-            from datetime import datetime
-            if new_status == JobStatus.IN_PROGRESS:
-                job.started_at = datetime.utcnow()
-            elif new_status == JobStatus.COMPLETED:
-                job.completed_at = datetime.utcnow()
-                # Crear comisión automáticamente
-                JobService._create_commission(db, job)
-            
-            db.commit()
-            db.refresh(job)
-            
-            return job
-        except HTTPException:
-            # Re-lanzar HTTPException
-            raise
-        except IntegrityError:
-            # Condición de carrera o constraint violation
-            db.rollback()
-            logger.warning(f"Error de integridad al actualizar estado del trabajo {job_id}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Error al actualizar el estado del trabajo"
-            )
-        except Exception as e:
-            # Rollback en caso de error
-            db.rollback()
-            logger.exception(f"Error al actualizar estado del trabajo {job_id}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error interno del servidor"
-            )
+        Valida cada par contra la tabla de transiciones en memoria y ejecuta un
+        UPDATE compare-and-set por transición. Retorna un resultado por item.
+        Pensado para el manager y scripts de mantenimiento (role=MANAGER).
+        """
+        from app.services.job_state_machine import JobStateMachine
+        return JobStateMachine.apply_batch(db, items, role, user_id)
     
     @staticmethod
     def add_extra(db: Session, job_id: int, extra_data: JobAddExtra) -> Job:
@@ -568,13 +594,15 @@ class JobService:
         # Recalcular total_amount para mantener consistencia
         job.total_amount = job.base_fee + job.extras
         
+        from app.utils.caching import bump_job_parties
+        bump_job_parties(db, job_id)
+        
         db.commit()
-        db.refresh(job)
         
         return job
     
     @staticmethod
-    def _create_commission(db: Session, job: Job) -> Commission:
+    def _create_commission(db: Session, job_id: int) -> Commission:
         """Crea una comisión automáticamente cuando se completa un trabajo
         
         Nuevo modelo de negocio: no usamos comisiones por trabajo
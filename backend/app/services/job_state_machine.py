@@ -0,0 +1,434 @@
+"""
+Máquina de estados de trabajos (Job.status)
+
+La tabla de transiciones se arma una sola vez al importar el módulo. Cada
+transición declara:
+- Estados de origen permitidos y estado destino
+- Rol que la ejecuta y guarda de actor (trabajador asignado o cliente dueño)
+- Campos que se escriben junto con el estado (timestamps)
+- Hooks antes del commit (misma transacción) y después del commit
+
+Cada transición es un único UPDATE compare-and-set:
+    UPDATE jobs SET status = :destino, ... WHERE id = :id AND status IN (:origenes) AND <guarda>
+Si otro request cambió el estado primero, el UPDATE no afecta filas y no hay
+actualizaciones perdidas. Solo en ese caso se consulta el trabajo para
+devolver el error correspondiente.
+"""
+import logging
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import update, select
+from sqlalchemy.orm import Session, joinedload
+from app.models.job import Job, JobStatus
+from app.models.user import User, UserRole
+from app.models.worker import Worker
+
+logger = logging.getLogger(__name__)
+
+# Guardas de actor
+ASSIGNED_WORKER = "assigned_worker"  # El usuario es el trabajador asignado al trabajo
+OWNER_CLIENT = "owner_client"        # El usuario es el cliente dueño del trabajo
+ANY_ACTOR = "any"                    # Sin guarda (manager)
+
+
+def _create_commission_hook(db: Session, job_id: int) -> None:
+    """Crea la comisión del trabajo completado (misma transacción)"""
+    from app.services.job_service import JobService
+    JobService._create_commission(db, job_id)
+
+
+def _remove_from_pending_index(job_id: int) -> None:
+    """Quita el trabajo del índice en memoria de pendientes (idempotente)"""
+    from app.services.pending_job_index import pending_job_index
+    pending_job_index.remove(job_id)
+
+
+class JobTransition(NamedTuple):
+    """Transición declarativa de la máquina de estados"""
+    sources: FrozenSet[JobStatus]
+    target: JobStatus
+    role: UserRole
+    guard: str
+    # Campos escritos junto con el estado: (columna, función que genera el valor)
+    set_fields: Tuple[Tuple[str, Callable[[], object]], ...] = ()
+    before_commit: Tuple[Callable[[Session, int], None], ...] = ()
+    after_commit: Tuple[Callable[[int], None], ...] = ()
+    # Mensajes específicos cuando el trabajo está en un estado no permitido
+    status_errors: Dict[JobStatus, str] = {}
+    forbidden_detail: str = "No tienes permiso para modificar este trabajo"
+
+
+_CANCELLABLE = frozenset({
+    JobStatus.PENDING,
+    JobStatus.ACCEPTED,
+    JobStatus.IN_ROUTE,
+    JobStatus.ON_SITE,
+    JobStatus.IN_PROGRESS,
+})
+
+_CANCEL_ERRORS = {
+    JobStatus.CANCELLED: "Este trabajo ya está cancelado",
+    JobStatus.COMPLETED: "No puedes cancelar un trabajo que ya está completado",
+}
+
+TRANSITIONS: Tuple[JobTransition, ...] = (
+    JobTransition(
+        sources=frozenset({JobStatus.ACCEPTED}),
+        target=JobStatus.IN_ROUTE,
+        role=UserRole.WORKER,
+        guard=ASSIGNED_WORKER,
+    ),
+    JobTransition(
+        sources=frozenset({JobStatus.IN_ROUTE}),
+        target=JobStatus.ON_SITE,
+        role=UserRole.WORKER,
+        guard=ASSIGNED_WORKER,
+    ),
+    JobTransition(
+        sources=frozenset({JobStatus.ON_SITE}),
+        target=JobStatus.IN_PROGRESS,
+        role=UserRole.WORKER,
+        guard=ASSIGNED_WORKER,
+        set_fields=(("started_at", datetime.utcnow),),
+    ),
+    JobTransition(
+        sources=frozenset({JobStatus.IN_PROGRESS}),
+        target=JobStatus.COMPLETED,
+        role=UserRole.WORKER,
+        guard=ASSIGNED_WORKER,
+        set_fields=(("completed_at", datetime.utcnow),),
+        before_commit=(_create_commission_hook,),
+    ),
+    # Cancelaciones: el cliente puede cancelar mientras el trabajo no terminó,
+    # el trabajador solo antes de salir en ruta, el manager siempre
+    JobTransition(
+        sources=_CANCELLABLE,
+        target=JobStatus.CANCELLED,
+        role=UserRole.CLIENT,
+        guard=OWNER_CLIENT,
+        after_commit=(_remove_from_pending_index,),
+        status_errors=_CANCEL_ERRORS,
+        forbidden_detail="Solo puedes cancelar tus propios trabajos",
+    ),
+    JobTransition(
+        sources=frozenset({JobStatus.PENDING, JobStatus.ACCEPTED}),
+        target=JobStatus.CANCELLED,
+        role=UserRole.WORKER,
+        guard=ASSIGNED_WORKER,
+        after_commit=(_remove_from_pending_index,),
+        status_errors={
+            **_CANCEL_ERRORS,
+            JobStatus.IN_ROUTE: "No puedes cancelar un trabajo que ya está en progreso",
+            JobStatus.ON_SITE: "No puedes cancelar un trabajo que ya está en progreso",
+            JobStatus.IN_PROGRESS: "No puedes cancelar un trabajo que ya está en progreso",
+        },
+        forbidden_detail="No tienes permiso para cancelar este trabajo",
+    ),
+    JobTransition(
+        sources=_CANCELLABLE,
+        target=JobStatus.CANCELLED,
+        role=UserRole.MANAGER,
+        guard=ANY_ACTOR,
+        after_commit=(_remove_from_pending_index,),
+        status_errors=_CANCEL_ERRORS,
+    ),
+)
+
+# Transición del sistema (no la ejecuta ningún usuario): el barrido de
+# trabajos PENDING vencidos. Solo desde PENDING, para no cancelar un trabajo
+# que se aceptó entre la selección del lote y el UPDATE
+EXPIRE_STALE_PENDING = JobTransition(
+    sources=frozenset({JobStatus.PENDING}),
+    target=JobStatus.CANCELLED,
+    role=UserRole.MANAGER,
+    guard=ANY_ACTOR,
+    after_commit=(_remove_from_pending_index,),
+)
+
+# Índice precalculado: (rol, estado destino) -> transición
+_BY_ROLE_AND_TARGET: Dict[Tuple[UserRole, JobStatus], JobTransition] = {
+    (transition.role, transition.target): transition for transition in TRANSITIONS
+}
+
+
+class JobStateMachine:
+    """Aplica transiciones de estado con un UPDATE compare-and-set"""
+
+    @staticmethod
+    def get_transition(role: UserRole, target: JobStatus) -> Optional[JobTransition]:
+        """Transición que el rol puede ejecutar hacia el estado destino (None si no existe)"""
+        return _BY_ROLE_AND_TARGET.get((role, target))
+
+    @staticmethod
+    def _guard_condition(transition: JobTransition, user_id: int):
+        """Condición SQL de la guarda de actor (None si no hay guarda)"""
+        if transition.guard == ASSIGNED_WORKER:
+            return Job.worker_id == select(Worker.id).where(Worker.user_id == user_id).scalar_subquery()
+        if transition.guard == OWNER_CLIENT:
+            return Job.client_id == user_id
+        return None
+
+    @staticmethod
+    def build_update(transition: JobTransition, job_ids, user_id: int):
+        """UPDATE compare-and-set de la transición para uno o varios trabajos"""
+        conditions = [Job.id.in_(job_ids), Job.status.in_(transition.sources)]
+        guard = JobStateMachine._guard_condition(transition, user_id)
+        if guard is not None:
+            conditions.append(guard)
+
+        values = {"status": transition.target}
+        for column, factory in transition.set_fields:
+            values[column] = factory()
+
+        return (
+            update(Job)
+            .where(*conditions)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def apply(db: Session, job_id: int, target: JobStatus, user: User) -> Job:
+        """Ejecuta la transición del usuario hacia target sobre un trabajo
+
+        Retorna el trabajo actualizado (con cliente y trabajador cargados).
+        """
+        from sqlalchemy.exc import IntegrityError
+        from app.services.outbox import OutboxService
+        from app.utils.caching import bump_job_parties
+
+        transition = JobStateMachine.get_transition(user.role, target)
+        if transition is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No tienes permiso para modificar este trabajo"
+            )
+
+        try:
+            result = db.execute(JobStateMachine.build_update(transition, [job_id], user.id))
+            if result.rowcount != 1:
+                db.rollback()
+                JobStateMachine._raise_rejected(db, transition, job_id, user)
+
+            for hook in transition.before_commit:
+                hook(db, job_id)
+
+            # Invalidar ETags de todos los que ven el trabajo
+            bump_job_parties(db, job_id)
+            # Aviso en tiempo real al cliente y al trabajador (outbox, misma transacción)
+            OutboxService.notify_job_parties(db, [job_id], "job_status_changed", {"status": target.value})
+
+            db.commit()
+        except HTTPException:
+            # Re-lanzar HTTPException
+            raise
+        except IntegrityError:
+            # Condición de carrera o constraint violation
+            db.rollback()
+            logger.warning(f"Error de integridad al actualizar estado del trabajo {job_id}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Error al actualizar el estado del trabajo"
+            )
+        except Exception:
+            # Rollback en caso de error
+            db.rollback()
+            logger.exception(f"Error al actualizar estado del trabajo {job_id}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error interno del servidor"
+            )
+
+        for hook in transition.after_commit:
+            hook(job_id)
+
+        # El UPDATE no sincronizó la sesión: recargar el trabajo para la respuesta
+        return db.query(Job).options(
+            joinedload(Job.client),
+            joinedload(Job.worker)
+        ).populate_existing().filter(Job.id == job_id).one()
+
+    @staticmethod
+    def rejection_for(transition: JobTransition, job, worker_id: Optional[int], user_id: Optional[int]):
+        """Motivo (status_code, detail) por el que la transición no aplica a job
+
+        job puede ser un Job o una fila con id, status, client_id y worker_id.
+        worker_id es el perfil de trabajador del usuario (solo para la guarda
+        ASSIGNED_WORKER). Retorna None si la transición sí aplicaría.
+        """
+        if job is None:
+            return status.HTTP_404_NOT_FOUND, "Trabajo no encontrado"
+
+        if transition.guard == OWNER_CLIENT and job.client_id != user_id:
+            return status.HTTP_403_FORBIDDEN, transition.forbidden_detail
+        if transition.guard == ASSIGNED_WORKER and job.worker_id != worker_id:
+            return status.HTTP_403_FORBIDDEN, transition.forbidden_detail
+
+        if job.status in transition.sources:
+            return None
+
+        if job.status in transition.status_errors:
+            return status.HTTP_400_BAD_REQUEST, transition.status_errors[job.status]
+        if job.status == JobStatus.CANCELLED:
+            return status.HTTP_400_BAD_REQUEST, "No se puede modificar un trabajo cancelado"
+        if job.status == JobStatus.COMPLETED:
+            return status.HTTP_400_BAD_REQUEST, "No se puede modificar un trabajo completado"
+        return (
+            status.HTTP_400_BAD_REQUEST,
+            f"No se puede cambiar de {job.status.value} a {transition.target.value}. Transición inválida."
+        )
+
+    @staticmethod
+    def _raise_rejected(db: Session, transition: JobTransition, job_id: int, user: User) -> None:
+        """Explica por qué el UPDATE compare-and-set no afectó filas"""
+        worker_id = None
+        if transition.guard == ASSIGNED_WORKER:
+            from app.services.worker_service import WorkerService
+            worker = WorkerService.get_worker_by_user_id(db, user.id)
+            if not worker:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="No tienes un perfil de trabajador"
+                )
+            worker_id = worker.id
+
+        job = db.query(Job).filter(Job.id == job_id).first()
+        rejection = JobStateMachine.rejection_for(transition, job, worker_id, user.id)
+        if rejection is None:
+            # El estado cambió entre el UPDATE y esta consulta
+            rejection = (
+                status.HTTP_409_CONFLICT,
+                "El trabajo fue modificado por otra operación, intenta nuevamente"
+            )
+        raise HTTPException(status_code=rejection[0], detail=rejection[1])
+
+    @staticmethod
+    def apply_batch(
+        db: Session,
+        items: List[Tuple[int, JobStatus]],
+        role: UserRole,
+        user_id: Optional[int] = None
+    ) -> List[dict]:
+        """Aplica muchos cambios de estado (job_id, destino) en una sola transacción
+
+        1. Carga el estado actual de todos los trabajos en un SELECT
+        2. Valida cada item contra la tabla de transiciones en memoria
+        3. Agrupa los válidos por transición y ejecuta un UPDATE compare-and-set
+           por grupo (WHERE id IN (...) AND status IN (orígenes) AND guarda)
+        4. Hooks, invalidación de ETags y un único commit
+
+        Aplicados son exactamente las filas que cambió el UPDATE: con
+        UPDATE ... RETURNING id donde el motor lo soporta (SQLite); en MySQL, que
+        no lo tiene, el SELECT del paso 1 bloquea los trabajos (FOR UPDATE) y
+        nadie puede cambiarlos hasta el commit. Así un trabajo que otro request
+        llevó al mismo estado no se reporta como aplicado ni repite sus hooks.
+
+        Retorna un resultado por item, en el mismo orden: applied, status_code,
+        detail y previous_status. Un item rechazado no afecta a los demás.
+        """
+        from sqlalchemy.exc import IntegrityError
+        from app.services.outbox import OutboxService
+        from app.utils.caching import bump_jobs_parties
+
+        results: List[dict] = [
+            {"job_id": job_id, "target_status": target, "applied": False,
+             "status_code": status.HTTP_200_OK, "detail": None, "previous_status": None}
+            for job_id, target in items
+        ]
+
+        returning = db.get_bind().dialect.update_returning
+        job_ids = {job_id for job_id, _ in items}
+        current_query = db.query(Job.id, Job.status, Job.client_id, Job.worker_id).filter(Job.id.in_(job_ids))
+        if not returning:
+            # En orden de id: dos lotes que se solapan se bloquean sin deadlock
+            current_query = current_query.order_by(Job.id).with_for_update()
+        current = {row.id: row for row in current_query} if job_ids else {}
+
+        worker_id = None
+        if role == UserRole.WORKER and user_id is not None:
+            worker_id = db.query(Worker.id).filter(Worker.user_id == user_id).scalar()
+
+        # Validación en memoria y agrupación por transición
+        # destino -> ids (el rol es fijo, así que el destino identifica la transición)
+        groups: Dict[JobStatus, List[int]] = {}
+        seen = set()
+        for result in results:
+            job_id, target = result["job_id"], result["target_status"]
+            row = current.get(job_id)
+            result["previous_status"] = row.status if row is not None else None
+
+            if job_id in seen:
+                rejection = (status.HTTP_400_BAD_REQUEST, "Trabajo repetido en el lote")
+            else:
+                seen.add(job_id)
+                transition = JobStateMachine.get_transition(role, target)
+                if transition is None:
+                    rejection = (status.HTTP_403_FORBIDDEN, "No tienes permiso para modificar este trabajo")
+                else:
+                    rejection = JobStateMachine.rejection_for(transition, row, worker_id, user_id)
+
+            if rejection is not None:
+                result["status_code"], result["detail"] = rejection
+            else:
+                groups.setdefault(target, []).append(job_id)
+
+        if not groups:
+            return results
+
+        applied_ids: Dict[JobStatus, List[int]] = {}
+        try:
+            for target, ids in groups.items():
+                transition = JobStateMachine.get_transition(role, target)
+                statement = JobStateMachine.build_update(transition, ids, user_id)
+                if returning:
+                    # Los que otro request cambió entre el SELECT y el UPDATE no vuelven
+                    applied_ids[target] = [job_id for (job_id,) in db.execute(statement.returning(Job.id))]
+                else:
+                    # Filas bloqueadas desde la validación: el UPDATE las cambia todas
+                    if db.execute(statement).rowcount != len(ids):
+                        raise RuntimeError(f"UPDATE de lote afectó filas inesperadas: {ids}")
+                    applied_ids[target] = ids
+                for job_id in applied_ids[target]:
+                    for hook in transition.before_commit:
+                        hook(db, job_id)
+
+            bump_jobs_parties(db, [job_id for ids in applied_ids.values() for job_id in ids])
+            for target, ids in applied_ids.items():
+                OutboxService.notify_job_parties(db, ids, "job_status_changed", {"status": target.value})
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            logger.warning(f"Error de integridad al aplicar lote de {len(items)} cambios de estado")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Error al actualizar el estado de los trabajos"
+            )
+        except Exception:
+            db.rollback()
+            logger.exception(f"Error al aplicar lote de {len(items)} cambios de estado")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error interno del servidor"
+            )
+
+        done = set()
+        for target, ids in applied_ids.items():
+            transition = JobStateMachine.get_transition(role, target)
+            for job_id in ids:
+                done.add(job_id)
+                for hook in transition.after_commit:
+                    hook(job_id)
+
+        conflicts = {job_id for ids in groups.values() for job_id in ids} - done
+        for result in results:
+            if result["status_code"] != status.HTTP_200_OK:
+                continue
+            if result["job_id"] in done:
+                result["applied"] = True
+            elif result["job_id"] in conflicts:
+                result["status_code"] = status.HTTP_409_CONFLICT
+                result["detail"] = "El trabajo fue modificado por otra operación, intenta nuevamente"
+
+        logger.info(f"Lote de estados aplicado: {len(done)} de {len(items)} cambios")
+        return results
@@ -0,0 +1,106 @@
+"""
+Tareas periódicas de mantenimiento registradas en el scheduler (app/scheduler.py)
+
+- stale-job-sweep: cancela trabajos PENDING vencidos (líder)
+- subscription-expiry / subscription-expiry-reload: vencimiento del Modo Plus (líder)
+- pending-index-reconcile: reconcilia el índice en memoria de pendientes
+  (cada proceso tiene el suyo, así que corre en todos)
+- outbox-cleanup: borra eventos del outbox más viejos que la retención (líder)
+- idempotency-cleanup: borra las Idempotency-Key vencidas (líder)
+- worker-verification-fix: lo que hacía fix_verification_status.py a mano (líder, diario)
+
+La entrega del outbox no es una tarea del scheduler: el despachador tiene su
+propio ciclo (app.services.outbox) y corre aunque SCHEDULER_ENABLED esté apagado.
+"""
+import logging
+from app.config import settings
+from app.scheduler import Scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_pending_index() -> None:
+    """Recarga el índice de pendientes fuera del request (ensure_fresh lo encuentra al día)"""
+    from app.database import SessionLocal
+    from app.services.pending_job_index import pending_job_index
+
+    db = SessionLocal()
+    try:
+        pending_job_index.reconcile(db)
+    finally:
+        db.close()
+
+
+def fix_verification_status() -> int:
+    """is_verified=False para trabajadores verificados sin foto de verificación (un UPDATE)"""
+    from sqlalchemy import update, or_
+    from app.database import SessionLocal
+    from app.models.worker import Worker
+
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            update(Worker)
+            .where(
+                Worker.is_verified == True,
+                or_(Worker.verification_photo_url.is_(None), Worker.verification_photo_url == "")
+            )
+            .values(is_verified=False)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if result.rowcount:
+        logger.info(f"Verificación corregida para {result.rowcount} trabajadores sin foto")
+    return result.rowcount
+
+
+def register_maintenance_tasks(scheduler: Scheduler) -> None:
+    """Registra las tareas de mantenimiento según la configuración"""
+    from app.services.pending_job_index import PendingJobIndex
+    from app.services.outbox import cleanup_outbox
+    from app.services.stale_job_sweeper import StaleJobSweeper
+    from app.services.subscription_expiry import SubscriptionExpiryService
+    from app.utils.idempotency import IdempotencyStore
+
+    jitter = settings.SCHEDULER_JITTER_SECONDS
+
+    if settings.STALE_JOB_SWEEP_ENABLED:
+        scheduler.add_interval(
+            "stale-job-sweep", StaleJobSweeper.run_once,
+            settings.STALE_JOB_SWEEP_INTERVAL_SECONDS, jitter_seconds=jitter
+        )
+
+    if settings.SUBSCRIPTION_EXPIRY_ENABLED:
+        # Sin jitter: el chequeo es en memoria y el vencimiento debe ser puntual
+        scheduler.add_interval(
+            "subscription-expiry", SubscriptionExpiryService.run_due,
+            settings.SUBSCRIPTION_EXPIRY_CHECK_SECONDS
+        )
+        scheduler.add_interval(
+            "subscription-expiry-reload", SubscriptionExpiryService.reload,
+            settings.SUBSCRIPTION_EXPIRY_RELOAD_SECONDS, jitter_seconds=jitter, run_at_start=True
+        )
+
+    # Un poco antes del vencimiento del índice, para que /available nunca tenga que reconciliar
+    scheduler.add_interval(
+        "pending-index-reconcile", reconcile_pending_index,
+        PendingJobIndex.RECONCILE_INTERVAL_SECONDS * 0.8, leader_only=False, run_at_start=True
+    )
+
+    scheduler.add_interval(
+        "outbox-cleanup", cleanup_outbox, 600, jitter_seconds=jitter
+    )
+
+    scheduler.add_interval(
+        "idempotency-cleanup", IdempotencyStore.cleanup, 3600, jitter_seconds=jitter
+    )
+
+    scheduler.add_cron(
+        "worker-verification-fix", fix_verification_status, "0 4 * * *", jitter_seconds=jitter
+    )
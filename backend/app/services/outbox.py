@@ -0,0 +1,382 @@
+"""
+Outbox transaccional para notificaciones en tiempo real
+
+Antes las notificaciones (chat y dashboard) se enviaban dentro del request,
+después del commit y solo a las conexiones WebSocket del mismo proceso: si el
+proceso moría o el destinatario estaba conectado a otro worker, se perdían.
+
+Ahora los servicios insertan el evento en outbox_events en la misma
+transacción que el cambio de dominio (un INSERT extra; INSERT ... SELECT para
+los cambios en lote). Cada proceso corre un despachador que lee los eventos
+nuevos en lotes y los entrega a SUS conexiones (salas de chat y dashboards).
+Así todos los procesos ven todos los eventos, y un cliente que reconecta puede
+pedir los que se perdió (replay por last_event_id en el WebSocket del dashboard).
+
+Marca de agua: los ids AUTO_INCREMENT no se confirman en orden (una
+transacción con id 10 puede hacer commit después de la que tiene id 11). El
+despachador recuerda los ids ya entregados y solo avanza la marca de agua
+sobre eventos con más de OUTBOX_SETTLE_SECONDS de antigüedad, así que un
+commit tardío todavía se entrega.
+
+El despachador arranca con la aplicación (start() en el lifespan, con o sin
+scheduler): fija la marca de agua en el último evento existente antes de
+aceptar conexiones y luego consulta cada OUTBOX_POLL_INTERVAL_SECONDS. Los
+requests que escriben eventos llaman a kick() tras el commit para no esperar
+al siguiente ciclo.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+from sqlalchemy.types import JSON
+from app.config import settings
+from app.models.job import Job
+from app.models.outbox import OutboxEvent
+from app.models.worker import Worker
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD = "dashboard"
+CHAT_MESSAGE = "chat.message"
+
+
+class OutboxService:
+    """Escritura de eventos (sin commit: van en la transacción del llamador)"""
+
+    @staticmethod
+    def publish(
+        db: Session,
+        event_type: str,
+        payload: dict,
+        user_id: Optional[int] = None,
+        job_id: Optional[int] = None,
+        application_id: Optional[int] = None
+    ) -> None:
+        db.add(OutboxEvent(
+            event_type=event_type,
+            user_id=user_id,
+            job_id=job_id,
+            application_id=application_id,
+            payload=payload
+        ))
+
+    @staticmethod
+    def notify_user(db: Session, user_id: int, notification_type: str, data: dict) -> None:
+        """Notificación al dashboard de un usuario"""
+        OutboxService.publish(
+            db, DASHBOARD, {"type": notification_type, "data": data},
+            user_id=user_id, job_id=data.get("job_id")
+        )
+
+    @staticmethod
+    def notify_job_parties(
+        db: Session,
+        job_ids: Iterable[int],
+        notification_type: str,
+        data: dict,
+        client: bool = True,
+        worker: bool = True
+    ) -> None:
+        """Notificación al cliente y/o trabajador asignado de varios trabajos
+
+        Un INSERT ... SELECT por destinatario, sin cargar los trabajos. El
+        job_id de cada evento se agrega a data al entregarlo.
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+
+        payload = literal({"type": notification_type, "data": data}, type_=JSON)
+        columns = ["event_type", "user_id", "job_id", "payload", "created_at"]
+        now = literal(datetime.utcnow())
+
+        if client:
+            db.execute(insert(OutboxEvent).from_select(
+                columns,
+                select(literal(DASHBOARD), Job.client_id, Job.id, payload, now).where(Job.id.in_(job_ids))
+            ))
+        if worker:
+            db.execute(insert(OutboxEvent).from_select(
+                columns,
+                select(literal(DASHBOARD), Worker.user_id, Job.id, payload, now)
+                .join(Worker, Worker.id == Job.worker_id)
+                .where(Job.id.in_(job_ids))
+            ))
+
+    @staticmethod
+    def cleanup(db: Session, batch_size: int = 5000) -> int:
+        """Borra, en lotes, los eventos que superan la retención"""
+        cutoff = datetime.utcnow() - timedelta(minutes=settings.OUTBOX_RETENTION_MINUTES)
+        deleted = 0
+        while True:
+            ids = [
+                event_id for (event_id,) in db.query(OutboxEvent.id)
+                .filter(OutboxEvent.created_at < cutoff)
+                .order_by(OutboxEvent.id)
+                .limit(batch_size)
+            ]
+            if not ids:
+                break
+            db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+            db.commit()
+            deleted += len(ids)
+            if len(ids) < batch_size:
+                break
+        return deleted
+
+    @staticmethod
+    def events_for_user(db: Session, user_id: int, after_id: int, limit: int = 100) -> List[OutboxEvent]:
+        """Eventos de dashboard de un usuario posteriores a after_id (replay al reconectar)"""
+        return (
+            db.query(OutboxEvent)
+            .filter(
+                OutboxEvent.user_id == user_id,
+                OutboxEvent.event_type == DASHBOARD,
+                OutboxEvent.id > after_id
+            )
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .all()
+        )
+
+
+def dashboard_message(event) -> dict:
+    """(tipo, data) de un evento de dashboard, con job_id y event_id"""
+    data = dict(event.payload.get("data") or {})
+    if event.job_id is not None:
+        data.setdefault("job_id", event.job_id)
+    data["event_id"] = event.id
+    return {"type": event.payload["type"], "data": data}
+
+
+class OutboxDispatcher:
+    """Entrega los eventos del outbox a las conexiones de este proceso"""
+
+    def __init__(self):
+        self._watermark: Optional[int] = None  # Todo id <= marca ya fue entregado (o no existe)
+        self._max_seen = 0
+        # id -> created_at de eventos entregados por encima de la marca de agua
+        self._delivered: Dict[int, datetime] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.delivered_total = 0
+        self.last_batch_ms = 0.0
+
+    @staticmethod
+    def _columns():
+        return (
+            OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.user_id,
+            OutboxEvent.job_id, OutboxEvent.application_id,
+            OutboxEvent.payload, OutboxEvent.created_at
+        )
+
+    def _fetch(self) -> list:
+        """Lee los eventos no entregados (síncrono, en el threadpool)
+
+        - Nuevos: id > mayor id visto (rango de PK, un lote)
+        - Huecos: ids entre la marca de agua y el mayor visto que no se habían
+          visto (commits tardíos); primero solo los ids, luego las filas que faltan
+        """
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            events = []
+            if self._max_seen > self._watermark:
+                missing = [
+                    event_id for (event_id,) in db.query(OutboxEvent.id).filter(
+                        OutboxEvent.id > self._watermark, OutboxEvent.id <= self._max_seen
+                    )
+                    if event_id not in self._delivered
+                ]
+                if missing:
+                    events = db.query(*self._columns()).filter(
+                        OutboxEvent.id.in_(missing)
+                    ).order_by(OutboxEvent.id).all()
+
+            events += db.query(*self._columns()).filter(
+                OutboxEvent.id > self._max_seen
+            ).order_by(OutboxEvent.id).limit(settings.OUTBOX_BATCH_SIZE).all()
+            return events
+        finally:
+            db.close()
+
+    def initialize(self) -> None:
+        """Marca de agua en el último evento existente (al arrancar, sin conexiones todavía)"""
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            self._watermark = self._max_seen = db.query(func.max(OutboxEvent.id)).scalar() or 0
+        finally:
+            db.close()
+
+    def _advance_watermark(self) -> None:
+        """Avanza la marca sobre los entregados que ya no pueden tener huecos antes"""
+        settled = datetime.utcnow() - timedelta(seconds=settings.OUTBOX_SETTLE_SECONDS)
+        for event_id in sorted(self._delivered):
+            if self._delivered[event_id] > settled:
+                break
+            self._watermark = event_id
+            del self._delivered[event_id]
+
+    async def dispatch(self) -> int:
+        """Entrega los eventos pendientes; retorna cuántos entregó"""
+        from starlette.concurrency import run_in_threadpool
+
+        if self._watermark is None:
+            # Sin start() (scripts, tests sin lifespan) no hay conexiones que atender
+            return 0
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            started = time.perf_counter()
+            total = 0
+            while True:
+                events = await run_in_threadpool(self._fetch)
+                for event in events:
+                    try:
+                        await deliver(event)
+                    except Exception:
+                        logger.exception(f"Error al entregar el evento {event.id} del outbox")
+                    self._delivered[event.id] = event.created_at or datetime.utcnow()
+                    self._max_seen = max(self._max_seen, event.id)
+                total += len(events)
+                self._advance_watermark()
+                if len(events) < settings.OUTBOX_BATCH_SIZE:
+                    break
+
+            self.delivered_total += total
+            self.last_batch_ms = round((time.perf_counter() - started) * 1000, 1)
+            return total
+
+    async def start(self) -> None:
+        """Fija la marca de agua y arranca el ciclo de consulta (lifespan, antes de servir)"""
+        from starlette.concurrency import run_in_threadpool
+
+        if self._task is not None:
+            return
+        await run_in_threadpool(self.initialize)
+        self._task = asyncio.create_task(self._run(), name="outbox-dispatch")
+
+    async def stop(self) -> None:
+        """Detiene el ciclo de consulta (al apagar)"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.dispatch()
+            except Exception:
+                logger.exception("Error al despachar eventos del outbox")
+            await asyncio.sleep(settings.OUTBOX_POLL_INTERVAL_SECONDS)
+
+    def kick(self) -> None:
+        """Entrega ya, sin esperar al ciclo de consulta (llamar desde el event loop tras un commit)"""
+        try:
+            # En un contexto vacío: la tarea no hereda el del request que la dispara
+            # (sus consultas no cuentan en sus métricas ni en su @query_budget)
+            contextvars.Context().run(asyncio.get_running_loop().create_task, self.dispatch())
+        except RuntimeError:
+            # Sin event loop (scripts): lo entrega el despachador del servidor
+            pass
+
+
+outbox_dispatcher = OutboxDispatcher()
+
+
+async def deliver(event) -> None:
+    """Entrega un evento a las conexiones locales que correspondan"""
+    from app.api.routes.notifications import dashboard_connections, send_dashboard_notification
+
+    if event.event_type == DASHBOARD:
+        if event.user_id in dashboard_connections:
+            message = dashboard_message(event)
+            await send_dashboard_notification(event.user_id, message["type"], message["data"])
+        return
+
+    if event.event_type == CHAT_MESSAGE:
+        await deliver_chat_message(event)
+        return
+
+    logger.warning(f"Tipo de evento de outbox desconocido: {event.event_type}")
+
+
+async def deliver_chat_message(event) -> None:
+    """Mensaje a la sala de chat y aviso al dashboard del cliente"""
+    from starlette.concurrency import run_in_threadpool
+    from app.api.routes.chat import broadcast_to_room
+    from app.api.routes.notifications import dashboard_connections, send_dashboard_notification
+
+    message = event.payload["message"]
+    await broadcast_to_room((event.job_id, event.application_id), {"type": "message", "data": message})
+
+    # El cliente ve los mensajes nuevos en su dashboard (si no los envió él)
+    client_id = event.payload.get("client_id")
+    if client_id is None or message["sender_id"] == client_id or client_id not in dashboard_connections:
+        return
+
+    worker_info = await run_in_threadpool(_assigned_worker_info, event.job_id)
+    await send_dashboard_notification(client_id, "new_message", {
+        "job_id": event.job_id,
+        "application_id": event.application_id,
+        "message_id": message["id"],
+        "sender_id": message["sender_id"],
+        "sender_name": event.payload.get("sender_name"),
+        "sender_info": event.payload.get("sender_info"),  # Info completa del trabajador que envió el mensaje
+        "worker_info": worker_info,  # Info del trabajador asignado al trabajo
+        "content": (message.get("content") or "")[:100],  # Primeros 100 caracteres
+        "created_at": message.get("created_at"),
+        "event_id": event.id,
+    })
+
+
+def _assigned_worker_info(job_id: int) -> Optional[dict]:
+    """Datos del trabajador asignado para el aviso de mensaje nuevo (solo si hay a quién avisar)"""
+    from sqlalchemy.orm import joinedload
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        job = db.query(Job).options(
+            joinedload(Job.worker).joinedload(Worker.user)
+        ).filter(Job.id == job_id).first()
+        if not job or not job.worker or not job.worker.user:
+            return None
+        return {
+            "id": job.worker.id,
+            "full_name": job.worker.user.full_name,
+            "phone": job.worker.user.phone,
+            "profile_image_url": job.worker.user.profile_image_url,
+            "is_verified": job.worker.is_verified
+        }
+    finally:
+        db.close()
+
+
+def cleanup_outbox() -> int:
+    """Tarea del scheduler: borra eventos viejos"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        deleted = OutboxService.cleanup(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    if deleted:
+        logger.info(f"Outbox: {deleted} eventos eliminados por retención")
+    return deleted
@@ -0,0 +1,225 @@
+"""
+Índice en memoria de trabajos pendientes (PENDING)
+
+El conjunto de trabajos pendientes es pequeño y se consulta en cada carga de
+/api/jobs/available. En lugar de consultar y filtrar en MySQL en cada request,
+cada proceso mantiene un índice local:
+
+- Entradas por id con el snapshot ya serializado (JobResponse) y las señales de ranking
+- Buckets por service_type, cada uno con una lista ordenada por recencia
+- Actualización incremental desde JobService (crear, aceptar, cambiar estado)
+- Reconciliación periódica contra la BD (cubre cambios hechos por otros procesos)
+"""
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models.job import Job, JobStatus
+from app.schemas.job import JobResponse
+
+logger = logging.getLogger(__name__)
+
+# Clave de orden por recencia: (created_at, id)
+RecencyKey = Tuple[datetime, int]
+
+
+class JobCandidate(NamedTuple):
+    """Datos mínimos de un trabajo pendiente necesarios para rankearlo"""
+    id: int
+    service_type: str
+    base_fee: float
+    latitude: Optional[float]
+    longitude: Optional[float]
+    created_at: datetime
+    client_score: float  # Score bayesiano de reputación del cliente
+
+
+class PendingJobEntry(NamedTuple):
+    """Entrada del índice: señales de ranking + respuesta lista para enviar"""
+    candidate: JobCandidate
+    response: JobResponse
+    search_text: str  # title/description/address/service_type en minúsculas
+
+
+class PendingJobIndex:
+    """Índice de trabajos pendientes local al proceso"""
+
+    # Cada cuánto se reconcilia el índice contra la BD (segundos)
+    RECONCILE_INTERVAL_SECONDS = 30
+
+    def __init__(self):
+        self._entries: Dict[int, PendingJobEntry] = {}
+        self._buckets: Dict[str, List[RecencyKey]] = {}
+        self._recent: List[RecencyKey] = []
+        self._last_reconcile: Optional[float] = None
+        self._lock = threading.RLock()
+        # Cambios incrementales ocurridos durante cada recarga en curso
+        # (job_id -> entrada nueva, o None si se quitó); se reaplican tras el reemplazo
+        self._reload_changes: List[Dict[int, Optional[PendingJobEntry]]] = []
+
+    # ------------------------------------------------------------------
+    # Construcción de entradas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _build_entry(job: Job) -> PendingJobEntry:
+        """Construye la entrada a partir de un Job (o JobRow) con el cliente cargado"""
+        client_score = job.client.reputation_score if job.client is not None else None
+        candidate = JobCandidate(
+            id=job.id,
+            service_type=job.service_type,
+            base_fee=float(job.base_fee or 0),
+            latitude=float(job.latitude) if job.latitude is not None else None,
+            longitude=float(job.longitude) if job.longitude is not None else None,
+            created_at=job.created_at or datetime.utcnow(),
+            client_score=float(client_score or 0),
+        )
+        search_text = " ".join(
+            (value or "").lower() for value in (job.title, job.description, job.address, job.service_type)
+        )
+        return PendingJobEntry(candidate, JobResponse.model_validate(job), search_text)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental (llamado por JobService después del commit)
+    # ------------------------------------------------------------------
+
+    def _insert(self, entry: PendingJobEntry) -> None:
+        candidate = entry.candidate
+        key = (candidate.created_at, candidate.id)
+        self._entries[candidate.id] = entry
+        bisect.insort(self._buckets.setdefault(candidate.service_type, []), key)
+        bisect.insort(self._recent, key)
+
+    def _discard(self, job_id: int) -> None:
+        entry = self._entries.pop(job_id, None)
+        if entry is None:
+            return
+        candidate = entry.candidate
+        key = (candidate.created_at, candidate.id)
+        for keys in (self._buckets.get(candidate.service_type), self._recent):
+            if keys is None:
+                continue
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+        if not self._buckets.get(candidate.service_type):
+            self._buckets.pop(candidate.service_type, None)
+
+    def add(self, job: Job) -> None:
+        """Agrega (o reemplaza) un trabajo pendiente"""
+        if job.status != JobStatus.PENDING:
+            self.remove(job.id)
+            return
+        try:
+            entry = self._build_entry(job)
+        except Exception:
+            # El índice nunca debe hacer fallar una escritura ya confirmada:
+            # la próxima reconciliación lo corrige
+            logger.exception(f"No se pudo indexar el trabajo {job.id}")
+            return
+        with self._lock:
+            self._discard(job.id)
+            self._insert(entry)
+            for changes in self._reload_changes:
+                changes[job.id] = entry
+
+    def remove(self, job_id: int) -> None:
+        """Quita un trabajo que dejó de estar pendiente"""
+        with self._lock:
+            self._discard(job_id)
+            for changes in self._reload_changes:
+                changes[job_id] = None
+
+    # ------------------------------------------------------------------
+    # Reconciliación contra la BD
+    # ------------------------------------------------------------------
+
+    def reconcile(self, db: Session) -> int:
+        """Recarga el índice completo desde la BD (trabajos PENDING)
+
+        Lee solo las columnas de la respuesta (JobRow), sin entidades en la sesión.
+        Un trabajo aceptado o creado en este proceso entre el SELECT y el reemplazo
+        no se pierde: add/remove se registran mientras dura la recarga y se
+        reaplican sobre el snapshot. La lectura usa su propia transacción, iniciada
+        después de empezar a registrar (la de db puede tener un snapshot anterior
+        en REPEATABLE READ).
+        """
+        from app.services.read_models import load_jobs
+
+        changes: Dict[int, Optional[PendingJobEntry]] = {}
+        with self._lock:
+            self._reload_changes.append(changes)
+        try:
+            with Session(bind=db.get_bind()) as reload_db:
+                jobs = load_jobs(reload_db, Job.status == JobStatus.PENDING)
+                entries = [self._build_entry(job) for job in jobs]
+
+            with self._lock:
+                self._entries = {}
+                self._buckets = {}
+                self._recent = []
+                for entry in entries:
+                    self._insert(entry)
+                for job_id, entry in changes.items():
+                    self._discard(job_id)
+                    if entry is not None:
+                        self._insert(entry)
+                self._last_reconcile = time.monotonic()
+        finally:
+            with self._lock:
+                self._reload_changes.remove(changes)
+
+        logger.info(f"Índice de trabajos pendientes reconciliado: {len(self._entries)} trabajos")
+        return len(entries)
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Reconcilia si el índice nunca se cargó o si venció el intervalo"""
+        last = self._last_reconcile
+        if last is None or time.monotonic() - last >= self.RECONCILE_INTERVAL_SECONDS:
+            self.reconcile(db)
+
+    # ------------------------------------------------------------------
+    # Lecturas
+    # ------------------------------------------------------------------
+
+    def entries(self, service_type: Optional[str] = None) -> List[PendingJobEntry]:
+        """Entradas pendientes (opcionalmente de un solo service_type), sin orden"""
+        with self._lock:
+            if service_type is None:
+                return list(self._entries.values())
+            return [self._entries[job_id] for _, job_id in self._buckets.get(service_type, [])]
+
+    def get(self, job_id: int) -> Optional[JobResponse]:
+        """Snapshot de un trabajo pendiente (None si no está en el índice)"""
+        entry = self._entries.get(job_id)
+        return entry.response if entry is not None else None
+
+    def recent(
+        self,
+        service_type: Optional[str] = None,
+        search_query: Optional[str] = None,
+        limit: int = 50
+    ) -> List[PendingJobEntry]:
+        """Entradas más recientes primero, con filtro opcional de texto"""
+        term = search_query.strip().lower() if search_query and search_query.strip() else None
+        result = []
+        with self._lock:
+            keys = self._recent if service_type is None else self._buckets.get(service_type, [])
+            for _, job_id in reversed(keys):
+                entry = self._entries[job_id]
+                if term and term not in entry.search_text:
+                    continue
+                result.append(entry)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Instancia global (una por proceso)
+pending_job_index = PendingJobIndex()
@@ -1,7 +1,13 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import update, func
 from fastapi import HTTPException, status
+from app.config import settings
 from app.models.rating import Rating
 from app.models.job import Job, JobStatus
+from app.models.user import User
+from app.models.worker import Worker
 from app.schemas.rating import RatingCreate
 
 
@@ -35,12 +41,15 @@ class RatingService:
         # Buscar si ya existe una calificación para este trabajo
         existing_rating = db.query(Rating).filter(Rating.job_id == job_id).first()
         
+        # Actualizar la reputación del cliente en la misma transacción
+        previous = existing_rating.worker_rating if existing_rating else None
+        RatingService._apply_reputation_delta(db, User, job.client_id, previous, rating_data.rating)
+        
         if existing_rating:
             # Actualizar la calificación existente
             existing_rating.worker_rating = rating_data.rating
             existing_rating.worker_comment = rating_data.comment
             db.commit()
-            db.refresh(existing_rating)
             return existing_rating
         else:
             # Crear nueva calificación
@@ -51,7 +60,6 @@ class RatingService:
             )
             db.add(new_rating)
             db.commit()
-            db.refresh(new_rating)
             return new_rating
     
     @staticmethod
@@ -81,12 +89,15 @@ class RatingService:
         # Buscar si ya existe una calificación para este trabajo
         existing_rating = db.query(Rating).filter(Rating.job_id == job_id).first()
         
+        # Actualizar la reputación del trabajador en la misma transacción
+        previous = existing_rating.client_rating if existing_rating else None
+        RatingService._apply_reputation_delta(db, Worker, job.worker_id, previous, rating_data.rating)
+        
         if existing_rating:
             # Actualizar la calificación existente
             existing_rating.client_rating = rating_data.rating
             existing_rating.client_comment = rating_data.comment
             db.commit()
-            db.refresh(existing_rating)
             return existing_rating
         else:
             # Crear nueva calificación
@@ -97,7 +108,6 @@ class RatingService:
             )
             db.add(new_rating)
             db.commit()
-            db.refresh(new_rating)
             return new_rating
     
     @staticmethod
@@ -113,3 +123,106 @@ class RatingService:
         
         return rating
 
+    
+    @staticmethod
+    def _bayesian_score(count: int, total: int) -> Decimal:
+        """Score bayesiano: promedio "suavizado" hacia REPUTATION_PRIOR_MEAN"""
+        weight = settings.REPUTATION_PRIOR_WEIGHT
+        prior = Decimal(str(settings.REPUTATION_PRIOR_MEAN))
+        score = (weight * prior + total) / (weight + count)
+        return score.quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
+    
+    @staticmethod
+    def _apply_reputation_delta(db: Session, model, target_id: Optional[int], previous: Optional[int], new: int):
+        """Aplica una calificación nueva (o modificada) a los agregados de reputación
+        
+        model es Worker (reputación como trabajador) o User (reputación como cliente).
+        Se hace con un UPDATE atómico (reputation_count = reputation_count + ...) para que
+        dos calificaciones simultáneas al mismo trabajador no se pisen.
+        No hace commit: se confirma junto con la calificación.
+        """
+        if target_id is None:
+            return
+        
+        # Calificación nueva suma 1 a la cantidad; una modificada solo ajusta la suma
+        delta_count = 1 if previous is None else 0
+        delta_sum = new - (previous or 0)
+        if delta_count == 0 and delta_sum == 0:
+            return
+        
+        new_count = model.reputation_count + delta_count
+        new_sum = model.reputation_sum + delta_sum
+        weight = settings.REPUTATION_PRIOR_WEIGHT
+        prior_total = weight * settings.REPUTATION_PRIOR_MEAN
+        
+        # ordered_values: avg y score se asignan antes que count y sum porque MySQL
+        # evalúa las asignaciones de izquierda a derecha (verían los valores ya actualizados)
+        # "* 1.0" fuerza división decimal también en motores con división entera
+        statement = (
+            update(model)
+            .where(model.id == target_id)
+            .ordered_values(
+                (model.reputation_avg, new_sum * 1.0 / new_count),
+                (model.reputation_score, (new_sum + prior_total) * 1.0 / (new_count + weight)),
+                (model.reputation_count, new_count),
+                (model.reputation_sum, new_sum),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(statement)
+    
+    @staticmethod
+    def rebuild_reputation(db: Session) -> dict:
+        """Recalcula desde cero los agregados de reputación (backfill)
+        
+        Un GROUP BY por tipo de reputación y un UPDATE masivo por clave primaria.
+        Pensado para ejecutarse una vez tras la migración o si se sospecha
+        que los agregados quedaron desincronizados (ver rebuild_reputation.py).
+        """
+        prior = Decimal(str(settings.REPUTATION_PRIOR_MEAN))
+        
+        def build_rows(grouped):
+            rows = []
+            for target_id, count, total in grouped:
+                total = int(total or 0)
+                rows.append({
+                    "id": target_id,
+                    "reputation_count": count,
+                    "reputation_sum": total,
+                    "reputation_avg": (Decimal(total) / count).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+                    "reputation_score": RatingService._bayesian_score(count, total),
+                })
+            return rows
+        
+        # Trabajadores: calificaciones que les dieron los clientes
+        worker_rows = build_rows(
+            db.query(Job.worker_id, func.count(Rating.client_rating), func.sum(Rating.client_rating))
+            .join(Rating, Rating.job_id == Job.id)
+            .filter(Job.worker_id.isnot(None), Rating.client_rating.isnot(None))
+            .group_by(Job.worker_id)
+            .all()
+        )
+        
+        # Clientes: calificaciones que les dieron los trabajadores
+        client_rows = build_rows(
+            db.query(Job.client_id, func.count(Rating.worker_rating), func.sum(Rating.worker_rating))
+            .join(Rating, Rating.job_id == Job.id)
+            .filter(Rating.worker_rating.isnot(None))
+            .group_by(Job.client_id)
+            .all()
+        )
+        
+        reset_values = {
+            "reputation_count": 0,
+            "reputation_sum": 0,
+            "reputation_avg": None,
+            "reputation_score": prior,
+        }
+        for model, rows in ((Worker, worker_rows), (User, client_rows)):
+            db.execute(update(model).values(**reset_values).execution_options(synchronize_session=False))
+            if rows:
+                db.execute(update(model), rows)
+        
+        db.commit()
+        
+        return {"workers": len(worker_rows), "clients": len(client_rows)}
@@ -0,0 +1,237 @@
+"""
+Modelos de lectura para los endpoints de listas
+
+/my-jobs, /my-applications, /workers/search/list, /chat/{job_id}/messages y la
+reconciliación del índice de pendientes cargaban entidades ORM completas
+(todas las columnas, más las de las relaciones embebidas como users.password_hash)
+solo para construir la respuesta. Cada entidad pasa además por el identity map
+y el unit of work de la sesión aunque el endpoint sea de solo lectura.
+
+Aquí cada respuesta tiene una tupla con nombre con exactamente los campos que
+necesita, cargada con un select() de columnas (los bloques embebidos client /
+worker / sender salen de OUTER JOINs en la misma consulta). Las tuplas se leen
+por atributo igual que las entidades, así que sirven tanto para fast_json como
+para los schemas Pydantic (from_attributes).
+
+Con fields= (ver app/utils/sparse_fields.py) la consulta se reduce a las
+columnas pedidas y solo hace JOIN con los bloques pedidos; el resto de los
+campos de la tupla queda en None.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, NamedTuple, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.job import Job, JobStatus, PaymentMethod
+from app.models.job_application import JobApplication
+from app.models.message import Message
+from app.models.user import User
+from app.models.worker import Worker
+
+
+class ClientRow(NamedTuple):
+    """ClientInfo (+ reputation_score para el ranking de /available)"""
+    id: int
+    full_name: Optional[str]
+    phone: Optional[str]
+    email: str
+    profile_image_url: Optional[str]
+    reputation_score: Optional[Decimal]
+
+
+class WorkerInfoRow(NamedTuple):
+    """WorkerInfo"""
+    id: int
+    full_name: Optional[str]
+    phone: Optional[str]
+    profile_image_url: Optional[str]
+    is_verified: bool
+
+
+class JobRow(NamedTuple):
+    """JobResponse"""
+    id: int
+    title: str
+    description: Optional[str]
+    service_type: str
+    payment_method: PaymentMethod
+    base_fee: Decimal
+    address: str
+    latitude: Optional[Decimal]
+    longitude: Optional[Decimal]
+    scheduled_at: Optional[datetime]
+    client_id: int
+    worker_id: Optional[int]
+    status: JobStatus
+    extras: Optional[Decimal]
+    total_amount: Optional[Decimal]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+    client: Optional[ClientRow]
+    worker: Optional[WorkerInfoRow]
+
+
+class ApplicationRow(NamedTuple):
+    """JobApplicationResponse"""
+    id: int
+    job_id: int
+    worker_id: int
+    is_accepted: bool
+    created_at: datetime
+    updated_at: datetime
+    worker: Optional[WorkerInfoRow]
+
+
+class WorkerRow(NamedTuple):
+    """WorkerResponse"""
+    id: int
+    user_id: int
+    full_name: str
+    phone: Optional[str]
+    services: Any
+    description: Optional[str]
+    district: Optional[str]
+    is_available: bool
+    yape_number: Optional[str]
+    profile_image_url: Optional[str]
+    is_verified: bool
+    verification_photo_url: Optional[str]
+    is_plus_active: bool
+    plus_expires_at: Optional[datetime]
+    reputation_count: int
+    reputation_avg: Optional[Decimal]
+    reputation_score: Optional[Decimal]
+    created_at: datetime
+    updated_at: datetime
+
+
+class SenderRow(NamedTuple):
+    """SenderInfo"""
+    id: int
+    full_name: Optional[str]
+    email: str
+
+
+class MessageRow(NamedTuple):
+    """MessageResponse"""
+    id: int
+    job_id: int
+    application_id: Optional[int]
+    sender_id: int
+    content: str
+    has_image: bool
+    image_url: Optional[str]
+    created_at: datetime
+    sender: Optional[SenderRow]
+
+
+# Columnas de cada modelo de lectura, en el orden de sus campos
+# (los bloques embebidos se agregan al final de la consulta)
+WORKER_COLUMNS = tuple(getattr(Worker, name) for name in WorkerRow._fields)
+_JOB_COLUMNS = tuple(getattr(Job, name) for name in JobRow._fields[:-2])
+_APPLICATION_COLUMNS = tuple(getattr(JobApplication, name) for name in ApplicationRow._fields[:-1])
+_MESSAGE_COLUMNS = tuple(getattr(Message, name) for name in MessageRow._fields[:-1])
+_CLIENT_COLUMNS = tuple(getattr(User, name) for name in ClientRow._fields)
+_WORKER_INFO_COLUMNS = tuple(getattr(Worker, name) for name in WorkerInfoRow._fields)
+_SENDER_COLUMNS = tuple(getattr(User, name) for name in SenderRow._fields)
+
+
+class _Embedded(NamedTuple):
+    """Bloque embebido cargado con un OUTER JOIN"""
+    field: str
+    row_type: type
+    columns: tuple
+    target: Any
+    onclause: Any
+
+
+_JOB_EMBEDDED = (
+    _Embedded("client", ClientRow, _CLIENT_COLUMNS, User, User.id == Job.client_id),
+    _Embedded("worker", WorkerInfoRow, _WORKER_INFO_COLUMNS, Worker, Worker.id == Job.worker_id),
+)
+_APPLICATION_EMBEDDED = (
+    _Embedded("worker", WorkerInfoRow, _WORKER_INFO_COLUMNS, Worker, Worker.id == JobApplication.worker_id),
+)
+_MESSAGE_EMBEDDED = (
+    _Embedded("sender", SenderRow, _SENDER_COLUMNS, User, User.id == Message.sender_id),
+)
+
+
+def _nested(row_type, values: Sequence) -> Optional[NamedTuple]:
+    """Bloque embebido de un OUTER JOIN (None si no hubo fila: id NULL)"""
+    return None if values[0] is None else row_type._make(values)
+
+
+def narrow(columns: Sequence, fields: Optional[Sequence[str]], required: Sequence[str] = ()) -> tuple:
+    """Columnas pedidas con fields= (siempre id y required); todas si fields es None"""
+    if fields is None:
+        return tuple(columns)
+    wanted = {"id", *fields, *required}
+    return tuple(column for column in columns if column.key in wanted)
+
+
+def row_factory(row_type, names: Sequence[str]):
+    """Función valores -> row_type para una proyección con esos campos
+
+    Los campos que no se proyectaron quedan en None (fields= los excluye de la respuesta).
+    """
+    if tuple(names) == row_type._fields:
+        return row_type._make
+    positions = [row_type._fields.index(name) for name in names]
+    empty = [None] * len(row_type._fields)
+
+    def make(values: Sequence):
+        data = list(empty)
+        for position, value in zip(positions, values):
+            data[position] = value
+        return row_type._make(data)
+
+    return make
+
+
+def _load(db: Session, row_type, columns, embedded, criteria, order_by, fields) -> list:
+    """select() de columns + bloques embebidos (OUTER JOIN) convertido a row_type"""
+    columns = narrow(columns, fields)
+    if fields is not None:
+        embedded = tuple(block for block in embedded if block.field in fields)
+
+    statement = select(*columns, *(column for block in embedded for column in block.columns))
+    for block in embedded:
+        statement = statement.outerjoin(block.target, block.onclause)
+
+    make = row_factory(row_type, [column.key for column in columns] + [block.field for block in embedded])
+    end = len(columns)
+    result = []
+    for row in db.execute(statement.where(*criteria).order_by(*order_by)):
+        values = list(row[:end])
+        start = end
+        for block in embedded:
+            stop = start + len(block.columns)
+            values.append(_nested(block.row_type, row[start:stop]))
+            start = stop
+        result.append(make(values))
+    return result
+
+
+def load_jobs(
+    db: Session, *criteria, order_by: Sequence = (), fields: Optional[Sequence[str]] = None
+) -> List[JobRow]:
+    """Trabajos que cumplen criteria como JobRow (con cliente y trabajador asignado)
+
+    Con fields solo se leen esas columnas y solo se hace JOIN con los bloques pedidos.
+    """
+    return _load(db, JobRow, _JOB_COLUMNS, _JOB_EMBEDDED, criteria, order_by, fields)
+
+
+def load_applications(
+    db: Session, *criteria, order_by: Sequence = (), fields: Optional[Sequence[str]] = None
+) -> List[ApplicationRow]:
+    """Aplicaciones que cumplen criteria como ApplicationRow (con el trabajador)"""
+    return _load(db, ApplicationRow, _APPLICATION_COLUMNS, _APPLICATION_EMBEDDED, criteria, order_by, fields)
+
+
+def load_messages(db: Session, *criteria, order_by: Sequence = ()) -> List[MessageRow]:
+    """Mensajes que cumplen criteria como MessageRow (con el remitente)"""
+    return _load(db, MessageRow, _MESSAGE_COLUMNS, _MESSAGE_EMBEDDED, criteria, order_by, None)
@@ -0,0 +1,182 @@
+"""
+Barrido de trabajos PENDING vencidos
+
+Un trabajo PENDING que nadie aceptó se queda para siempre en el conjunto de
+pendientes: infla cada consulta de /available y el índice en memoria. Este
+barrido cancela, en lotes, los trabajos PENDING:
+- Creados hace más de STALE_JOB_MAX_AGE_HOURS, o
+- Con scheduled_at ya pasado
+
+Cada lote es una transacción corta:
+    SELECT id, client_id ... WHERE status = 'PENDING' AND (...) LIMIT n FOR UPDATE SKIP LOCKED
+    UPDATE jobs SET status = 'CANCELLED' WHERE id IN (...) AND status = 'PENDING'
+SKIP LOCKED evita que dos procesos barran las mismas filas o esperen por
+filas que un request está aceptando en ese momento.
+
+En la misma transacción se encola (outbox) el aviso a cada cliente; después
+del commit se quita cada trabajo del índice de pendientes.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class StaleJobSweepMetrics:
+    """Métricas del barrido, locales al proceso (expuestas al manager)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.total_swept = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_swept = 0
+        self.last_batches = 0
+        self.last_duration_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    def record(self, swept: int, batches: int, duration: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.runs += 1
+            self.last_run_at = datetime.utcnow()
+            self.last_swept = swept
+            self.last_batches = batches
+            self.last_duration_ms = round(duration * 1000, 1)
+            self.last_error = error
+            self.total_swept += swept
+            if error:
+                self.failures += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "failures": self.failures,
+                "total_swept": self.total_swept,
+                "last_run_at": self.last_run_at,
+                "last_swept": self.last_swept,
+                "last_batches": self.last_batches,
+                "last_duration_ms": self.last_duration_ms,
+                "last_error": self.last_error,
+            }
+
+
+stale_job_sweep_metrics = StaleJobSweepMetrics()
+
+
+class StaleJobSweeper:
+    """Cancela trabajos PENDING vencidos en lotes"""
+
+    @staticmethod
+    def stale_condition(now: datetime):
+        """Condición SQL de trabajo PENDING vencido"""
+        cutoff = now - timedelta(hours=settings.STALE_JOB_MAX_AGE_HOURS)
+        return and_(
+            Job.status == JobStatus.PENDING,
+            or_(
+                Job.created_at < cutoff,
+                and_(Job.scheduled_at.isnot(None), Job.scheduled_at < now)
+            )
+        )
+
+    @staticmethod
+    def sweep_batch(db: Session, now: datetime, batch_size: int) -> Tuple[int, List[Tuple[int, int]]]:
+        """Cancela un lote de trabajos vencidos (una transacción)
+
+        Retorna (filas seleccionadas, [(job_id, client_id) cancelados]).
+        """
+        from app.services.job_state_machine import EXPIRE_STALE_PENDING, JobStateMachine
+        from app.services.outbox import OutboxService
+        from app.utils.caching import bump_jobs_parties
+
+        rows = db.query(Job.id, Job.client_id).filter(
+            StaleJobSweeper.stale_condition(now)
+        ).order_by(Job.id).limit(batch_size).with_for_update(skip_locked=True).all()
+        if not rows:
+            db.rollback()
+            return 0, []
+
+        ids = [row.id for row in rows]
+        try:
+            result = db.execute(JobStateMachine.build_update(EXPIRE_STALE_PENDING, ids, None))
+            if result.rowcount == len(ids):
+                swept = [(row.id, row.client_id) for row in rows]
+            else:
+                # Sin bloqueo de filas (p. ej. SQLite) otro request pudo ganar alguna
+                cancelled = {
+                    job_id for (job_id,) in db.query(Job.id).filter(
+                        Job.id.in_(ids), Job.status == JobStatus.CANCELLED
+                    )
+                }
+                swept = [(row.id, row.client_id) for row in rows if row.id in cancelled]
+
+            swept_ids = [job_id for job_id, _ in swept]
+            bump_jobs_parties(db, swept_ids)
+            OutboxService.notify_job_parties(db, swept_ids, "job_status_changed", {
+                "status": JobStatus.CANCELLED.value,
+                "reason": "expired",
+            }, worker=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        for job_id, _ in swept:
+            for hook in EXPIRE_STALE_PENDING.after_commit:
+                hook(job_id)
+
+        return len(rows), swept
+
+    @staticmethod
+    def sweep(db: Session, now: Optional[datetime] = None, batch_size: Optional[int] = None) -> dict:
+        """Cancela todos los trabajos vencidos, lote por lote
+
+        Retorna {"swept", "batches", "cancelled": [(job_id, client_id), ...]}.
+        Termina cuando un lote viene incompleto: los trabajos ya cancelados (o
+        aceptados entre medio) dejan de cumplir la condición, así que cada lote
+        avanza.
+        """
+        now = now or datetime.utcnow()
+        batch_size = batch_size or settings.STALE_JOB_SWEEP_BATCH_SIZE
+
+        cancelled: List[Tuple[int, int]] = []
+        batches = 0
+        while True:
+            selected, swept = StaleJobSweeper.sweep_batch(db, now, batch_size)
+            if selected == 0:
+                break
+            batches += 1
+            cancelled.extend(swept)
+            if selected < batch_size:
+                break
+
+        if cancelled:
+            logger.info(f"Barrido de trabajos vencidos: {len(cancelled)} cancelados en {batches} lotes")
+        return {"swept": len(cancelled), "batches": batches, "cancelled": cancelled}
+
+    @staticmethod
+    def run_once() -> dict:
+        """Ejecuta un barrido con su propia sesión y registra las métricas"""
+        from app.database import SessionLocal
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            result = StaleJobSweeper.sweep(db)
+        except Exception as e:
+            logger.exception("Error en el barrido de trabajos vencidos")
+            stale_job_sweep_metrics.record(0, 0, time.perf_counter() - started, error=str(e))
+            return {"swept": 0, "batches": 0, "cancelled": []}
+        finally:
+            db.close()
+
+        stale_job_sweep_metrics.record(result["swept"], result["batches"], time.perf_counter() - started)
+        return result
@@ -0,0 +1,207 @@
+"""
+Vencimiento del Modo Plus en segundo plano
+
+Antes el vencimiento era perezoso: GET /subscriptions/me/status desactivaba
+is_plus_active y hacía commit, y apply_to_job y /available comparaban
+plus_expires_at > now en cada request. WorkerSubscription.status nunca pasaba
+a EXPIRED.
+
+Ahora se mantiene un min-heap (plus_expires_at, worker_id) con los vencimientos
+próximos. La tarea del scheduler (cada SUBSCRIPTION_EXPIRY_CHECK_SECONDS) mira
+la cima del heap en memoria; solo si hay vencidos los saca y los expira con dos
+UPDATE por lote:
+    UPDATE workers SET is_plus_active = 0
+     WHERE id IN (...) AND is_plus_active = 1 AND plus_expires_at <= :now
+    UPDATE worker_subscriptions SET status = 'EXPIRED'
+     WHERE worker_id IN (...) AND status = 'ACTIVE' AND valid_until <= :now
+Las condiciones re-verifican el vencimiento en SQL, así que una entrada vieja
+del heap (el trabajador renovó o canceló) no hace nada.
+
+El heap se llena al arrancar y se recarga cada SUBSCRIPTION_EXPIRY_RELOAD_SECONDS
+con los vencimientos del siguiente intervalo (cubre suscripciones creadas por
+otros procesos; ambas tareas corren solo en el proceso líder). Entre recargas
+la tarea no consulta la BD.
+
+El flag puede quedar encendido hasta un ciclo de la tarea después del
+vencimiento (o más si el líder está caído), así que las lecturas que dan
+acceso (apply_to_job, /available) usan plus_active(), que además compara
+plus_expires_at con la hora actual.
+"""
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import update, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.subscription import WorkerSubscription, SubscriptionStatus
+from app.models.worker import Worker
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionExpiryQueue:
+    """Min-heap de vencimientos próximos del Modo Plus, local al proceso"""
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int]] = []
+        # worker_id -> vencimiento vigente (las entradas del heap que no coinciden son viejas)
+        self._due: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def schedule(self, worker_id: int, expires_at: Optional[datetime]) -> None:
+        """Registra (o reemplaza) el vencimiento de un trabajador"""
+        if expires_at is None:
+            return
+        with self._lock:
+            if self._due.get(worker_id) == expires_at:
+                return
+            self._due[worker_id] = expires_at
+            heapq.heappush(self._heap, (expires_at, worker_id))
+
+    def next_due(self) -> Optional[datetime]:
+        """Próximo vencimiento vigente (None si no hay)"""
+        with self._lock:
+            self._drop_stale_head()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[int]:
+        """Saca los trabajadores con vencimiento <= now"""
+        due = []
+        with self._lock:
+            while self._heap:
+                self._drop_stale_head()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, worker_id = heapq.heappop(self._heap)
+                del self._due[worker_id]
+                due.append(worker_id)
+        return due
+
+    def _drop_stale_head(self) -> None:
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def load(self, db: Session, horizon: timedelta) -> int:
+        """Carga los vencimientos hasta now + horizon (incluye los ya vencidos)"""
+        limit = datetime.utcnow() + horizon
+        rows = db.query(Worker.id, Worker.plus_expires_at).filter(
+            Worker.is_plus_active == True,
+            Worker.plus_expires_at.isnot(None),
+            Worker.plus_expires_at <= limit
+        ).all()
+        for worker_id, expires_at in rows:
+            self.schedule(worker_id, expires_at)
+        return len(rows)
+
+
+subscription_expiry_queue = SubscriptionExpiryQueue()
+
+
+def plus_active(worker, now: Optional[datetime] = None) -> bool:
+    """Modo Plus vigente: flag encendido y plus_expires_at todavía en el futuro
+
+    plus_expires_at NULL con el flag encendido es Modo Plus sin vencimiento
+    (asignado a mano, como antes de estas comprobaciones).
+    """
+    if worker is None or not worker.is_plus_active:
+        return False
+    if worker.plus_expires_at is None:
+        return True
+    return worker.plus_expires_at > (now or datetime.utcnow())
+
+
+class SubscriptionExpiryService:
+    @staticmethod
+    def expire(db: Session, worker_ids: List[int], now: Optional[datetime] = None) -> int:
+        """Expira el Modo Plus y las suscripciones vencidas de los trabajadores (una transacción)
+
+        Retorna la cantidad de trabajadores que perdieron el Modo Plus.
+        """
+        from app.utils.caching import bump_data_version
+
+        if not worker_ids:
+            return 0
+        now = now or datetime.utcnow()
+
+        try:
+            expired_workers = select(Worker.id).where(
+                Worker.id.in_(worker_ids),
+                Worker.is_plus_active == True,
+                Worker.plus_expires_at <= now
+            )
+            # Invalidar ETags antes de apagar el flag (el SELECT depende de él)
+            bump_data_version(db, select(Worker.user_id).where(Worker.id.in_(expired_workers.scalar_subquery())))
+
+            result = db.execute(
+                update(Worker)
+                .where(
+                    Worker.id.in_(worker_ids),
+                    Worker.is_plus_active == True,
+                    Worker.plus_expires_at <= now
+                )
+                .values(is_plus_active=False)
+                .execution_options(synchronize_session=False)
+            )
+            db.execute(
+                update(WorkerSubscription)
+                .where(
+                    WorkerSubscription.worker_id.in_(worker_ids),
+                    WorkerSubscription.status == SubscriptionStatus.ACTIVE,
+                    WorkerSubscription.valid_until <= now
+                )
+                .values(status=SubscriptionStatus.EXPIRED)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return result.rowcount
+
+    @staticmethod
+    def run_due(batch_size: int = 500) -> int:
+        """Expira los vencimientos del heap que ya pasaron (con su propia sesión)"""
+        from app.database import SessionLocal
+
+        now = datetime.utcnow()
+        due = subscription_expiry_queue.pop_due(now)
+        if not due:
+            return 0
+
+        expired = 0
+        db = SessionLocal()
+        try:
+            for start in range(0, len(due), batch_size):
+                expired += SubscriptionExpiryService.expire(db, due[start:start + batch_size], now)
+        except Exception:
+            logger.exception("Error al expirar suscripciones Modo Plus")
+            # Reintentar más tarde (sin girar en falso si la BD no responde)
+            retry_at = now + timedelta(seconds=30)
+            for worker_id in due:
+                subscription_expiry_queue.schedule(worker_id, retry_at)
+        finally:
+            db.close()
+
+        if expired:
+            logger.info(f"Modo Plus expirado para {expired} trabajadores")
+        return expired
+
+    @staticmethod
+    def reload() -> int:
+        """Recarga el heap con los vencimientos del próximo intervalo"""
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            # Horizonte doble: una recarga tardía no deja vencimientos afuera
+            horizon = timedelta(seconds=2 * settings.SUBSCRIPTION_EXPIRY_RELOAD_SECONDS)
+            return subscription_expiry_queue.load(db, horizon)
+        finally:
+            db.close()
+
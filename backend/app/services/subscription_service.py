@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.subscription import WorkerSubscription, SubscriptionPlan, SubscriptionStatus
 from app.models.worker import Worker
+from app.utils.caching import bump_data_version
 
 
 class SubscriptionService:
@@ -56,31 +57,27 @@ class SubscriptionService:
         # Actualizar estado Plus del worker
         worker.is_plus_active = True
         worker.plus_expires_at = valid_until
+        bump_data_version(db, [user_id])
 
         db.commit()
-        db.refresh(subscription)
-        db.refresh(worker)
+
+        # Programar el vencimiento en la tarea de expiración
+        from app.services.subscription_expiry import subscription_expiry_queue
+        subscription_expiry_queue.schedule(worker.id, valid_until)
 
         return subscription
 
     @staticmethod
     def get_status(db: Session, user_id: int):
-        worker = SubscriptionService._get_worker(db, user_id)
-        now = datetime.utcnow()
+        """Estado del Modo Plus (solo lectura)
         
-        # Verificar si el Plus está activo basándose en la fecha de expiración
-        # Solo considerar inactivo si la fecha de expiración existe y ya pasó
-        if worker.is_plus_active and worker.plus_expires_at:
-            is_active = worker.plus_expires_at > now
-            # Solo desactivar si la fecha ya venció
-            if not is_active:
-                worker.is_plus_active = False
-                db.commit()
-                db.refresh(worker)
-        else:
-            # Si no hay fecha de expiración pero el flag está activo, mantenerlo activo
-            # (no desactivar automáticamente)
-            is_active = worker.is_plus_active
+        is_plus_active lo apaga la tarea de expiración (app.services.subscription_expiry)
+        al llegar plus_expires_at; este GET ya no modifica nada y reporta el
+        vencimiento aunque la tarea todavía no lo haya procesado.
+        """
+        from app.services.subscription_expiry import plus_active
+        worker = SubscriptionService._get_worker(db, user_id)
+        is_active = plus_active(worker)
 
         # Obtener la última suscripción
         last_sub = (
@@ -124,9 +121,9 @@ class SubscriptionService:
         
         for sub in active_subs:
             sub.status = SubscriptionStatus.CANCELLED
+        bump_data_version(db, [user_id])
         
         db.commit()
-        db.refresh(worker)
         
         return {"message": "Suscripción cancelada exitosamente"}
 
@@ -1,13 +1,22 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from fastapi import HTTPException, status
 from app.models.worker import Worker
 from app.schemas.worker import WorkerCreate, WorkerUpdate
+from app.services.read_models import WORKER_COLUMNS, WorkerRow, narrow, row_factory
 
 
 class WorkerService:
     """Servicio de trabajadores (equivalente a @Service en Spring Boot)"""
     
+    # Ordenamientos disponibles en la búsqueda: columnas ordenadas DESC,
+    # respaldadas por los índices ix_workers_* del modelo Worker
+    SEARCH_SORTS = {
+        "verified": ("is_verified", "id"),  # Verificados primero, luego más recientes
+        "recent": ("id",),  # Más recientes primero
+        "rating": ("reputation_score", "id"),  # Mejor score bayesiano primero
+    }
+    
     @staticmethod
     def create_worker(db: Session, worker_create: WorkerCreate, user_id: int) -> Worker:
         """Crea un nuevo trabajador
@@ -51,7 +60,6 @@ class WorkerService:
             
             db.add(new_worker)
             db.commit()
-            db.refresh(new_worker)
             
             return new_worker
         except HTTPException:
@@ -114,8 +122,11 @@ class WorkerService:
             for field, value in update_data.items():
                 setattr(worker, field, value)
             
+            # El perfil propio aparece embebido en /my-applications
+            from app.utils.caching import bump_data_version
+            bump_data_version(db, [worker.user_id])
+            
             db.commit()
-            db.refresh(worker)
             
             return worker
         except HTTPException:
@@ -144,10 +155,36 @@ class WorkerService:
         service_type: Optional[str] = None,
         district: Optional[str] = None,
         is_available: Optional[bool] = None,
-        is_verified: Optional[bool] = None
-    ) -> List[Worker]:
-        """Busca trabajadores con filtros"""
-        query = db.query(Worker)
+        is_verified: Optional[bool] = None,
+        sort: str = "verified",
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[WorkerRow], Optional[str]]:
+        """Busca trabajadores con filtros, paginado por cursor
+        
+        Retorna (trabajadores, next_cursor). next_cursor es None si no hay más páginas.
+        Los trabajadores son modelos de lectura (WorkerRow): solo las columnas de WorkerResponse
+        (con fields, solo esas más las del ordenamiento, necesarias para el cursor).
+        El ordenamiento siempre termina en Worker.id para que la clave sea única
+        (id creciente equivale a "más recientes primero").
+        """
+        from app.config import settings
+        from app.utils.pagination import decode_cursor, encode_cursor, keyset_after
+        
+        if sort not in WorkerService.SEARCH_SORTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Orden inválido. Opciones: {', '.join(WorkerService.SEARCH_SORTS)}"
+            )
+        sort_columns = [getattr(Worker, name) for name in WorkerService.SEARCH_SORTS[sort]]
+        
+        # Limitar el tiempo de ejecución de la consulta en MySQL (hint ignorado en otros motores)
+        columns = narrow(WORKER_COLUMNS, fields, required=WorkerService.SEARCH_SORTS[sort])
+        query = db.query(*columns).prefix_with(
+            f"/*+ MAX_EXECUTION_TIME({settings.SEARCH_QUERY_TIMEOUT_MS}) */",
+            dialect="mysql"
+        )
         
         # Validar y filtrar por service_type solo si no está vacío
         if service_type and service_type.strip():
@@ -174,5 +211,23 @@ class WorkerService:
         if is_verified is not None:
             query = query.filter(Worker.is_verified == is_verified)
         
-        return query.all()
+        # Continuar después del último elemento de la página anterior (sin OFFSET)
+        if cursor:
+            cursor_values = decode_cursor(cursor, sort_columns)
+            query = query.filter(keyset_after(sort_columns, cursor_values))
+        
+        # Pedimos un elemento extra para saber si existe una página siguiente
+        make = row_factory(WorkerRow, [column.key for column in columns])
+        workers = [
+            make(row)
+            for row in query.order_by(*[column.desc() for column in sort_columns]).limit(limit + 1)
+        ]
+        
+        next_cursor = None
+        if len(workers) > limit:
+            workers = workers[:limit]
+            last = workers[-1]
+            next_cursor = encode_cursor([getattr(last, column.key) for column in sort_columns])
+        
+        return workers, next_cursor
 
@@ -0,0 +1,115 @@
+"""
+Caché HTTP por ETag para los endpoints que la app consulta periódicamente (polling)
+
+Cada usuario tiene un contador users.data_version que los servicios incrementan,
+dentro de la misma transacción, cada vez que cambia algo que el usuario ve en
+/my-jobs, /my-applications, /subscriptions/me/status o /commissions/pending.
+
+El ETag se arma con (endpoint, user_id, data_version, ventana de tiempo). Como
+get_current_user ya carga el usuario, comparar If-None-Match no requiere
+ninguna consulta adicional: si coincide se responde 304 sin ejecutar las
+consultas del endpoint ni serializar la respuesta.
+
+La ventana de tiempo (ETAG_MAX_STALENESS_SECONDS) acota cuánto puede durar un
+ETag aunque el contador no cambie: cubre datos que cambian sin pasar por los
+servicios del usuario (vencimiento del Modo Plus, edición del perfil de la
+contraparte que aparece embebido en la respuesta).
+"""
+import hashlib
+import time
+from typing import Iterable, Optional, Union
+from fastapi import Request, Response, status
+from sqlalchemy import update, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.config import settings
+from app.models.user import User
+
+
+def bump_data_version(db: Session, user_ids: Union[Iterable[Optional[int]], Select]) -> None:
+    """Incrementa data_version de los usuarios indicados (sin commit)
+
+    user_ids puede ser una lista de ids o un SELECT que devuelva ids de usuario
+    (por ejemplo select(Worker.user_id).where(Worker.id == worker_id)).
+    """
+    if isinstance(user_ids, Select):
+        condition = User.id.in_(user_ids.scalar_subquery())
+    else:
+        ids = {user_id for user_id in user_ids if user_id is not None}
+        if not ids:
+            return
+        condition = User.id.in_(ids)
+
+    db.execute(
+        update(User)
+        .where(condition)
+        # updated_at se conserva: refleja cambios del perfil, no del contador
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_job_parties(db: Session, job_id: int) -> None:
+    """Incrementa data_version de todos los que ven el trabajo (sin commit)
+
+    El cliente (/my-jobs), el trabajador asignado (/my-jobs) y los trabajadores
+    que aplicaron (/my-applications embebe el trabajo).
+    """
+    bump_jobs_parties(db, [job_id])
+
+
+def bump_jobs_parties(db: Session, job_ids: Iterable[int]) -> None:
+    """Como bump_job_parties, para varios trabajos en un solo UPDATE (sin commit)"""
+    from sqlalchemy import or_
+    from app.models.job import Job
+    from app.models.job_application import JobApplication
+    from app.models.worker import Worker
+
+    job_ids = list(job_ids)
+    if not job_ids:
+        return
+
+    client_ids = select(Job.client_id).where(Job.id.in_(job_ids))
+    assigned_ids = select(Worker.user_id).join(Job, Job.worker_id == Worker.id).where(Job.id.in_(job_ids))
+    applicant_ids = select(Worker.user_id).join(
+        JobApplication, JobApplication.worker_id == Worker.id
+    ).where(JobApplication.job_id.in_(job_ids))
+
+    db.execute(
+        update(User)
+        .where(or_(
+            User.id.in_(client_ids.scalar_subquery()),
+            User.id.in_(assigned_ids.scalar_subquery()),
+            User.id.in_(applicant_ids.scalar_subquery()),
+        ))
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_etag(user: User, scope: str) -> str:
+    """ETag débil para (endpoint, usuario, versión de datos, ventana de tiempo)"""
+    window = int(time.time() // settings.ETAG_MAX_STALENESS_SECONDS)
+    raw = f"{scope}:{user.id}:{user.data_version or 0}:{window}"
+    return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def conditional_response(request: Request, response: Response, user: User, scope: str) -> Optional[Response]:
+    """Aplica el ETag a la respuesta y devuelve un 304 si el cliente ya la tiene
+
+    Uso en un endpoint:
+        cached = conditional_response(request, response, current_user, "jobs:my-jobs")
+        if cached:
+            return cached
+    """
+    etag = build_etag(user, scope)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {value.strip() for value in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,124 @@
+"""
+Compresión de respuestas negociada por Accept-Encoding (brotli o gzip)
+
+La app Android descarga listas de trabajos y mensajes por datos móviles; el
+JSON de esas listas es muy repetitivo (mismas claves en cada fila) y se
+comprime a una fracción de su tamaño.
+
+- br si el cliente lo acepta y el paquete brotli está instalado; si no, gzip
+- Solo cuerpos de al menos COMPRESSION_MINIMUM_SIZE bytes: en respuestas
+  chicas el encabezado de compresión y el CPU no compensan
+- Solo tipos de texto (JSON, text/*); nunca respuestas ya codificadas,
+  304/204 ni respuestas por streaming sin Content-Length (pasan sin tocar)
+- Agrega Vary: Accept-Encoding para que proxies y cachés no mezclen versiones
+
+Middleware ASGI puro (no BaseHTTPMiddleware): el WebSocket pasa directo y la
+respuesta se comprime una sola vez al final, por fuera de IdempotencyMiddleware
+(las respuestas guardadas para reintentos quedan sin comprimir).
+"""
+import gzip
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli está en requirements.txt
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Codificación a usar según Accept-Encoding ("br", "gzip" o None)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    def allowed(encoding: str) -> bool:
+        return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Comprime las respuestas HTTP según Accept-Encoding"""
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks = []
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Esperar al cuerpo para decidir
+                start = message
+                if "content-length" not in Headers(raw=start["headers"]):
+                    # Streaming de largo desconocido: se envía tal cual
+                    passthrough = True
+                    await send(start)
+                return
+
+            # Con Content-Length el cuerpo está acotado: se junta aunque llegue en
+            # varios mensajes (BaseHTTPMiddleware lo reenvía por partes)
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start["headers"])
+            if self._should_compress(start["status"], headers, body):
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, status_code: int, headers: MutableHeaders, body: bytes) -> bool:
+        if status_code < 200 or status_code in (204, 304):
+            return False
+        if "content-encoding" in headers or len(body) < self.minimum_size:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
@@ -0,0 +1,288 @@
+"""
+Serialización rápida para los endpoints de listas
+
+El camino normal de FastAPI para una lista es: objeto ORM -> validación
+Pydantic (from_attributes) -> jsonable_encoder -> json.dumps. Para listas
+largas (/available, /my-jobs, /my-applications, /workers/search/list,
+/chat/{job_id}/messages) la mayor parte del tiempo de serialización se va en
+validar datos que ya vienen de la BD.
+
+Aquí cada fila se arma directamente como dict (en el mismo orden de campos
+que el schema) leyendo los atributos de la entidad, tupla de columnas o
+modelo Pydantic, y se codifica con orjson a través de FastJSONResponse.
+
+El JSON resultante es idéntico al de los schemas:
+- Decimal como string con su escala ("50.00"), igual que Pydantic en modo JSON
+- datetime en ISO 8601 con "Z" (las columnas son UTC sin zona, ver app/schemas/datetimes.py)
+- Enums por su valor
+- Los campos con default del schema (extras, total_amount, is_verified...)
+  toman ese default si la columna viene NULL
+
+response_model se mantiene en cada ruta para la documentación OpenAPI.
+Con FAST_JSON_RESPONSES=False las rutas vuelven al camino de Pydantic.
+
+Modo compacto (?compact=true o header X-Response-Mode: compact): omite los
+campos null y los bloques embebidos que el llamador ya tiene (por ejemplo
+"client" en /my-jobs de un cliente: es él mismo). Todos los campos omitidos
+son opcionales en el schema, así que la app los lee con su valor por defecto.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional, Sequence
+from fastapi import Header, Query, Response
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.schemas.datetimes import utc_isoformat
+from app.utils.metrics import serialization_timer
+from app.utils.sparse_fields import Fields, select_fields
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson está en requirements.txt
+    orjson = None
+
+ZERO = Decimal("0.00")
+
+
+def _default(value: Any) -> Any:
+    """Tipos que el codificador no maneja por sí solo"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return utc_isoformat(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Codifica a JSON compacto (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse codificada con dumps (sin jsonable_encoder)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def compact_mode(
+    compact: bool = Query(False, description="Respuesta compacta: sin campos null ni bloques propios"),
+    x_response_mode: Optional[str] = Header(None, description="compact para respuesta compacta")
+) -> bool:
+    """Dependencia: True si el llamador pidió el modo compacto"""
+    return compact or (x_response_mode or "").strip().lower() == "compact"
+
+
+def compact_row(row: dict, omit: Sequence[str] = ()) -> dict:
+    """Quita los null (también en los bloques embebidos) y las claves de omit"""
+    return {
+        key: compact_row(value) if isinstance(value, dict) else value
+        for key, value in row.items()
+        if value is not None and key not in omit
+    }
+
+
+def list_response(
+    items: Iterable[Any],
+    build: Callable[[Any], dict],
+    response: Optional[Response] = None,
+    compact: bool = False,
+    omit: Sequence[str] = (),
+    fields: Fields = None
+) -> Any:
+    """Respuesta de una lista por el camino rápido
+
+    build convierte cada elemento en dict. response es el Response inyectado
+    por FastAPI: al devolver una respuesta propia FastAPI ya no le agrega sus
+    headers (ETag, X-Next-Cursor), así que se copian aquí. fields deja solo
+    los campos pedidos (fields=) y con compact se aplica compact_row a cada
+    fila (omit: bloques que el llamador ya tiene).
+
+    Con FAST_JSON_RESPONSES=False (sin modo compacto ni fields=) retorna los
+    elementos tal cual para que los serialice el response_model de la ruta.
+    """
+    if not settings.FAST_JSON_RESPONSES and not compact and fields is None:
+        return items
+
+    with serialization_timer():
+        rows = [build(item) for item in items]
+        if fields is not None:
+            rows = [select_fields(row, fields) for row in rows]
+        if compact:
+            rows = [compact_row(row, omit) for row in rows]
+        fast = FastJSONResponse(content=rows)
+    if response is not None:
+        fast.raw_headers.extend(response.raw_headers)
+        if response.status_code:
+            fast.status_code = response.status_code
+    return fast
+
+
+def item_response(item: Any, build: Callable[[Any], dict], fields: Fields = None) -> Any:
+    """Respuesta de un solo elemento: con fields= solo esos campos; si no, el item tal cual"""
+    if fields is None:
+        return item
+    with serialization_timer():
+        return FastJSONResponse(content=select_fields(build(item), fields))
+
+
+def representation_scope(scope: str, compact: bool = False, fields: Fields = None) -> str:
+    """Scope de ETag distinto por representación (modo compacto, fields=)"""
+    if compact:
+        scope += ":compact"
+    if fields is not None:
+        scope += ":" + ",".join(fields)
+    return scope
+
+
+# Constructores de filas (mismo orden y defaults que los schemas)
+
+def _enum(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _services(value: Any) -> Any:
+    """Como WorkerResponse.parse_services: acepta el JSON guardado como string"""
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return value
+        return parsed if isinstance(parsed, list) else value
+    return value
+
+
+def client_info_row(user: Any) -> Optional[dict]:
+    """ClientInfo"""
+    if user is None:
+        return None
+    return {
+        "id": user.id,
+        "full_name": user.full_name,
+        "phone": user.phone,
+        "email": user.email,
+        "profile_image_url": user.profile_image_url,
+    }
+
+
+def worker_info_row(worker: Any) -> Optional[dict]:
+    """WorkerInfo"""
+    if worker is None:
+        return None
+    return {
+        "id": worker.id,
+        "full_name": worker.full_name,
+        "phone": worker.phone,
+        "profile_image_url": worker.profile_image_url,
+        "is_verified": bool(worker.is_verified),
+    }
+
+
+def job_row(job: Any, redact_client_phone: bool = False) -> dict:
+    """JobResponse
+
+    redact_client_phone oculta el teléfono del cliente (trabajadores sin Modo Plus).
+    """
+    client = client_info_row(job.client)
+    if client is not None and redact_client_phone:
+        client["phone"] = None
+    return {
+        "title": job.title,
+        "description": job.description,
+        "service_type": job.service_type,
+        "payment_method": _enum(job.payment_method),
+        "base_fee": job.base_fee,
+        "address": job.address,
+        "latitude": job.latitude,
+        "longitude": job.longitude,
+        "scheduled_at": job.scheduled_at,
+        "id": job.id,
+        "client_id": job.client_id,
+        "worker_id": job.worker_id,
+        "status": _enum(job.status),
+        "extras": ZERO if job.extras is None else job.extras,
+        "total_amount": ZERO if job.total_amount is None else job.total_amount,
+        "started_at": job.started_at,
+        "completed_at": job.completed_at,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "client": client,
+        "worker": worker_info_row(job.worker),
+    }
+
+
+def redacted_job_row(job: Any) -> dict:
+    """JobResponse sin el teléfono del cliente"""
+    return job_row(job, redact_client_phone=True)
+
+
+def application_row(application: Any) -> dict:
+    """JobApplicationResponse"""
+    return {
+        "id": application.id,
+        "job_id": application.job_id,
+        "worker_id": application.worker_id,
+        "is_accepted": application.is_accepted,
+        "created_at": application.created_at,
+        "updated_at": application.updated_at,
+        "worker": worker_info_row(application.worker),
+    }
+
+
+def worker_row(worker: Any) -> dict:
+    """WorkerResponse"""
+    return {
+        "full_name": worker.full_name,
+        "phone": worker.phone,
+        "services": _services(worker.services),
+        "description": worker.description,
+        "district": worker.district,
+        "is_available": bool(worker.is_available),
+        "yape_number": worker.yape_number,
+        "profile_image_url": worker.profile_image_url,
+        "id": worker.id,
+        "user_id": worker.user_id,
+        "is_verified": bool(worker.is_verified),
+        "verification_photo_url": worker.verification_photo_url,
+        "is_plus_active": bool(worker.is_plus_active),
+        "plus_expires_at": worker.plus_expires_at,
+        "reputation_count": worker.reputation_count,
+        "reputation_avg": worker.reputation_avg,
+        "reputation_score": worker.reputation_score,
+        "created_at": worker.created_at,
+        "updated_at": worker.updated_at,
+    }
+
+
+def message_row(message: Any) -> dict:
+    """MessageResponse"""
+    sender = message.sender
+    return {
+        "content": message.content,
+        "has_image": bool(message.has_image),
+        "image_url": message.image_url,
+        "id": message.id,
+        "job_id": message.job_id,
+        "application_id": message.application_id,
+        "sender_id": message.sender_id,
+        "sender": None if sender is None else {
+            "id": sender.id,
+            "full_name": sender.full_name,
+            "email": sender.email,
+        },
+        "created_at": message.created_at,
+    }
@@ -0,0 +1,254 @@
+"""
+Idempotency-Key para los endpoints de escritura de la app móvil
+
+Con red móvil inestable la app reintenta POST /api/jobs, /api/jobs/{id}/apply,
+/api/chat/{job_id}/send y /api/subscriptions/subscribe. Cada reintento volvía
+a ejecutar validación + INSERT y podía duplicar trabajos, mensajes o
+suscripciones.
+
+Si la solicitud trae el header Idempotency-Key:
+1. Se reserva (user_id, key) con un INSERT (la UNIQUE resuelve reintentos simultáneos)
+2. Se ejecuta el endpoint; si responde 2xx se guarda status + cuerpo
+3. Un reintento con la misma clave recibe la respuesta guardada
+   (header Idempotent-Replayed: true) leyendo solo idempotency_keys
+
+- Misma clave con otro cuerpo o ruta: 422
+- Misma clave mientras la primera sigue en curso: 409 (la app reintenta después)
+- Respuestas no 2xx no se guardan: la clave se libera y el reintento se ejecuta
+- Las claves vencen a IDEMPOTENCY_KEY_TTL_HOURS (tarea del scheduler las borra)
+
+El usuario sale del JWT sin consultar la BD; con token inválido la solicitud
+sigue normalmente y el endpoint responde 401.
+"""
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from fastapi import status
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from app.config import settings
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 100
+
+# (método, ruta) de los endpoints que aceptan Idempotency-Key
+IDEMPOTENT_ROUTES = (
+    ("POST", re.compile(r"^/api/jobs/?$")),
+    ("POST", re.compile(r"^/api/jobs/\d+/apply$")),
+    ("POST", re.compile(r"^/api/chat/\d+/send$")),
+    ("POST", re.compile(r"^/api/subscriptions/subscribe$")),
+)
+
+
+def is_idempotent_route(method: str, path: str) -> bool:
+    return any(method == route_method and pattern.match(path) for route_method, pattern in IDEMPOTENT_ROUTES)
+
+
+def user_id_from_request(request: Request) -> Optional[int]:
+    """user_id del JWT (sin consultar la BD); None si no hay token válido"""
+    from app.utils.security import decode_access_token
+
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+    payload = decode_access_token(auth_header[len("Bearer "):])
+    try:
+        return int(payload.get("sub")) if payload else None
+    except (TypeError, ValueError):
+        return None
+
+
+class IdempotencyStore:
+    """Acceso a idempotency_keys (cada operación con su propia sesión corta)"""
+
+    @staticmethod
+    def reserve(user_id: int, key: str, request_hash: str) -> Tuple[str, Optional[IdempotencyKey]]:
+        """Reserva la clave para ejecutar la solicitud
+
+        Retorna ("reserved", None), ("replay", registro), ("in_progress", None)
+        o ("mismatch", None).
+        """
+        from app.database import SessionLocal
+
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            for _ in range(2):
+                existing = db.query(IdempotencyKey).filter(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key
+                ).first()
+
+                if existing is not None:
+                    abandoned = (
+                        existing.response_status is None
+                        and existing.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS)
+                    )
+                    if existing.expires_at > now and not abandoned:
+                        if existing.request_hash != request_hash:
+                            return "mismatch", None
+                        if existing.response_status is None:
+                            return "in_progress", None
+                        return "replay", existing
+                    # Vencida o abandonada (el proceso murió a mitad): se reemplaza
+                    db.delete(existing)
+                    db.flush()
+
+                db.add(IdempotencyKey(
+                    user_id=user_id,
+                    key=key,
+                    request_hash=request_hash,
+                    created_at=now,
+                    expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+                ))
+                try:
+                    db.commit()
+                    return "reserved", None
+                except IntegrityError:
+                    # Otro reintento reservó la misma clave primero: volver a leer
+                    db.rollback()
+            return "in_progress", None
+        finally:
+            db.close()
+
+    @staticmethod
+    def complete(user_id: int, key: str, response_status: int, body: bytes, content_type: Optional[str]) -> None:
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key
+            ).update({
+                IdempotencyKey.response_status: response_status,
+                IdempotencyKey.response_body: body.decode("utf-8"),
+                IdempotencyKey.content_type: content_type,
+            }, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def release(user_id: int, key: str) -> None:
+        """Libera la clave (la solicitud falló y el reintento debe ejecutarse)"""
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.response_status.is_(None)
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def cleanup(batch_size: int = 5000) -> int:
+        """Borra, en lotes, las claves vencidas"""
+        from app.database import SessionLocal
+
+        now = datetime.utcnow()
+        deleted = 0
+        db = SessionLocal()
+        try:
+            while True:
+                ids = [
+                    key_id for (key_id,) in db.query(IdempotencyKey.id)
+                    .filter(IdempotencyKey.expires_at < now)
+                    .limit(batch_size)
+                ]
+                if not ids:
+                    break
+                db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(ids)))
+                db.commit()
+                deleted += len(ids)
+                if len(ids) < batch_size:
+                    break
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        if deleted:
+            logger.info(f"Idempotencia: {deleted} claves vencidas eliminadas")
+        return deleted
+
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    """Aplica Idempotency-Key a IDEMPOTENT_ROUTES"""
+
+    async def dispatch(self, request: Request, call_next):
+        key = request.headers.get(HEADER)
+        if not key or not is_idempotent_route(request.method, request.url.path):
+            return await call_next(request)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"detail": f"{HEADER} demasiado larga (máximo {MAX_KEY_LENGTH} caracteres)"}
+            )
+
+        user_id = user_id_from_request(request)
+        if user_id is None:
+            return await call_next(request)
+
+        body = await request.body()
+        request_hash = hashlib.sha256(
+            request.method.encode() + b" " + request.url.path.encode() + b"\n" + body
+        ).hexdigest()
+
+        outcome, record = await run_in_threadpool(IdempotencyStore.reserve, user_id, key, request_hash)
+        if outcome == "replay":
+            return Response(
+                content=record.response_body,
+                status_code=record.response_status,
+                media_type=record.content_type,
+                headers={"Idempotent-Replayed": "true"}
+            )
+        if outcome == "mismatch":
+            return JSONResponse(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                content={"detail": f"{HEADER} ya usada con otra solicitud"}
+            )
+        if outcome == "in_progress":
+            return JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content={"detail": "Una solicitud con la misma clave está en proceso, intenta nuevamente"}
+            )
+
+        try:
+            response = await call_next(request)
+        except Exception:
+            await run_in_threadpool(IdempotencyStore.release, user_id, key)
+            raise
+
+        if not 200 <= response.status_code < 300:
+            await run_in_threadpool(IdempotencyStore.release, user_id, key)
+            return response
+
+        # Leer el cuerpo para guardarlo y devolver una respuesta equivalente
+        chunks = [chunk async for chunk in response.body_iterator]
+        response_body = b"".join(chunks)
+        content_type = response.headers.get("content-type")
+        await run_in_threadpool(
+            IdempotencyStore.complete, user_id, key, response.status_code, response_body, content_type
+        )
+        return Response(
+            content=response_body,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+        )
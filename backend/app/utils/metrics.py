@@ -0,0 +1,279 @@
+"""
+Métricas por endpoint en formato Prometheus (GET /metrics)
+
+Para cada plantilla de ruta (/api/jobs/{job_id}, no /api/jobs/17) y método se
+registra:
+- http_requests_total: requests por código de estado
+- http_request_duration_seconds: latencia total (histograma)
+- http_request_db_statements: sentencias SQL por request (histograma; un
+  N+1 se ve como una cola larga aquí)
+- http_request_db_seconds: tiempo dentro de la BD por request (histograma)
+- http_request_db_rows_total: filas devueltas por las consultas
+- http_request_serialization_seconds: armado y codificación del JSON (histograma)
+
+Las sentencias se miden con el hook de cursor de app/utils/sql_hooks.py
+(registrado en la clase Engine, así cubre cualquier engine) y se acumulan en
+el RequestStats del request en curso (ContextVar: FastAPI copia el contexto
+al threadpool y a las tareas de BaseHTTPMiddleware, y todos comparten el
+mismo objeto). Lo que corre fuera de un request (scheduler) solo
+suma a los totales db_statements_total / db_seconds_total.
+
+Notas:
+- Filas: cursor.rowcount de las consultas con resultado. MySQL (PyMySQL) lo
+  informa para los SELECT; SQLite no (-1) y no se cuenta.
+- Serialización: el camino rápido (list_response / item_response) mide desde
+  las filas hasta los bytes; el camino de response_model mide json.dumps
+  (TimedJSONResponse). La validación Pydantic del response_model queda dentro
+  de la latencia total.
+
+Sin dependencias: el formato de texto de Prometheus se arma aquí. Con
+METRICS_TOKEN configurado, /metrics exige Authorization: Bearer <token>; en
+producción sin token no se publica (404).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+SERIALIZATION_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """Acumulado de un request (sentencias SQL, tiempo de BD, filas, serialización)"""
+    __slots__ = ("statements", "db_seconds", "rows", "serialization_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.serialization_seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """RequestStats del request en curso (None fuera de un request HTTP)"""
+    return _current.get()
+
+
+class Histogram:
+    """Histograma acumulativo al estilo Prometheus"""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        result = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            result.append(f'{name}_bucket{{{labels},le="{_format(bound)}"}} {cumulative}')
+        result.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        result.append(f"{name}_sum{{{labels}}} {_format(self.sum)}")
+        result.append(f"{name}_count{{{labels}}} {self.count}")
+        return result
+
+
+def _format(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _RouteMetrics:
+    """Métricas de una plantilla de ruta + método"""
+    __slots__ = ("statuses", "duration", "statements", "db_seconds", "rows", "serialization")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = Histogram(DB_SECONDS_BUCKETS)
+        self.rows = 0
+        self.serialization = Histogram(SERIALIZATION_BUCKETS)
+
+
+class MetricsRegistry:
+    """Registro en memoria del proceso (cada worker de uvicorn tiene el suyo)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteMetrics] = {}
+        self.db_statements_total = 0
+        self.db_seconds_total = 0.0
+
+    def observe_request(self, method: str, route: str, status_code: int, duration: float, stats: RequestStats) -> None:
+        with self._lock:
+            route_metrics = self._routes.get((method, route))
+            if route_metrics is None:
+                route_metrics = self._routes[(method, route)] = _RouteMetrics()
+            route_metrics.statuses[status_code] = route_metrics.statuses.get(status_code, 0) + 1
+            route_metrics.duration.observe(duration)
+            route_metrics.statements.observe(stats.statements)
+            route_metrics.db_seconds.observe(stats.db_seconds)
+            route_metrics.rows += stats.rows
+            route_metrics.serialization.observe(stats.serialization_seconds)
+
+    def observe_statement(self, seconds: float) -> None:
+        with self._lock:
+            self.db_statements_total += 1
+            self.db_seconds_total += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self.db_statements_total = 0
+            self.db_seconds_total = 0.0
+
+    def render(self) -> str:
+        """Exposición en formato de texto de Prometheus (version 0.0.4)"""
+        with self._lock:
+            routes = sorted(self._routes.items())
+            sections = {
+                "http_requests_total": ("counter", "Requests HTTP por ruta, método y código de estado", []),
+                "http_request_duration_seconds": ("histogram", "Latencia total del request", []),
+                "http_request_db_statements": ("histogram", "Sentencias SQL por request", []),
+                "http_request_db_seconds": ("histogram", "Tiempo en la base de datos por request", []),
+                "http_request_db_rows_total": ("counter", "Filas devueltas por las consultas SQL", []),
+                "http_request_serialization_seconds": ("histogram", "Tiempo de serialización de la respuesta", []),
+            }
+            for (method, route), route_metrics in routes:
+                labels = f'method="{method}",route="{_escape(route)}"'
+                for status_code, count in sorted(route_metrics.statuses.items()):
+                    sections["http_requests_total"][2].append(
+                        f'http_requests_total{{{labels},status="{status_code}"}} {count}'
+                    )
+                sections["http_request_duration_seconds"][2].extend(
+                    route_metrics.duration.lines("http_request_duration_seconds", labels))
+                sections["http_request_db_statements"][2].extend(
+                    route_metrics.statements.lines("http_request_db_statements", labels))
+                sections["http_request_db_seconds"][2].extend(
+                    route_metrics.db_seconds.lines("http_request_db_seconds", labels))
+                sections["http_request_db_rows_total"][2].append(
+                    f"http_request_db_rows_total{{{labels}}} {route_metrics.rows}")
+                sections["http_request_serialization_seconds"][2].extend(
+                    route_metrics.serialization.lines("http_request_serialization_seconds", labels))
+
+            lines = []
+            for name, (kind, help_text, samples) in sections.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(samples)
+            lines.append("# HELP db_statements_total Sentencias SQL ejecutadas (incluye tareas fuera de requests)")
+            lines.append("# TYPE db_statements_total counter")
+            lines.append(f"db_statements_total {self.db_statements_total}")
+            lines.append("# HELP db_seconds_total Tiempo total en la base de datos (incluye tareas fuera de requests)")
+            lines.append("# TYPE db_seconds_total counter")
+            lines.append(f"db_seconds_total {_format(self.db_seconds_total)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+# Serialización
+
+def record_serialization(seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.serialization_seconds += seconds
+
+
+@contextmanager
+def serialization_timer() -> Iterator[None]:
+    """Suma al request en curso el tiempo del bloque como serialización"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_serialization(time.perf_counter() - started)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse que registra su json.dumps como serialización (default_response_class)"""
+
+    def render(self, content) -> bytes:
+        with serialization_timer():
+            return super().render(content)
+
+
+# Sentencias SQL (las entrega el hook de app/utils/sql_hooks.py)
+
+def observe_statement(cursor, seconds: float) -> None:
+    """Suma una sentencia a los totales y al request en curso"""
+    metrics.observe_statement(seconds)
+
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.db_seconds += seconds
+    if cursor.description is not None and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+# Middleware
+
+def route_template(scope: Scope) -> str:
+    """Plantilla de la ruta que atendió el request (FastAPI la deja en scope["route"])"""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Mide cada request HTTP y lo registra bajo su plantilla de ruta
+
+    Los 404 sin ruta van todos a <unmatched> para no crear una serie por URL.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current.reset(token)
+            self.registry.observe_request(
+                scope["method"], route_template(scope), status_code, time.perf_counter() - started, stats
+            )
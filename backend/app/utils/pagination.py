@@ -0,0 +1,98 @@
+"""
+Utilidades de paginación por cursor (keyset pagination)
+
+El cursor es opaco para el cliente: codifica en base64 los valores de la clave
+de ordenamiento del último elemento devuelto. La siguiente página se obtiene
+filtrando "después" de esa clave, sin OFFSET, por lo que el costo de cada página
+es constante aunque la tabla crezca.
+"""
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List
+from fastapi import HTTPException, status
+from sqlalchemy import Boolean, DateTime, Integer, Numeric, String
+
+# Header donde se devuelve el cursor de la siguiente página
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Codifica los valores de la clave de ordenamiento en un cursor opaco"""
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Cursor de paginación inválido"
+    )
+
+
+def _cursor_value(column: Any, value: Any) -> Any:
+    """Convierte un valor del cursor al tipo de su columna (ValueError si no corresponde)"""
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        if isinstance(value, bool):
+            return value
+    elif isinstance(column_type, Integer):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif isinstance(column_type, Numeric):
+        # Los decimales viajan como string dentro del cursor (json no soporta Decimal)
+        if isinstance(value, (str, int)) and not isinstance(value, bool):
+            number = Decimal(str(value))
+            # Fuera del rango de la columna (1e999999) no es un cursor emitido por nosotros
+            digits = (column_type.precision or 65) - (column_type.scale or 0)
+            if number.is_finite() and (number.is_zero() or number.adjusted() < digits):
+                return number
+    elif isinstance(column_type, DateTime):
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+    elif isinstance(column_type, String):
+        if isinstance(value, str):
+            return value
+    raise ValueError(f"Valor de cursor inválido para {column.key}")
+
+
+def decode_cursor(cursor: str, columns: List[Any]) -> List[Any]:
+    """Decodifica un cursor generado por encode_cursor para el ordenamiento columns
+
+    Cada valor se valida y convierte al tipo de su columna. Lanza HTTPException
+    400 si el cursor está mal formado o no corresponde al ordenamiento
+    solicitado (distinta cantidad de valores o de otro tipo).
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode((cursor + padding).encode("ascii"))
+        values = json.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeError):
+        raise _invalid_cursor()
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise _invalid_cursor()
+    try:
+        return [_cursor_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, ArithmeticError):
+        raise _invalid_cursor()
+
+
+def keyset_after(columns: List[Any], values: List[Any]):
+    """Construye el filtro "después de" para un ordenamiento descendente
+
+    Para columnas (a, b, c) ordenadas DESC y valores (va, vb, vc) genera:
+        a < va OR (a = va AND b < vb) OR (a = va AND b = vb AND c < vc)
+    que MySQL puede resolver recorriendo el índice compuesto (a, b, c).
+    values debe venir de decode_cursor (ya convertidos al tipo de cada columna).
+    """
+    from sqlalchemy import and_, or_, literal
+
+    # literal() con el tipo de la columna: permite comparar booleanos con "<"
+    bound = [literal(value, type_=column.type) for column, value in zip(columns, values)]
+    conditions = []
+    for i, column in enumerate(columns):
+        equal_prefix = [columns[j] == bound[j] for j in range(i)]
+        conditions.append(and_(*equal_prefix, column < bound[i]))
+    return or_(*conditions)
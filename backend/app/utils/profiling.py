@@ -0,0 +1,288 @@
+"""
+Perfilado estadístico de requests bajo demanda (solo manager)
+
+Cuando un endpoint como /available se pone lento, se puede perfilar en el
+servidor real sin reproducirlo localmente:
+- Header X-Profile: 1 en un request de un manager (token Bearer de manager)
+- o PROFILING_SAMPLE_RATE > 0: esa fracción de todos los requests se perfila
+
+Un hilo muestreador toma cada PROFILING_INTERVAL_MS la pila de los hilos que
+están trabajando para un request perfilado y cuenta cuántas veces aparece
+cada pila. El request se reconoce por su contexto (contextvars): en el hilo
+del event loop es el contexto del Handle de asyncio que está corriendo el paso
+de la tarea, y en el threadpool el contexto que anyio copia para cada llamada
+(get_db, get_current_user y demás dependencias síncronas). Así el perfil cubre
+el request completo: dependencias, servicios, consultas y serialización, y no
+mezcla otros requests concurrentes.
+
+El resultado se guarda en formato "collapsed stacks" (una línea
+"raíz;...;hoja cantidad" por pila), que leen directamente flamegraph.pl,
+speedscope e inferno. Se guardan los últimos PROFILING_BUFFER_SIZE perfiles del
+proceso; el manager los consulta en /api/manager/maintenance/profiles y el
+request perfilado por header devuelve X-Profile-Id.
+
+Con PROFILING_ENABLED=False (por defecto) el middleware no se instala: cero
+costo. Habilitado, un request no perfilado solo paga la lectura de un header;
+mientras haya un request perfilándose el intervalo de cambio de hilo del
+intérprete baja a PROFILING_INTERVAL_MS (ver Sampler._run).
+"""
+import asyncio.events
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import Context, ContextVar
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.utils.metrics import route_template
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+
+_active: ContextVar[Optional["ProfileSession"]] = ContextVar("active_profile", default=None)
+
+# Frames donde un hilo empieza a trabajar para un contexto (y cómo obtenerlo)
+_HANDLE_RUN = asyncio.events.Handle._run.__code__
+try:
+    from anyio._backends._asyncio import WorkerThread
+    _WORKER_RUN = WorkerThread.run.__code__
+except (ImportError, AttributeError):  # pragma: no cover - depende de la versión de anyio
+    _WORKER_RUN = None
+
+
+def _frame_context(frame) -> Optional[Context]:
+    if frame.f_code is _HANDLE_RUN:
+        return getattr(frame.f_locals.get("self"), "_context", None)
+    context = frame.f_locals.get("context")
+    return context if isinstance(context, Context) else None
+
+
+@lru_cache(maxsize=4096)
+def _label(code) -> str:
+    """Nombre de un frame en el flamegraph: función (archivo:línea)"""
+    filename = code.co_filename
+    if filename.startswith(_ROOT_DIR):
+        filename = filename[len(_ROOT_DIR):]
+    elif "site-packages" + os.sep in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+class ProfileSession:
+    """Muestras de un request perfilado"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method: str, path: str, trigger: str, user_id: Optional[int] = None):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.user_id = user_id
+        self.started_at = datetime.utcnow()
+        self.route: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.duration_ms: Optional[float] = None
+        self.stacks: Counter = Counter()
+
+    def add(self, codes: tuple) -> None:
+        self.stacks[codes] += 1
+
+    def collapsed(self) -> str:
+        """Formato collapsed stacks (flamegraph.pl / speedscope)"""
+        lines = [
+            f"{';'.join(_label(code) for code in codes)} {count}"
+            for codes, count in self.stacks.most_common()
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status_code,
+            "trigger": self.trigger,
+            "user_id": self.user_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "samples": sum(self.stacks.values()),
+            "interval_ms": settings.PROFILING_INTERVAL_MS,
+        }
+
+
+class Sampler:
+    """Hilo muestreador: corre solo mientras haya requests perfilándose"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: set = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.discard(session)
+
+    def _run(self) -> None:
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+        # El muestreador necesita el GIL para tomar cada muestra: mientras perfila,
+        # el intervalo de cambio de hilo (5 ms por defecto) baja al de muestreo
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, interval))
+        try:
+            while True:
+                with self._lock:
+                    if not self._sessions:
+                        self._finish(switch_interval)
+                        return
+                    sessions = set(self._sessions)
+                self.sample(sessions)
+                time.sleep(interval)
+        except BaseException:
+            with self._lock:
+                self._finish(switch_interval)
+            raise
+
+    def _finish(self, switch_interval: float) -> None:
+        """Restaura el intervalo y suelta el hilo (con el lock tomado)
+
+        Las dos cosas van juntas bajo el lock: un start() que llegue después
+        crea un hilo nuevo que ya lee el intervalo original, no el bajado.
+        """
+        sys.setswitchinterval(switch_interval)
+        self._thread = None
+
+    @staticmethod
+    def sample(sessions: set) -> None:
+        """Una muestra de cada hilo que esté trabajando para alguna de las sesiones"""
+        me = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me:
+                continue
+            codes = []
+            while frame is not None:
+                code = frame.f_code
+                if code is _HANDLE_RUN or code is _WORKER_RUN:
+                    # Inicio del trabajo de un contexto: lo de más abajo es el loop / pool
+                    context = _frame_context(frame)
+                    session = context.get(_active) if context is not None else None
+                    if session in sessions and codes:
+                        session.add(tuple(reversed(codes)))
+                    break
+                codes.append(code)
+                frame = frame.f_back
+
+
+class ProfileStore:
+    """Últimos perfiles de este proceso"""
+
+    def __init__(self, capacity: int):
+        self._lock = threading.Lock()
+        self._profiles: deque = deque(maxlen=capacity)
+
+    def add(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._profiles.append(session)
+
+    def get(self, profile_id: int) -> Optional[ProfileSession]:
+        with self._lock:
+            return next((session for session in self._profiles if session.id == profile_id), None)
+
+    def summaries(self) -> List[dict]:
+        """Más recientes primero"""
+        with self._lock:
+            return [session.summary() for session in reversed(self._profiles)]
+
+
+sampler = Sampler()
+profile_store = ProfileStore(settings.PROFILING_BUFFER_SIZE)
+
+
+def _manager_id(authorization: str) -> Optional[int]:
+    """id del usuario si el token Bearer es de un manager (None si no)"""
+    from app.database import SessionLocal
+    from app.models.user import User, UserRole
+    from app.utils.security import decode_access_token
+
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = decode_access_token(token)
+        user_id = int(payload.get("sub")) if payload else None
+    except Exception:
+        return None
+    if user_id is None:
+        return None
+
+    db = SessionLocal()
+    try:
+        role = db.query(User.role).filter(User.id == user_id).scalar()
+    finally:
+        db.close()
+    return user_id if role == UserRole.MANAGER else None
+
+
+class ProfilingMiddleware:
+    """Perfila los requests pedidos por un manager (X-Profile) o muestreados"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        session = None
+        if headers.get(PROFILE_HEADER, "").strip().lower() in ("1", "true", "yes"):
+            user_id = await run_in_threadpool(_manager_id, headers.get("authorization", ""))
+            if user_id is not None:
+                session = ProfileSession(scope["method"], scope["path"], "header", user_id)
+        elif settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+            session = ProfileSession(scope["method"], scope["path"], "sample")
+
+        if session is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                session.status_code = message["status"]
+                if session.trigger == "header":
+                    MutableHeaders(scope=message)[PROFILE_ID_HEADER] = str(session.id)
+            await send(message)
+
+        token = _active.set(session)
+        sampler.start(session)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop(session)
+            _active.reset(token)
+            session.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            session.route = route_template(scope)
+            profile_store.add(session)
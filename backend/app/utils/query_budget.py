@@ -0,0 +1,140 @@
+"""
+Presupuesto de sentencias SQL por endpoint
+
+Un lazy load accidental (job.client al serializar, message.sender en
+message_to_response) no rompe nada: solo agrega una consulta por fila. Para
+que esos N+1 se vean apenas aparecen, cada endpoint declara cuántas
+sentencias puede ejecutar:
+
+    @router.get("/{job_id}", response_model=JobResponse)
+    @query_budget(4)
+    async def get_job(...):
+
+El conteo lo hace BudgetedRoute (route_class del router) y cubre el request
+completo dentro de la ruta: dependencias (get_current_user, get_db),
+endpoint y serialización del response_model. Fuera de un endpoint
+(un test, el loop de mensajes del WebSocket) se usa el context manager:
+
+    with statement_budget(3, "chat ws: mensaje"):
+        ChatService.create_message(...)
+
+QUERY_BUDGET_MODE decide qué pasa al excederlo:
+- warn: al terminar se registra una advertencia con el total y el origen de
+  la primera sentencia de más (Service.method y archivo:línea)
+- raise: la sentencia que excede el presupuesto no se ejecuta y lanza
+  QueryBudgetExceeded (falla el test / responde 500 con el traceback del N+1)
+- off: no se mide (BudgetedRoute devuelve el handler original)
+Sin valor: warn en development, off en el resto.
+
+El presupuesto es un máximo para el peor caso normal del endpoint (con
+datos, no vacío), no para cada rama: no debe crecer con el tamaño de la
+página. Si un cambio legítimo agrega consultas, se sube el número en el
+decorador junto con el cambio.
+"""
+import logging
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+from app.config import settings
+from app.utils.slow_queries import call_site
+
+logger = logging.getLogger(__name__)
+
+BUDGET_ATTRIBUTE = "__query_budget__"
+_THIS_FILE = os.path.abspath(__file__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Un endpoint ejecutó más sentencias SQL que su presupuesto (modo raise)"""
+
+
+class QueryBudget:
+    """Sentencias usadas contra el máximo de un endpoint o bloque"""
+    __slots__ = ("limit", "label", "used", "parent", "first_excess")
+
+    def __init__(self, limit: int, label: str, parent: Optional["QueryBudget"] = None):
+        self.limit = limit
+        self.label = label
+        self.used = 0
+        self.parent = parent
+        self.first_excess: Optional[str] = None
+
+    @property
+    def exceeded(self) -> bool:
+        return self.used > self.limit
+
+
+_current: ContextVar[Optional[QueryBudget]] = ContextVar("query_budget", default=None)
+
+
+def budget_mode() -> str:
+    """off | warn | raise (QUERY_BUDGET_MODE o el valor por defecto del entorno)"""
+    if settings.QUERY_BUDGET_MODE:
+        return settings.QUERY_BUDGET_MODE.lower()
+    return "warn" if settings.is_development else "off"
+
+
+def query_budget(limit: int) -> Callable:
+    """Declara el máximo de sentencias SQL de un endpoint (lo aplica BudgetedRoute)"""
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, BUDGET_ATTRIBUTE, limit)
+        return endpoint
+    return decorator
+
+
+@contextmanager
+def statement_budget(limit: int, label: str) -> Iterator[Optional[QueryBudget]]:
+    """Cuenta las sentencias del bloque contra limit (anidable: cuentan en todos)"""
+    if budget_mode() == "off":
+        yield None
+        return
+    budget = QueryBudget(limit, label, _current.get())
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
+        if budget.exceeded:
+            logger.warning(
+                f"Presupuesto de consultas excedido en {label}: {budget.used} sentencias "
+                f"(máximo {limit}); primera de más en {budget.first_excess or 'desconocido'}"
+            )
+
+
+class BudgetedRoute(APIRoute):
+    """APIRoute que aplica el @query_budget del endpoint a todo el request"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        limit = getattr(self.endpoint, BUDGET_ATTRIBUTE, None)
+        if limit is None or budget_mode() == "off":
+            return handler
+        label = f"{','.join(sorted(self.methods))} {self.path_format}"
+
+        async def budgeted_handler(request: Request) -> Response:
+            with statement_budget(limit, label):
+                return await handler(request)
+
+        return budgeted_handler
+
+
+# Sentencias SQL (las entrega el hook de app/utils/sql_hooks.py antes de ejecutarlas)
+
+def count_statement(statement: str) -> None:
+    """Suma la sentencia a los presupuestos activos (en modo raise, lanza al excederse)"""
+    budget = _current.get()
+    while budget is not None:
+        budget.used += 1
+        if budget.exceeded and budget.first_excess is None:
+            site, location = call_site(_THIS_FILE)
+            budget.first_excess = f"{site} ({location})" if site else "desconocido"
+            if budget_mode() == "raise":
+                raise QueryBudgetExceeded(
+                    f"{budget.label}: más de {budget.limit} sentencias SQL; "
+                    f"la de más viene de {budget.first_excess}: {statement[:200]}"
+                )
+        budget = budget.parent
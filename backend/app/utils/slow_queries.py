@@ -0,0 +1,168 @@
+"""
+Registro de consultas lentas (expuesto al manager)
+
+echo=True del engine es todo o nada y solo se usa en desarrollo. Aquí cada
+sentencia que tarda más de SLOW_QUERY_THRESHOLD_MS se guarda en un buffer
+circular de SLOW_QUERY_BUFFER_SIZE entradas con:
+- la sentencia SQL (espacios colapsados, truncada)
+- la forma de los parámetros: solo nombres y tipos, nunca los valores
+  (pueden ser teléfonos, emails o hashes)
+- la duración
+- el origen: el primer Service.method de app/services en la pila (o la
+  primera función de app/ si la consulta no viene de un servicio)
+- opcionalmente (SLOW_QUERY_EXPLAIN) el plan: EXPLAIN en MySQL,
+  EXPLAIN QUERY PLAN en SQLite, solo para SELECT
+
+La duración la mide el hook de cursor de app/utils/sql_hooks.py; las consultas
+rápidas solo pagan la comparación con el umbral, y la pila y el EXPLAIN se
+obtienen únicamente cuando se supera. El EXPLAIN se ejecuta con un
+cursor DBAPI aparte sobre la misma conexión (sin pasar por los eventos de
+SQLAlchemy) y suma su tiempo al request que ya era lento.
+
+GET /api/manager/maintenance/slow-queries (manager) lista el buffer de este proceso.
+"""
+import logging
+import os
+import re
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_ROOT_DIR = os.path.dirname(os.path.dirname(_APP_DIR))
+_SERVICES_DIR = os.path.join(_APP_DIR, "services") + os.sep
+_THIS_FILE = os.path.abspath(__file__)
+# Frames del hook de cursor que no cuentan como origen de una consulta
+_HOOK_FILES = (_THIS_FILE, os.path.join(_APP_DIR, "utils", "sql_hooks.py"))
+_WHITESPACE = re.compile(r"\s+")
+
+EXPLAIN_PREFIXES = {
+    "mysql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Nombres y tipos de los parámetros (sin valores)"""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameter_shape(parameters[0]) if parameters else None
+        return {"rows": len(parameters), "row": first}
+    if isinstance(parameters, dict):
+        return {str(key): type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None if parameters is None else type(parameters).__name__
+
+
+def call_site(*skip_files: str) -> Tuple[Optional[str], Optional[str]]:
+    """(Clase.método, archivo:línea) que originó la consulta
+
+    Prefiere el primer método de una clase de app/services (JobService.create_job);
+    si no hay, la primera función de app/services y luego la primera de app/.
+    skip_files: otros módulos de hooks que no cuentan como origen.
+    """
+    skipped = _HOOK_FILES + skip_files
+    service_function = None
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_APP_DIR) and filename not in skipped:
+            code = frame.f_code
+            name = getattr(code, "co_qualname", code.co_name)
+            site = (name, f"{os.path.relpath(filename, _ROOT_DIR)}:{frame.f_lineno}")
+            if filename.startswith(_SERVICES_DIR):
+                if "." in name and "<locals>" not in name:
+                    return site
+                service_function = service_function or site
+            fallback = fallback or site
+        frame = frame.f_back
+    return service_function or fallback or (None, None)
+
+
+def explain(dialect: str, cursor, statement: str, parameters: Any) -> Optional[List[dict]]:
+    """Plan de ejecución de un SELECT (None si el dialecto no se soporta o falla)"""
+    prefix = EXPLAIN_PREFIXES.get(dialect)
+    if prefix is None or not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    explain_cursor = None
+    try:
+        explain_cursor = cursor.connection.cursor()
+        explain_cursor.execute(prefix + statement, parameters)
+        columns = [column[0] for column in explain_cursor.description or ()]
+        return [
+            {column: value if isinstance(value, (int, float, str)) or value is None else str(value)
+             for column, value in zip(columns, row)}
+            for row in explain_cursor.fetchall()
+        ]
+    except Exception as e:
+        logger.debug(f"No se pudo obtener EXPLAIN de una consulta lenta: {e}")
+        return None
+    finally:
+        if explain_cursor is not None:
+            try:
+                explain_cursor.close()
+            except Exception:
+                pass
+
+
+class SlowQueryLog:
+    """Buffer circular de consultas lentas, local al proceso"""
+
+    def __init__(self, capacity: int):
+        self._lock = threading.Lock()
+        self._entries: deque = deque(maxlen=capacity)
+        self.recorded = 0
+
+    def record(self, entry: dict) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Entradas más recientes primero"""
+        with self._lock:
+            return {
+                "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+                "capacity": self._entries.maxlen,
+                "explain": settings.SLOW_QUERY_EXPLAIN,
+                "recorded": self.recorded,
+                "queries": list(reversed(self._entries)),
+            }
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_BUFFER_SIZE)
+
+
+def record_if_slow(conn, cursor, statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+    """Guarda la sentencia si superó SLOW_QUERY_THRESHOLD_MS (la llama el hook de cursor)"""
+    duration_ms = seconds * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    site, location = call_site()
+    text = _WHITESPACE.sub(" ", statement).strip()
+    limit = settings.SLOW_QUERY_MAX_STATEMENT_LENGTH
+    entry = {
+        "recorded_at": datetime.utcnow().isoformat(),
+        "duration_ms": round(duration_ms, 2),
+        "statement": text if len(text) <= limit else text[:limit] + "...",
+        "parameters": parameter_shape(parameters, executemany),
+        "call_site": site,
+        "location": location,
+        "explain": None,
+    }
+    if settings.SLOW_QUERY_EXPLAIN and not executemany:
+        entry["explain"] = explain(conn.dialect.name, cursor, statement, parameters)
+    slow_query_log.record(entry)
+    logger.warning(f"Consulta lenta ({entry['duration_ms']:.0f} ms) en {site or 'desconocido'}: {entry['statement'][:200]}")
+
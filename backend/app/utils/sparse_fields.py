@@ -0,0 +1,62 @@
+"""
+Sparse fieldsets: parámetro fields= en /api/jobs/* y /api/workers/*
+
+Las pantallas de lista de la app muestran pocos campos (título, tarifa,
+estado) pero JobResponse siempre trae el trabajo completo con ClientInfo y
+WorkerInfo embebidos. Con fields=title,base_fee,status:
+- La consulta solo lee esas columnas y solo hace JOIN con client/worker si se
+  piden (app/services/read_models.py)
+- La respuesta solo incluye esos campos (id siempre se incluye)
+
+Los nombres válidos son los campos de primer nivel del schema de la
+respuesta; client y worker se piden como bloque completo. Un nombre
+desconocido responde 400 con la lista de opciones.
+"""
+from typing import Optional, Tuple, Type
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from app.schemas.job import JobResponse
+from app.schemas.job_application import JobApplicationResponse
+from app.schemas.worker import WorkerResponse
+
+Fields = Optional[Tuple[str, ...]]
+
+
+class SparseFields:
+    """Dependencia que valida fields= contra los campos de un schema
+
+    Retorna los campos pedidos en el orden del schema (con id), o None si no
+    se pidió fields= (respuesta completa).
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.allowed = tuple(schema.model_fields)
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(None, description="Campos a incluir, separados por coma (id siempre se incluye)")
+    ) -> Fields:
+        if fields is None or not fields.strip():
+            return None
+
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested.difference(self.allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos inválidos: {', '.join(sorted(unknown))}. Opciones: {', '.join(self.allowed)}"
+            )
+        requested.add("id")
+        return tuple(name for name in self.allowed if name in requested)
+
+
+job_fields = SparseFields(JobResponse)
+application_fields = SparseFields(JobApplicationResponse)
+worker_fields = SparseFields(WorkerResponse)
+
+
+def select_fields(row: dict, fields: Fields) -> dict:
+    """Deja en la fila solo los campos pedidos (sin cambios si fields es None)"""
+    if fields is None:
+        return row
+    return {name: row[name] for name in fields}
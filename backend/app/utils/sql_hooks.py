@@ -0,0 +1,54 @@
+"""
+Hook único de sentencias SQL (before/after_cursor_execute)
+
+Métricas (app/utils/metrics.py), consultas lentas (app/utils/slow_queries.py)
+y presupuesto de consultas (app/utils/query_budget.py) miran las mismas
+sentencias. Antes cada uno registraba su propio par de eventos en Engine: tres
+listeners y varias mediciones por sentencia. Ahora hay un solo par:
+- before: cuenta la sentencia contra el presupuesto (en modo raise la corta
+  antes de ejecutarla) y guarda el inicio en el contexto de ejecución (uno por
+  sentencia: si falla no queda nada colgado en la conexión)
+- after: calcula la duración una vez y la entrega a métricas y consultas lentas
+
+install_sql_hooks() activa cada parte según la configuración (main.py).
+"""
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.metrics import observe_statement
+from app.utils.query_budget import count_statement
+from app.utils.slow_queries import record_if_slow
+
+
+class _Enabled:
+    metrics = False
+    slow_queries = False
+    query_budget = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _Enabled.query_budget:
+        count_statement(statement)
+    if context is not None and (_Enabled.metrics or _Enabled.slow_queries):
+        context._sql_hooks_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sql_hooks_start", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if _Enabled.metrics:
+        observe_statement(cursor, elapsed)
+    if _Enabled.slow_queries:
+        record_if_slow(conn, cursor, statement, parameters, executemany, elapsed)
+
+
+def install_sql_hooks(metrics: bool = False, slow_queries: bool = False, query_budget: bool = False) -> None:
+    """Activa las partes indicadas y registra los eventos de cursor en todos los engines (idempotente)"""
+    _Enabled.metrics = _Enabled.metrics or metrics
+    _Enabled.slow_queries = _Enabled.slow_queries or slow_queries
+    _Enabled.query_budget = _Enabled.query_budget or query_budget
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
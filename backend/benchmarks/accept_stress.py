@@ -0,0 +1,220 @@
+"""
+Prueba de estrés: aceptación concurrente de trabajadores
+
+Lanza muchas aceptaciones simultáneas (JobService.client_accept_worker) sobre
+pocos trabajos y pocos trabajadores, y verifica las invariantes:
+- Cada trabajo termina con a lo sumo un trabajador asignado
+- Cada trabajador termina con a lo sumo un trabajo activo
+- Cada aceptación exitosa corresponde a exactamente una aplicación is_accepted
+
+Crea sus propios datos (prefijo stress-accept-) y los elimina al terminar.
+Usar contra MySQL: SQLite serializa las escrituras y no ejercita la concurrencia.
+tests/test_accept_concurrency.py corre las mismas rondas con pytest (TEST_MYSQL_URL).
+
+Ejecutar:
+    python benchmarks/accept_stress.py
+    python benchmarks/accept_stress.py --jobs 20 --workers 10 --threads 32 --rounds 5
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+from app.models.worker import Worker
+from app.models.job import Job, JobStatus, PaymentMethod, ACTIVE_JOB_STATUSES
+from app.models.job_application import JobApplication
+from app.services.job_service import JobService
+
+
+def create_fixture(db, prefix: str, jobs: int, workers: int):
+    """Crea un cliente, N trabajadores y M trabajos; cada trabajador aplica a todos"""
+    client = User(email=f"{prefix}-client@stress.test", password_hash="x", role=UserRole.CLIENT)
+    worker_users = [
+        User(email=f"{prefix}-worker{i}@stress.test", password_hash="x", role=UserRole.WORKER)
+        for i in range(workers)
+    ]
+    db.add_all([client, *worker_users])
+    db.flush()
+
+    worker_rows = [
+        Worker(
+            user_id=user.id,
+            full_name=f"Stress {i}",
+            services=["Plomería"],
+            is_available=True,
+            is_plus_active=True,
+            plus_expires_at=datetime.utcnow() + timedelta(days=1)
+        )
+        for i, user in enumerate(worker_users)
+    ]
+    job_rows = [
+        Job(
+            client_id=client.id,
+            title=f"Stress job {i}",
+            service_type="Plomería",
+            status=JobStatus.PENDING,
+            payment_method=PaymentMethod.CASH,
+            base_fee=Decimal("50.00"),
+            extras=Decimal("0.00"),
+            total_amount=Decimal("50.00"),
+            address="Stress"
+        )
+        for i in range(jobs)
+    ]
+    db.add_all([*worker_rows, *job_rows])
+    db.flush()
+
+    applications = [
+        JobApplication(job_id=job.id, worker_id=worker.id, is_accepted=False)
+        for job in job_rows for worker in worker_rows
+    ]
+    db.add_all(applications)
+    db.commit()
+
+    return (
+        client.id,
+        [user.id for user in worker_users],
+        [job.id for job in job_rows],
+        [(application.job_id, application.id) for application in applications]
+    )
+
+
+def run_round(client_id: int, attempts, threads: int) -> Counter:
+    """Ejecuta las aceptaciones en paralelo (todas arrancan juntas con una barrera)"""
+    outcomes = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+    chunks = [attempts[i::threads] for i in range(threads)]
+
+    def worker(chunk):
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            for job_id, application_id in chunk:
+                try:
+                    JobService.client_accept_worker(db, job_id, application_id, client_id)
+                    result = "accepted"
+                except HTTPException as e:
+                    result = f"{e.status_code} {e.detail}"
+                with lock:
+                    outcomes[result] += 1
+        finally:
+            db.close()
+
+    pool = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return outcomes
+
+
+def check_invariants(db, client_id: int, job_ids, accepted: int) -> list:
+    """Devuelve la lista de invariantes violadas (vacía si todo está bien)"""
+    errors = []
+
+    per_worker = db.query(Job.worker_id, func.count(Job.id)).filter(
+        Job.id.in_(job_ids),
+        Job.status.in_(ACTIVE_JOB_STATUSES)
+    ).group_by(Job.worker_id).having(func.count(Job.id) > 1).all()
+    if per_worker:
+        errors.append(f"Trabajadores con más de un trabajo activo: {per_worker}")
+
+    assigned = db.query(func.count(Job.id)).filter(
+        Job.id.in_(job_ids), Job.worker_id.isnot(None)
+    ).scalar()
+    if assigned != accepted:
+        errors.append(f"Trabajos asignados ({assigned}) != aceptaciones exitosas ({accepted})")
+
+    accepted_applications = db.query(JobApplication.job_id, func.count(JobApplication.id)).filter(
+        JobApplication.job_id.in_(job_ids),
+        JobApplication.is_accepted == True
+    ).group_by(JobApplication.job_id).all()
+    if any(count > 1 for _, count in accepted_applications):
+        errors.append(f"Trabajos con más de una aplicación aceptada: {accepted_applications}")
+    if sum(count for _, count in accepted_applications) != accepted:
+        errors.append("Aplicaciones aceptadas no coinciden con las aceptaciones exitosas")
+
+    mismatched = db.query(func.count(Job.id)).join(
+        JobApplication,
+        (JobApplication.job_id == Job.id) & (JobApplication.is_accepted == True)
+    ).filter(Job.id.in_(job_ids), JobApplication.worker_id != Job.worker_id).scalar()
+    if mismatched:
+        errors.append(f"{mismatched} trabajos con worker_id distinto al de la aplicación aceptada")
+
+    return errors
+
+
+def cleanup(db, client_id: int, worker_user_ids) -> None:
+    """Elimina los datos de la prueba (en orden, sin depender de ON DELETE CASCADE)"""
+    db.query(JobApplication).filter(
+        JobApplication.job_id.in_(db.query(Job.id).filter(Job.client_id == client_id))
+    ).delete(synchronize_session=False)
+    db.query(Job).filter(Job.client_id == client_id).delete(synchronize_session=False)
+    db.query(Worker).filter(Worker.user_id.in_(worker_user_ids)).delete(synchronize_session=False)
+    db.query(User).filter(User.id.in_([client_id, *worker_user_ids])).delete(synchronize_session=False)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estrés de aceptaciones concurrentes")
+    parser.add_argument("--jobs", type=int, default=10, help="Trabajos por ronda")
+    parser.add_argument("--workers", type=int, default=5, help="Trabajadores por ronda (menos que trabajos)")
+    parser.add_argument("--threads", type=int, default=16, help="Hilos concurrentes")
+    parser.add_argument("--rounds", type=int, default=3, help="Rondas con datos nuevos")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del orden de las aceptaciones")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failed = False
+
+    for round_number in range(1, args.rounds + 1):
+        prefix = f"stress-accept-{uuid.uuid4().hex[:8]}"
+        db = SessionLocal()
+        client_id, worker_user_ids, job_ids, attempts = create_fixture(db, prefix, args.jobs, args.workers)
+        try:
+            # Cada combinación (trabajo, aplicación) se intenta una vez, en orden aleatorio
+            rng.shuffle(attempts)
+
+            started = time.perf_counter()
+            outcomes = run_round(client_id, attempts, args.threads)
+            elapsed = time.perf_counter() - started
+
+            accepted = outcomes["accepted"]
+            db.expire_all()
+            errors = check_invariants(db, client_id, job_ids, accepted)
+
+            print(f"\nRonda {round_number}: {len(attempts)} intentos en {elapsed:.2f}s "
+                  f"({len(attempts) / elapsed:.0f} intentos/s)")
+            for result, count in outcomes.most_common():
+                print(f"   {count:5d}  {result}")
+            # Con más trabajos que trabajadores, el máximo posible es un trabajo por trabajador
+            print(f"   Aceptados: {accepted} (máximo posible: {min(args.jobs, args.workers)})")
+
+            if errors:
+                failed = True
+                for error in errors:
+                    print(f"   [ERROR] {error}")
+            else:
+                print("   [OK] Invariantes cumplidas")
+        finally:
+            cleanup(db, client_id, worker_user_ids)
+            db.close()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark: aplicaciones concurrentes a un mismo trabajo ("trabajo caliente")
+
+Simula el caso de un trabajo recién publicado al que aplican muchos
+trabajadores a la vez: N trabajadores con Modo Plus llaman en paralelo a
+JobService.apply_to_job sobre el mismo trabajo. Opcionalmente cada trabajador
+reintenta (--duplicates) para medir también el camino de aplicación duplicada.
+
+Reporta aplicaciones/s, latencia p50/p95/p99 y verifica que se haya creado
+exactamente una aplicación por trabajador.
+
+Crea sus propios datos (prefijo bench-apply-) y los elimina al terminar.
+Usar contra MySQL: SQLite serializa las escrituras y no refleja la concurrencia.
+tests/test_apply_concurrency.py verifica lo mismo con pytest (TEST_MYSQL_URL).
+
+Ejecutar:
+    python benchmarks/apply_benchmark.py
+    python benchmarks/apply_benchmark.py --workers 200 --threads 32 --duplicates 1
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+from app.models.worker import Worker
+from app.models.job import Job, JobStatus, PaymentMethod
+from app.models.job_application import JobApplication
+from app.services.job_service import JobService
+
+
+def create_fixture(db, prefix: str, workers: int):
+    """Crea un cliente con un trabajo pendiente y N trabajadores con Modo Plus"""
+    client = User(email=f"{prefix}-client@bench.test", password_hash="x", role=UserRole.CLIENT)
+    worker_users = [
+        User(email=f"{prefix}-worker{i}@bench.test", password_hash="x", role=UserRole.WORKER)
+        for i in range(workers)
+    ]
+    db.add_all([client, *worker_users])
+    db.flush()
+
+    job = Job(
+        client_id=client.id,
+        title="Trabajo caliente",
+        service_type="Plomería",
+        status=JobStatus.PENDING,
+        payment_method=PaymentMethod.CASH,
+        base_fee=Decimal("80.00"),
+        extras=Decimal("0.00"),
+        total_amount=Decimal("80.00"),
+        address="Benchmark"
+    )
+    worker_rows = [
+        Worker(
+            user_id=user.id,
+            full_name=f"Bench {i}",
+            services=["Plomería"],
+            is_available=True,
+            is_plus_active=True,
+            plus_expires_at=datetime.utcnow() + timedelta(days=1)
+        )
+        for i, user in enumerate(worker_users)
+    ]
+    db.add_all([job, *worker_rows])
+    db.commit()
+    return client.id, [user.id for user in worker_users], job.id, [worker.id for worker in worker_rows]
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def run(job_id: int, worker_ids, threads: int, duplicates: int):
+    """Aplica en paralelo; cada hilo carga sus trabajadores (como la ruta) y aplica"""
+    attempts = [worker_id for _ in range(duplicates + 1) for worker_id in worker_ids]
+    chunks = [attempts[i::threads] for i in range(threads)]
+    outcomes = Counter()
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker_thread(chunk):
+        db = SessionLocal()
+        try:
+            profiles = {
+                worker.id: worker
+                for worker in db.query(Worker).filter(Worker.id.in_(set(chunk))).all()
+            }
+            barrier.wait()
+            for worker_id in chunk:
+                started = time.perf_counter()
+                try:
+                    JobService.apply_to_job(db, job_id, profiles[worker_id])
+                    result = "applied"
+                except HTTPException as e:
+                    result = f"{e.status_code} {e.detail}"
+                elapsed = time.perf_counter() - started
+                with lock:
+                    outcomes[result] += 1
+                    latencies.append(elapsed)
+        finally:
+            db.close()
+
+    pool = [threading.Thread(target=worker_thread, args=(chunk,)) for chunk in chunks]
+    for thread in pool:
+        thread.start()
+    # Medir desde que todos los hilos tienen su sesión y perfiles listos
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return outcomes, latencies, time.perf_counter() - started
+
+
+def cleanup(db, client_id: int, worker_user_ids) -> None:
+    """Elimina los datos del benchmark (en orden, sin depender de ON DELETE CASCADE)"""
+    db.query(JobApplication).filter(
+        JobApplication.job_id.in_(db.query(Job.id).filter(Job.client_id == client_id))
+    ).delete(synchronize_session=False)
+    db.query(Job).filter(Job.client_id == client_id).delete(synchronize_session=False)
+    db.query(Worker).filter(Worker.user_id.in_(worker_user_ids)).delete(synchronize_session=False)
+    db.query(User).filter(User.id.in_([client_id, *worker_user_ids])).delete(synchronize_session=False)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de aplicaciones a un trabajo caliente")
+    parser.add_argument("--workers", type=int, default=100, help="Trabajadores que aplican")
+    parser.add_argument("--threads", type=int, default=16, help="Hilos concurrentes")
+    parser.add_argument("--duplicates", type=int, default=0, help="Reintentos por trabajador (aplicaciones duplicadas)")
+    args = parser.parse_args()
+
+    prefix = f"bench-apply-{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    client_id, worker_user_ids, job_id, worker_ids = create_fixture(db, prefix, args.workers)
+    try:
+        outcomes, latencies, elapsed = run(job_id, worker_ids, args.threads, args.duplicates)
+
+        total = sum(outcomes.values())
+        print(f"\n{total} intentos sobre el trabajo {job_id} con {args.threads} hilos en {elapsed:.2f}s")
+        print(f"   Throughput: {total / elapsed:.0f} intentos/s, "
+              f"{outcomes['applied'] / elapsed:.0f} aplicaciones/s")
+        print(f"   Latencia p50 {percentile(latencies, 0.50) * 1000:.1f} ms | "
+              f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms | "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+        for result, count in outcomes.most_common():
+            print(f"   {count:5d}  {result}")
+
+        db.expire_all()
+        stored = db.query(func.count(JobApplication.id)).filter(JobApplication.job_id == job_id).scalar()
+        if stored == args.workers and outcomes["applied"] == args.workers:
+            print(f"   [OK] {stored} aplicaciones, una por trabajador")
+            failed = False
+        else:
+            print(f"   [ERROR] {stored} aplicaciones guardadas, {outcomes['applied']} exitosas, "
+                  f"{args.workers} trabajadores")
+            failed = True
+    finally:
+        cleanup(db, client_id, worker_user_ids)
+        db.close()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
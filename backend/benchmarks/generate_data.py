@@ -0,0 +1,458 @@
+"""
+Generador de datos sintéticos a escala de producción
+
+seed_data.py crea unos pocos usuarios y trabajos a mano (un db.add por fila,
+bcrypt completo por usuario y borrando todas las tablas al empezar). Para
+pruebas de carga y de planes de consulta hacen falta tablas del tamaño de
+producción; este script genera millones de filas coherentes entre sí:
+- usuarios (clientes, trabajadores y un manager) con un único hash bcrypt
+  precalculado
+- perfiles de trabajador, con Modo Plus activo en una fracción de ellos
+- historial de suscripciones (vencidas y la activa de los trabajadores Plus)
+- trabajos en todos los estados: pendientes recientes (el feed), activos
+  (a lo sumo uno por trabajador: índice uq_jobs_active_worker), completados y
+  cancelados
+- aplicaciones (la aceptada del trabajador asignado y otras), mensajes de
+  chat, calificaciones y comisiones de los completados
+
+Las filas se insertan con INSERT multi-fila (executemany de SQLAlchemy Core,
+que PyMySQL reescribe como INSERT ... VALUES (...), (...)) en lotes de
+--batch-size y una transacción por bloque de trabajos. Los ids se asignan
+aquí (desde el máximo actual de cada tabla), así que no hace falta leer nada
+de vuelta. Con --disable-checks (solo MySQL) se desactivan foreign_key_checks
+y unique_checks durante la carga.
+
+Todo sale de random.Random(--seed): con la misma semilla y --anchor se generan
+exactamente las mismas filas (salvo la sal del hash; la contraseña de todos es
+password123). Los tiempos se calculan hacia atrás desde
+--anchor (por defecto, ahora): los pendientes son de las últimas 48 horas y su
+scheduled_at (si tienen) cae después de --anchor, para que el barrido de
+vencidos no los cancele.
+
+No borra nada: los emails llevan --prefix y el id, y se puede generar varias
+veces sobre la misma base. Al final recalcula la reputación
+(RatingService.rebuild_reputation).
+
+Ejecutar:
+    python benchmarks/generate_data.py --database-url sqlite:///./loadtest.db
+    python benchmarks/generate_data.py --clients 200000 --workers 50000 --jobs 2000000 --disable-checks
+    python benchmarks/generate_data.py --jobs 100000 --seed 7 --anchor 2026-10-19T12:00:00
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Vocabulario de seed_data.py
+SERVICES = {
+    "Plomería": ["Reparación de grifo en cocina", "Reparación de ducha", "Reparación de tubería rota"],
+    "Electricidad": ["Instalación de interruptores eléctricos", "Instalación de lámparas LED"],
+    "Limpieza": ["Limpieza de casa completa"],
+    "Pintura": ["Pintura de fachada exterior"],
+    "Carpintería": ["Carpintería: Reparación de puertas"],
+}
+DISTRICTS = ["San Isidro", "Miraflores", "La Molina", "Surco", "Barranco", "San Borja", "Lince", "Jesús María"]
+ADDRESSES = [
+    "Av. Javier Prado 1234, San Isidro",
+    "Jr. Las Begonias 567, Miraflores",
+    "Av. Larco 123, Miraflores",
+    "Av. Arequipa 890, San Isidro",
+]
+FIRST_NAMES = ["María", "Carlos", "Ana", "Juan", "Luis", "Pedro", "Rosa", "Jorge", "Lucía", "Miguel", "Carmen", "José"]
+LAST_NAMES = ["González", "Ramírez", "Martínez", "Pérez", "Sánchez", "López", "Torres", "Flores", "Díaz", "Rojas"]
+CHAT_LINES = [
+    "Hola, ¿a qué hora puedes venir?",
+    "Puedo llegar en 30 minutos",
+    "Perfecto, te espero",
+    "Ya estoy en camino",
+    "Llegué, estoy en la puerta",
+    "¿Tienes los materiales o los compro?",
+    "Listo, ya terminé",
+    "Muchas gracias por el trabajo",
+]
+COMMENTS = ["Excelente trabajo", "Muy puntual", "Buen servicio", "Todo conforme", "Recomendado", None, None]
+RATING_WEIGHTS = (2, 3, 10, 30, 55)  # 1 a 5 estrellas
+
+STATUS_MIX = {"pending": 0.15, "active": 0.05, "completed": 0.70, "cancelled": 0.10}
+PLAN_DAYS = {"daily": (1, Decimal("2.00")), "weekly": (7, Decimal("12.00"))}
+
+
+def parse_mix(text: str) -> dict:
+    """pending=0.15,active=0.05,... normalizado a suma 1"""
+    mix = dict(STATUS_MIX)
+    for part in filter(None, (item.strip() for item in text.split(","))):
+        name, _, value = part.partition("=")
+        if name not in STATUS_MIX:
+            raise argparse.ArgumentTypeError(f"Estado desconocido en --status-mix: {name}")
+        mix[name] = float(value)
+    total = sum(mix.values())
+    return {name: value / total for name, value in mix.items()}
+
+
+def next_ids(conn, tables) -> dict:
+    from sqlalchemy import func, select
+    return {table.name: (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1 for table in tables}
+
+
+class Generator:
+    """Arma las filas (dicts) de cada tabla con ids asignados localmente"""
+
+    def __init__(self, args, ids: dict, password_hash: str):
+        from app.models.commission import CommissionStatus
+        from app.models.job import JobStatus, PaymentMethod
+        from app.models.subscription import SubscriptionPlan, SubscriptionStatus
+        from app.models.user import UserRole
+        self.JobStatus, self.PaymentMethod, self.UserRole = JobStatus, PaymentMethod, UserRole
+        self.CommissionStatus = CommissionStatus
+        self.SubscriptionPlan, self.SubscriptionStatus = SubscriptionPlan, SubscriptionStatus
+
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.ids = dict(ids)
+        self.password_hash = password_hash
+        self.anchor = args.anchor
+        self.clients = []        # user ids
+        self.workers = []        # (worker_id, user_id)
+        self.free_workers = []   # índices de workers sin trabajo activo
+
+    def take(self, table: str) -> int:
+        value = self.ids[table]
+        self.ids[table] += 1
+        return value
+
+    def ago(self, max_hours: float, min_hours: float = 0.0) -> datetime:
+        return self.anchor - timedelta(seconds=self.rng.uniform(min_hours * 3600, max_hours * 3600))
+
+    def scheduled_at(self, kind: str, created: datetime) -> Optional[datetime]:
+        """30% con fecha programada; la de los pendientes, después de --anchor
+        (el barrido cancela los PENDING con scheduled_at ya pasado)"""
+        if self.rng.random() >= 0.3:
+            return None
+        base = self.anchor if kind == "pending" else created
+        return base + timedelta(hours=self.rng.randint(1, 48))
+
+    def name(self) -> str:
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def user(self, role) -> dict:
+        user_id = self.take("users")
+        created = self.ago(24 * self.args.days, 24)
+        return {
+            "id": user_id,
+            "email": f"{self.args.prefix}{role.value}{user_id}@synthetic.test",
+            "password_hash": self.password_hash,
+            "role": role,
+            "full_name": self.name(),
+            "phone": f"9{self.rng.randrange(10 ** 8):08d}",
+            "created_at": created,
+            "updated_at": created,
+        }
+
+    def people(self) -> dict:
+        """Usuarios, perfiles de trabajador y suscripciones"""
+        rows = {"users": [], "workers": [], "worker_subscriptions": []}
+        manager = self.user(self.UserRole.MANAGER)
+        rows["users"].append(manager)
+        for _ in range(self.args.clients):
+            user = self.user(self.UserRole.CLIENT)
+            rows["users"].append(user)
+            self.clients.append(user["id"])
+
+        for _ in range(self.args.workers):
+            user = self.user(self.UserRole.WORKER)
+            rows["users"].append(user)
+            worker_id = self.take("workers")
+            plus = self.rng.random() < self.args.plus_fraction
+            subscriptions = self.subscriptions(worker_id, plus, user["created_at"])
+            rows["worker_subscriptions"].extend(subscriptions)
+            rows["workers"].append({
+                "id": worker_id,
+                "user_id": user["id"],
+                "full_name": user["full_name"],
+                "phone": user["phone"],
+                "services": self.rng.sample(list(SERVICES), self.rng.randint(1, 3)),
+                "description": "Trabajador con experiencia en el rubro",
+                "district": self.rng.choice(DISTRICTS),
+                "is_available": self.rng.random() < 0.8,
+                "is_verified": self.rng.random() < 0.5,
+                "is_plus_active": plus,
+                "plus_expires_at": subscriptions[-1]["valid_until"] if plus else None,
+                "created_at": user["created_at"],
+                "updated_at": user["created_at"],
+            })
+            self.workers.append((worker_id, user["id"]))
+        self.free_workers = list(range(len(self.workers)))
+        self.rng.shuffle(self.free_workers)
+        return rows
+
+    def subscriptions(self, worker_id: int, plus: bool, since: datetime) -> list:
+        """Historial vencido y, si el trabajador es Plus, la suscripción activa"""
+        rows = []
+        for _ in range(self.rng.randint(0, 2 * self.args.subscriptions_per_worker)):
+            plan = self.rng.choice(list(self.SubscriptionPlan))
+            days, amount = PLAN_DAYS[plan.value]
+            valid_from = self.ago(24 * self.args.days, 24 * (days + 1))
+            rows.append(self.subscription(worker_id, plan, valid_from, self.SubscriptionStatus.EXPIRED))
+        rows.sort(key=lambda row: row["valid_from"])
+        if plus:
+            plan = self.rng.choice(list(self.SubscriptionPlan))
+            days, _ = PLAN_DAYS[plan.value]
+            valid_from = self.ago(24 * days - 1)
+            rows.append(self.subscription(worker_id, plan, valid_from, self.SubscriptionStatus.ACTIVE))
+        return rows
+
+    def subscription(self, worker_id: int, plan, valid_from: datetime, status) -> dict:
+        days, amount = PLAN_DAYS[plan.value]
+        return {
+            "id": self.take("worker_subscriptions"),
+            "worker_id": worker_id,
+            "plan": plan,
+            "days": days,
+            "amount": amount,
+            "status": status,
+            "payment_method": "yape",
+            "payment_code": f"YP{self.rng.randrange(10 ** 8):08d}",
+            "valid_from": valid_from,
+            "valid_until": valid_from + timedelta(days=days),
+            "created_at": valid_from,
+            "updated_at": valid_from,
+        }
+
+    def pick_status(self) -> str:
+        roll = self.rng.random()
+        for name, fraction in self.args.status_mix.items():
+            if roll < fraction:
+                return name
+            roll -= fraction
+        return "completed"
+
+    def jobs(self, count: int) -> dict:
+        """Un bloque de trabajos con sus aplicaciones, mensajes, calificaciones y comisiones"""
+        rows = {"jobs": [], "job_applications": [], "messages": [], "ratings": [], "commissions": []}
+        JobStatus = self.JobStatus
+        active_statuses = (JobStatus.ACCEPTED, JobStatus.IN_ROUTE, JobStatus.ON_SITE, JobStatus.IN_PROGRESS)
+
+        for _ in range(count):
+            kind = self.pick_status()
+            if kind == "active" and not self.free_workers:
+                kind = "completed"  # a lo sumo un trabajo activo por trabajador
+
+            if kind == "pending":
+                status, created = JobStatus.PENDING, self.ago(48)
+            elif kind == "active":
+                status, created = self.rng.choice(active_statuses), self.ago(24)
+            elif kind == "completed":
+                status, created = JobStatus.COMPLETED, self.ago(24 * self.args.days, 24)
+            else:
+                status, created = JobStatus.CANCELLED, self.ago(24 * self.args.days, 24)
+
+            worker_index = None
+            if kind == "active":
+                worker_index = self.free_workers.pop()
+            elif kind == "completed" or (kind == "cancelled" and self.rng.random() < 0.3):
+                worker_index = self.rng.randrange(len(self.workers))
+
+            service_type = self.rng.choice(list(SERVICES))
+            base_fee = Decimal(self.rng.randrange(3000, 30000)) / 100
+            extras = Decimal(self.rng.choice((0, 0, 0, 1000, 2500))) / 100 if kind == "completed" else Decimal("0.00")
+            job_id = self.take("jobs")
+            client_id = self.rng.choice(self.clients)
+            worker_id, worker_user_id = self.workers[worker_index] if worker_index is not None else (None, None)
+            started = created + timedelta(minutes=self.rng.randint(20, 180))
+            completed = started + timedelta(minutes=self.rng.randint(30, 240))
+            rows["jobs"].append({
+                "id": job_id,
+                "client_id": client_id,
+                "worker_id": worker_id,
+                "title": self.rng.choice(SERVICES[service_type]),
+                "description": "Solicitud generada para pruebas de carga",
+                "service_type": service_type,
+                "status": status,
+                "payment_method": self.rng.choice(list(self.PaymentMethod)),
+                "base_fee": base_fee,
+                "extras": extras,
+                "total_amount": base_fee + extras,
+                "address": self.rng.choice(ADDRESSES),
+                "latitude": Decimal(f"{-12.0 - self.rng.random() * 0.2:.8f}"),
+                "longitude": Decimal(f"{-76.9 - self.rng.random() * 0.2:.8f}"),
+                "scheduled_at": self.scheduled_at(kind, created),
+                "started_at": started if status in (JobStatus.IN_PROGRESS, JobStatus.COMPLETED) else None,
+                "completed_at": completed if status == JobStatus.COMPLETED else None,
+                "created_at": created,
+                "updated_at": completed if status == JobStatus.COMPLETED else created,
+            })
+
+            # Aplicaciones: la del trabajador asignado (aceptada) y otras
+            applicants = self.rng.sample(
+                range(len(self.workers)),
+                min(len(self.workers), self.rng.randint(0, 2 * self.args.applications_per_job))
+            )
+            accepted_id = None
+            if worker_index is not None and worker_index not in applicants:
+                applicants.append(worker_index)
+            for index in applicants:
+                application_id = self.take("job_applications")
+                is_accepted = index == worker_index and status != JobStatus.CANCELLED
+                if is_accepted:
+                    accepted_id = application_id
+                applied_at = created + timedelta(minutes=self.rng.randint(1, 60))
+                rows["job_applications"].append({
+                    "id": application_id,
+                    "job_id": job_id,
+                    "worker_id": self.workers[index][0],
+                    "is_accepted": is_accepted,
+                    "created_at": applied_at,
+                    "updated_at": applied_at,
+                })
+
+            # Chat entre cliente y trabajador asignado
+            if accepted_id is not None:
+                sent = created + timedelta(minutes=30)
+                for number in range(self.rng.randint(0, 2 * self.args.messages_per_job)):
+                    sent += timedelta(seconds=self.rng.randint(10, 900))
+                    rows["messages"].append({
+                        "id": self.take("messages"),
+                        "job_id": job_id,
+                        "application_id": accepted_id,
+                        "sender_id": client_id if number % 2 == 0 else worker_user_id,
+                        "content": self.rng.choice(CHAT_LINES),
+                        "has_image": False,
+                        "created_at": sent,
+                    })
+
+            if status == JobStatus.COMPLETED:
+                total = base_fee + extras
+                commission_status = self.rng.choices(
+                    (self.CommissionStatus.APPROVED, self.CommissionStatus.PENDING, self.CommissionStatus.PAYMENT_SUBMITTED),
+                    weights=(80, 15, 5)
+                )[0]
+                rows["commissions"].append({
+                    "id": self.take("commissions"),
+                    "worker_id": worker_id,
+                    "job_id": job_id,
+                    "amount": (total * Decimal("0.10")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+                    "status": commission_status,
+                    "created_at": completed,
+                    "updated_at": completed,
+                })
+                if self.rng.random() < self.args.rating_fraction:
+                    rows["ratings"].append({
+                        "id": self.take("ratings"),
+                        "job_id": job_id,
+                        "client_rating": self.rng.choices(range(1, 6), weights=RATING_WEIGHTS)[0],
+                        "client_comment": self.rng.choice(COMMENTS),
+                        "worker_rating": self.rng.choices(range(1, 6), weights=RATING_WEIGHTS)[0],
+                        "worker_comment": self.rng.choice(COMMENTS),
+                        "created_at": completed + timedelta(minutes=self.rng.randint(5, 600)),
+                    })
+        return rows
+
+
+def insert(conn, tables: dict, rows: dict, batch_size: int, totals: Counter) -> None:
+    """INSERT multi-fila por lotes, en el orden de las claves foráneas"""
+    for name, table_rows in rows.items():
+        for start in range(0, len(table_rows), batch_size):
+            conn.execute(tables[name].insert(), table_rows[start:start + batch_size])
+        totals[name] += len(table_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de datos sintéticos para benchmarks")
+    parser.add_argument("--database-url", help="URL de SQLAlchemy (por defecto la de .env / MYSQL_*)")
+    parser.add_argument("--clients", type=int, default=20000, help="Clientes")
+    parser.add_argument("--workers", type=int, default=5000, help="Trabajadores")
+    parser.add_argument("--jobs", type=int, default=200000, help="Trabajos")
+    parser.add_argument("--applications-per-job", type=int, default=3, help="Aplicaciones promedio por trabajo")
+    parser.add_argument("--messages-per-job", type=int, default=6, help="Mensajes promedio por trabajo con trabajador")
+    parser.add_argument("--subscriptions-per-worker", type=int, default=3, help="Suscripciones vencidas promedio por trabajador")
+    parser.add_argument("--plus-fraction", type=float, default=0.6, help="Fracción de trabajadores con Modo Plus activo")
+    parser.add_argument("--rating-fraction", type=float, default=0.6, help="Fracción de completados con calificación")
+    parser.add_argument("--status-mix", type=parse_mix, default=STATUS_MIX,
+                        help="Fracciones por estado: pending=0.15,active=0.05,completed=0.7,cancelled=0.1")
+    parser.add_argument("--days", type=int, default=365, help="Antigüedad máxima del historial (días)")
+    parser.add_argument("--anchor", type=datetime.fromisoformat, default=None,
+                        help="Fecha de referencia ISO (por defecto, ahora al minuto)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (mismos datos con la misma semilla y --anchor)")
+    parser.add_argument("--prefix", default="synth-", help="Prefijo de los emails")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Filas por INSERT")
+    parser.add_argument("--chunk-jobs", type=int, default=10000, help="Trabajos por transacción")
+    parser.add_argument("--disable-checks", action="store_true",
+                        help="MySQL: desactiva foreign_key_checks y unique_checks durante la carga")
+    parser.add_argument("--skip-reputation", action="store_true", help="No recalcular la reputación al final")
+    args = parser.parse_args()
+    if args.anchor is None:
+        args.anchor = datetime.utcnow().replace(second=0, microsecond=0)
+
+    if args.database_url:
+        url = args.database_url
+        if url.startswith("sqlite:///") and not url.startswith("sqlite:////"):
+            url = "sqlite:///" + os.path.abspath(url[len("sqlite:///"):])
+        os.environ["DATABASE_URL"] = url
+
+    # Import tardío: DATABASE_URL debe estar definido antes de cargar app.config
+    from sqlalchemy import text
+    from app.database import Base, SessionLocal, engine
+    import app.models  # noqa: F401
+    from app.services.rating_service import RatingService
+    from app.utils.security import get_password_hash
+
+    engine.echo = False  # en desarrollo el echo SQL imprimiría cada lote
+    Base.metadata.create_all(bind=engine)
+    tables = {
+        name: Base.metadata.tables[name]
+        for name in ("users", "workers", "worker_subscriptions", "jobs", "job_applications",
+                     "messages", "ratings", "commissions")
+    }
+    mysql = engine.dialect.name == "mysql"
+
+    with engine.connect() as conn:
+        ids = next_ids(conn, tables.values())
+    generator = Generator(args, ids, get_password_hash("password123"))
+    totals: Counter = Counter()
+    started = time.perf_counter()
+
+    def load(rows: dict) -> None:
+        with engine.begin() as conn:
+            if mysql and args.disable_checks:
+                conn.execute(text("SET SESSION foreign_key_checks = 0, unique_checks = 0"))
+            insert(conn, tables, rows, args.batch_size, totals)
+            if mysql and args.disable_checks:
+                conn.execute(text("SET SESSION foreign_key_checks = 1, unique_checks = 1"))
+
+    print(f"[INFO] Generando en {engine.url.render_as_string(hide_password=True)} (semilla {args.seed}, anclaje {args.anchor})")
+    load(generator.people())
+    print(f"[INFO] {totals['users']} usuarios, {totals['workers']} trabajadores, "
+          f"{totals['worker_subscriptions']} suscripciones ({time.perf_counter() - started:.1f}s)")
+
+    done = 0
+    while done < args.jobs:
+        count = min(args.chunk_jobs, args.jobs - done)
+        load(generator.jobs(count))
+        done += count
+        elapsed = time.perf_counter() - started
+        print(f"[INFO] {done}/{args.jobs} trabajos | {sum(totals.values())} filas | "
+              f"{sum(totals.values()) / elapsed:.0f} filas/s")
+
+    if not args.skip_reputation:
+        db = SessionLocal()
+        try:
+            result = RatingService.rebuild_reputation(db)
+            print(f"[INFO] Reputación recalculada: {result['workers']} trabajadores, {result['clients']} clientes")
+        finally:
+            db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n[OK] {sum(totals.values())} filas en {elapsed:.1f}s ({sum(totals.values()) / elapsed:.0f} filas/s)")
+    for name in tables:
+        print(f"   {name:22s} {totals[name]:>10d}")
+
+
+if __name__ == "__main__":
+    main()
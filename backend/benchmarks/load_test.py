@@ -0,0 +1,643 @@
+"""
+Prueba de carga: API HTTP y WebSockets con mezclas realistas de uso
+
+Levanta la app con uvicorn contra la base indicada (MySQL local, o SQLite como
+reemplazo), la puebla con N clientes, trabajadores y trabajos (seed_data.py a
+escala: mismos servicios, distritos y direcciones) y ejecuta los escenarios:
+- feed: trabajadores consultando /available (con If-None-Match, como la app) y
+  clientes consultando /my-jobs
+- apply: tormentas de aplicaciones; un cliente publica un trabajo y
+  --storm-size trabajadores aplican a la vez (luego el cliente lo cancela)
+- transitions: ciclo completo por pareja cliente/trabajador: publicar,
+  aplicar, aceptar, en ruta, en sitio, iniciar y completar
+- chat: --rooms salas con --participants conexiones WebSocket cada una; cada
+  participante envía mensajes y se mide la latencia de entrega a los demás
+- dashboard: --dashboard-sockets usuarios con el WebSocket del dashboard
+  abierto, midiendo ping/pong y contando las notificaciones recibidas
+
+Cada escenario corre --duration segundos (uno tras otro, o todos a la vez con
+--mixed) y se reporta, por operación, cantidad, errores, throughput y latencia
+p50/p95/p99. --output guarda los resultados en JSON y --baseline compara
+contra un JSON anterior.
+
+Los usuarios se crean con prefijo load-<id> y no se eliminan: usar una base
+dedicada. Los tokens se firman localmente con SECRET_KEY (el servidor debe
+usar el mismo .env). SQLite serializa las escrituras: sirve para comparar
+cambios en la misma máquina, no para dimensionar producción.
+
+Requiere httpx, uvicorn y websockets (todos en requirements.txt; websockets
+viene con uvicorn[standard]).
+
+Ejecutar:
+    python benchmarks/load_test.py --database-url sqlite:///./loadtest.db
+    python benchmarks/load_test.py --clients 200 --workers 500 --jobs 5000 --duration 60
+    python benchmarks/load_test.py --scenarios feed,chat --rooms 20 --participants 4 --mixed
+    python benchmarks/load_test.py --output base.json
+    python benchmarks/load_test.py --baseline base.json
+    python benchmarks/load_test.py --base-url http://localhost:8000   # servidor ya levantado
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - viene con uvicorn[standard]
+    websockets = None
+
+SCENARIOS = ("feed", "apply", "transitions", "chat", "dashboard")
+
+# Vocabulario de seed_data.py
+SERVICES = {
+    "Plomería": ["Reparación de grifo en cocina", "Reparación de ducha", "Reparación de tubería rota"],
+    "Electricidad": ["Instalación de interruptores eléctricos", "Instalación de lámparas LED"],
+    "Limpieza": ["Limpieza de casa completa"],
+    "Pintura": ["Pintura de fachada exterior"],
+    "Carpintería": ["Carpintería: Reparación de puertas"],
+}
+DISTRICTS = ["San Isidro", "Miraflores", "La Molina", "Surco", "Barranco"]
+ADDRESSES = [
+    "Av. Javier Prado 1234, San Isidro",
+    "Jr. Las Begonias 567, Miraflores",
+    "Av. Larco 123, Miraflores",
+    "Av. Arequipa 890, San Isidro",
+]
+FIRST_NAMES = ["María", "Carlos", "Ana", "Juan", "Luis", "Pedro", "Rosa", "Jorge", "Lucía", "Miguel"]
+LAST_NAMES = ["González", "Ramírez", "Martínez", "Pérez", "Sánchez", "López", "Torres", "Flores"]
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def job_payload(rng: random.Random) -> dict:
+    """Cuerpo de POST /api/jobs como lo envía la app"""
+    service_type = rng.choice(list(SERVICES))
+    return {
+        "title": rng.choice(SERVICES[service_type]),
+        "description": "Prueba de carga",
+        "service_type": service_type,
+        "payment_method": rng.choice(["cash", "yape"]),
+        "base_fee": str(Decimal(rng.randrange(3000, 20000)) / 100),
+        "address": rng.choice(ADDRESSES),
+        "latitude": str(round(-12.05 - rng.random() * 0.1, 6)),
+        "longitude": str(round(-77.0 - rng.random() * 0.1, 6)),
+    }
+
+
+# ============================================
+# Datos
+# ============================================
+
+class Fixture:
+    """Ids y tokens de los datos sembrados"""
+
+    def __init__(self):
+        self.clients: List[int] = []
+        self.workers: List[int] = []  # user_id de trabajadores
+        self.pairs: List[tuple] = []  # (cliente, trabajador) sin trabajos activos, para transitions
+        self.rooms: List[tuple] = []  # (job_id, application_id, cliente, trabajador)
+        self.tokens: Dict[int, str] = {}
+
+
+def seed(args, rng: random.Random) -> Fixture:
+    """Crea clientes, trabajadores con Modo Plus, trabajos y salas de chat
+
+    Importa la app aquí: DATABASE_URL (--database-url) debe estar definido antes de
+    cargar app.config.
+    """
+    from app.database import Base, SessionLocal, engine
+    import app.models  # noqa: F401
+    from app.models.job import Job, JobStatus, PaymentMethod
+    from app.models.job_application import JobApplication
+    from app.models.user import User, UserRole
+    from app.models.worker import Worker
+    from app.utils.security import create_access_token, get_password_hash
+
+    # Base dedicada a pruebas de carga: crea las tablas que falten (en SQLite, todas)
+    Base.metadata.create_all(bind=engine)
+
+    prefix = f"load-{uuid.uuid4().hex[:8]}"
+    password_hash = get_password_hash("password123")  # un solo hash bcrypt para todos
+    now = datetime.utcnow()
+    fixture = Fixture()
+    db = SessionLocal()
+    try:
+        def person(i: int) -> str:
+            return f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+
+        clients = [
+            User(email=f"{prefix}-cliente{i}@load.test", password_hash=password_hash, role=UserRole.CLIENT,
+                 full_name=person(i), phone=f"9{i:08d}"[:9])
+            for i in range(args.clients)
+        ]
+        worker_users = [
+            User(email=f"{prefix}-trabajador{i}@load.test", password_hash=password_hash, role=UserRole.WORKER,
+                 full_name=person(i + 3), phone=f"8{i:08d}"[:9])
+            for i in range(args.workers)
+        ]
+        db.add_all(clients + worker_users)
+        db.flush()
+
+        workers = [
+            Worker(
+                user_id=user.id, full_name=user.full_name, phone=user.phone,
+                services=json.dumps(rng.sample(list(SERVICES), 2)), district=rng.choice(DISTRICTS),
+                description="Trabajador de prueba de carga", is_available=True,
+                is_plus_active=True, plus_expires_at=now + timedelta(days=30)
+            )
+            for user in worker_users
+        ]
+        db.add_all(workers)
+        db.flush()
+
+        # Trabajadores libres para transitions y salas de chat (un trabajo activo cada uno)
+        lanes = min(args.concurrency, len(clients), len(workers))
+        free = list(range(len(workers)))
+        pair_workers = free[:lanes]
+        room_workers = free[lanes:lanes + args.rooms]
+        busy_pool = free[lanes + args.rooms:] or free
+
+        def job(client: User, status: JobStatus, worker: Optional[Worker] = None) -> Job:
+            data = job_payload(rng)
+            base_fee = Decimal(data["base_fee"])
+            created = now - timedelta(minutes=rng.randrange(1, 60 * 48))
+            return Job(
+                client_id=client.id, worker_id=worker.id if worker else None, status=status,
+                title=data["title"], description=data["description"], service_type=data["service_type"],
+                payment_method=PaymentMethod(data["payment_method"]), base_fee=base_fee,
+                extras=Decimal("0.00"), total_amount=base_fee, address=data["address"],
+                latitude=Decimal(data["latitude"]), longitude=Decimal(data["longitude"]),
+                created_at=created, updated_at=created,
+                completed_at=created + timedelta(hours=2) if status == JobStatus.COMPLETED else None
+            )
+
+        # Historial: 60% pendientes (el feed), 30% completados, 10% cancelados
+        jobs = []
+        for i in range(args.jobs):
+            roll = rng.random()
+            client = clients[i % len(clients)]
+            if roll < 0.6:
+                jobs.append(job(client, JobStatus.PENDING))
+            elif roll < 0.9:
+                jobs.append(job(client, JobStatus.COMPLETED, workers[rng.choice(busy_pool)]))
+            else:
+                jobs.append(job(client, JobStatus.CANCELLED))
+        db.add_all(jobs)
+
+        # Salas de chat: trabajo aceptado con su aplicación aceptada
+        room_jobs = []
+        for index, worker_index in enumerate(room_workers):
+            client = clients[index % len(clients)]
+            room_job = job(client, JobStatus.ACCEPTED, workers[worker_index])
+            room_jobs.append((room_job, client, worker_users[worker_index], workers[worker_index]))
+        db.add_all([room_job for room_job, _, _, _ in room_jobs])
+        db.flush()
+        applications = [
+            JobApplication(job_id=room_job.id, worker_id=worker.id, is_accepted=True)
+            for room_job, _, _, worker in room_jobs
+        ]
+        db.add_all(applications)
+        db.commit()
+
+        fixture.clients = [user.id for user in clients]
+        fixture.workers = [user.id for user in worker_users]
+        fixture.pairs = [(clients[i % len(clients)].id, worker_users[w].id) for i, w in enumerate(pair_workers)]
+        fixture.rooms = [
+            (room_job.id, application.id, client.id, worker_user.id)
+            for (room_job, client, worker_user, _), application in zip(room_jobs, applications)
+        ]
+    finally:
+        db.close()
+
+    expires = timedelta(hours=12)
+    for user_id in fixture.clients + fixture.workers:
+        fixture.tokens[user_id] = create_access_token({"sub": str(user_id)}, expires_delta=expires)
+    print(f"[INFO] Datos {prefix}: {len(fixture.clients)} clientes, {len(fixture.workers)} trabajadores, "
+          f"{args.jobs} trabajos, {len(fixture.rooms)} salas de chat")
+    return fixture
+
+
+# ============================================
+# Medición
+# ============================================
+
+class Recorder:
+    """Latencias y errores por operación de un escenario"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+        self.events: Counter = Counter()
+        self.elapsed = 0.0
+
+    def add(self, operation: str, seconds: float, error: Optional[str] = None) -> None:
+        if error is None:
+            self.latencies[operation].append(seconds)
+        else:
+            self.errors[operation][error] += 1
+
+    def summary(self) -> dict:
+        result = {}
+        for operation in sorted(set(self.latencies) | set(self.errors)):
+            values = self.latencies[operation]
+            errors = sum(self.errors[operation].values())
+            result[operation] = {
+                "count": len(values),
+                "errors": errors,
+                "error_detail": dict(self.errors[operation].most_common(3)),
+                "throughput": len(values) / self.elapsed if self.elapsed else 0.0,
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+            }
+        for event, count in self.events.items():
+            result[event] = {"count": count, "errors": 0, "error_detail": {},
+                             "throughput": count / self.elapsed if self.elapsed else 0.0,
+                             "p50_ms": None, "p95_ms": None, "p99_ms": None}
+        return result
+
+
+class Context:
+    """Todo lo que comparten los escenarios de una ejecución"""
+
+    def __init__(self, args, fixture: Fixture, http: httpx.AsyncClient):
+        self.args = args
+        self.fixture = fixture
+        self.http = http
+        self.ws_url = args.base_url.replace("http", "ws", 1)
+
+    def headers(self, user_id: int) -> dict:
+        return {"Authorization": f"Bearer {self.fixture.tokens[user_id]}"}
+
+    async def call(self, recorder: Recorder, operation: str, method: str, url: str, user_id: int,
+                   expected=(200,), **kwargs) -> Optional[httpx.Response]:
+        headers = {**self.headers(user_id), **kwargs.pop("headers", {})}
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            recorder.add(operation, time.perf_counter() - started, type(e).__name__)
+            return None
+        elapsed = time.perf_counter() - started
+        if response.status_code in expected:
+            recorder.add(operation, elapsed)
+            return response
+        recorder.add(operation, elapsed, str(response.status_code))
+        return None
+
+    async def think(self, rng: random.Random) -> None:
+        if self.args.think_ms:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * self.args.think_ms / 1000)
+
+
+async def ws_connect(url: str, token: str):
+    """Conexión WebSocket con Authorization (API nueva y legacy de websockets)"""
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        return await websockets.connect(url, additional_headers=headers, open_timeout=10)
+    except TypeError:
+        return await websockets.connect(url, extra_headers=headers, open_timeout=10)
+
+
+# ============================================
+# Escenarios
+# ============================================
+
+async def feed_scenario(ctx: Context, recorder: Recorder, deadline: float) -> None:
+    """Polling del feed: 70% trabajadores en /available, 30% clientes en /my-jobs"""
+
+    async def virtual_user(index: int) -> None:
+        rng = random.Random(ctx.args.seed * 1000 + index)
+        etags = {}
+        while time.perf_counter() < deadline:
+            if rng.random() < 0.7:
+                user_id, url, operation = rng.choice(ctx.fixture.workers), "/api/jobs/available", "GET /available"
+            else:
+                user_id, url, operation = rng.choice(ctx.fixture.clients), "/api/jobs/my-jobs", "GET /my-jobs"
+            headers = {"If-None-Match": etags[(user_id, url)]} if (user_id, url) in etags else {}
+            response = await ctx.call(recorder, operation, "GET", url, user_id, expected=(200, 304), headers=headers)
+            if response is not None:
+                if response.status_code == 304:
+                    recorder.events[f"{operation} (304)"] += 1
+                if response.headers.get("etag"):
+                    etags[(user_id, url)] = response.headers["etag"]
+            await ctx.think(rng)
+
+    await asyncio.gather(*(virtual_user(i) for i in range(ctx.args.concurrency)))
+
+
+async def apply_scenario(ctx: Context, recorder: Recorder, deadline: float) -> None:
+    """Tormentas: trabajo nuevo y --storm-size trabajadores aplicando a la vez"""
+    rng = random.Random(ctx.args.seed + 1)
+    storm_size = min(ctx.args.storm_size, len(ctx.fixture.workers))
+    while time.perf_counter() < deadline:
+        client_id = rng.choice(ctx.fixture.clients)
+        response = await ctx.call(recorder, "POST /jobs", "POST", "/api/jobs", client_id,
+                                  expected=(201,), json=job_payload(rng))
+        if response is None:
+            continue
+        job_id = response.json()["id"]
+        storm = rng.sample(ctx.fixture.workers, storm_size)
+        await asyncio.gather(*(
+            ctx.call(recorder, "POST /apply", "POST", f"/api/jobs/{job_id}/apply", worker_id)
+            for worker_id in storm
+        ))
+        await ctx.call(recorder, "POST /cancel", "POST", f"/api/jobs/{job_id}/cancel", client_id)
+
+
+async def transitions_scenario(ctx: Context, recorder: Recorder, deadline: float) -> None:
+    """Ciclo de vida completo de un trabajo por cada pareja cliente/trabajador"""
+
+    async def lane(index: int, client_id: int, worker_id: int) -> None:
+        rng = random.Random(ctx.args.seed * 2000 + index)
+        while time.perf_counter() < deadline:
+            response = await ctx.call(recorder, "POST /jobs", "POST", "/api/jobs", client_id,
+                                      expected=(201,), json=job_payload(rng))
+            if response is None:
+                continue
+            job_id = response.json()["id"]
+            done = await ctx.call(recorder, "POST /apply", "POST", f"/api/jobs/{job_id}/apply", worker_id)
+            applications = done and await ctx.call(
+                recorder, "GET /applications", "GET", f"/api/jobs/{job_id}/applications", client_id)
+            if not applications:
+                await ctx.call(recorder, "POST /cancel", "POST", f"/api/jobs/{job_id}/cancel", client_id)
+                continue
+            application_id = applications.json()[0]["id"]
+            steps = [
+                ("POST /accept-worker", f"/api/jobs/{job_id}/accept-worker/{application_id}", client_id),
+                ("POST /start-route", f"/api/jobs/{job_id}/start-route", worker_id),
+                ("POST /confirm-arrival", f"/api/jobs/{job_id}/confirm-arrival", worker_id),
+                ("POST /start-service", f"/api/jobs/{job_id}/start-service", worker_id),
+                ("POST /complete", f"/api/jobs/{job_id}/complete", worker_id),
+            ]
+            for operation, url, user_id in steps:
+                if await ctx.call(recorder, operation, "POST", url, user_id) is None:
+                    # Liberar al trabajador para la siguiente vuelta
+                    await ctx.call(recorder, "POST /cancel", "POST", f"/api/jobs/{job_id}/cancel", client_id)
+                    break
+            else:
+                recorder.events["trabajos completados"] += 1
+            await ctx.think(rng)
+
+    await asyncio.gather(*(lane(i, client, worker) for i, (client, worker) in enumerate(ctx.fixture.pairs)))
+
+
+async def chat_scenario(ctx: Context, recorder: Recorder, deadline: float) -> None:
+    """Salas con --participants conexiones; latencia de entrega de cada mensaje a los demás"""
+    interval = ctx.args.message_interval_ms / 1000
+
+    async def participant(room: tuple, number: int) -> None:
+        job_id, application_id, client_id, worker_id = room
+        user_id = client_id if number % 2 == 0 else worker_id
+        url = f"{ctx.ws_url}/api/chat/ws/{job_id}?application_id={application_id}"
+        started = time.perf_counter()
+        try:
+            connection = await ws_connect(url, ctx.fixture.tokens[user_id])
+            await connection.recv()  # {"type": "connected"}
+        except Exception as e:
+            recorder.add("WS chat connect", time.perf_counter() - started, type(e).__name__)
+            return
+        recorder.add("WS chat connect", time.perf_counter() - started)
+        me = f"{job_id}-{number}"
+
+        async def receive() -> None:
+            async for raw in connection:
+                message = json.loads(raw)
+                if message.get("type") != "message":
+                    continue
+                parts = str(message.get("data", {}).get("content", "")).split("|")
+                if len(parts) == 3 and parts[0] == "lt" and parts[1] != me:
+                    recorder.add("WS chat entrega", time.perf_counter() - float(parts[2]))
+
+        receiver = asyncio.create_task(receive())
+        rng = random.Random(ctx.args.seed * 3000 + job_id * 10 + number)
+        try:
+            await asyncio.sleep(rng.uniform(0, interval))
+            while time.perf_counter() < deadline:
+                await connection.send(json.dumps({"content": f"lt|{me}|{time.perf_counter()!r}"}))
+                recorder.events["WS chat mensajes enviados"] += 1
+                await asyncio.sleep(interval)
+            await asyncio.sleep(min(1.0, interval))  # últimas entregas
+        except Exception as e:
+            recorder.add("WS chat send", 0.0, type(e).__name__)
+        finally:
+            receiver.cancel()
+            await connection.close()
+
+    await asyncio.gather(*(
+        participant(room, number)
+        for room in ctx.fixture.rooms
+        for number in range(ctx.args.participants)
+    ))
+
+
+async def dashboard_scenario(ctx: Context, recorder: Recorder, deadline: float) -> None:
+    """Dashboards abiertos: ping/pong y notificaciones recibidas"""
+    interval = ctx.args.ping_interval_ms / 1000
+    users = (ctx.fixture.clients + ctx.fixture.workers)[:ctx.args.dashboard_sockets]
+
+    async def dashboard(user_id: int) -> None:
+        started = time.perf_counter()
+        try:
+            connection = await ws_connect(f"{ctx.ws_url}/api/notifications/ws/dashboard", ctx.fixture.tokens[user_id])
+            await connection.recv()  # {"type": "connected"}
+        except Exception as e:
+            recorder.add("WS dashboard connect", time.perf_counter() - started, type(e).__name__)
+            return
+        recorder.add("WS dashboard connect", time.perf_counter() - started)
+        pending: List[float] = []
+
+        async def receive() -> None:
+            async for raw in connection:
+                message = json.loads(raw)
+                if message.get("type") == "pong" and pending:
+                    recorder.add("WS dashboard ping", time.perf_counter() - pending.pop(0))
+                else:
+                    recorder.events["WS dashboard notificaciones"] += 1
+
+        receiver = asyncio.create_task(receive())
+        rng = random.Random(ctx.args.seed * 4000 + user_id)
+        try:
+            await asyncio.sleep(rng.uniform(0, interval))
+            while time.perf_counter() < deadline:
+                pending.append(time.perf_counter())
+                await connection.send("ping")
+                await asyncio.sleep(interval)
+        except Exception as e:
+            recorder.add("WS dashboard ping", 0.0, type(e).__name__)
+        finally:
+            receiver.cancel()
+            await connection.close()
+
+    await asyncio.gather(*(dashboard(user_id) for user_id in users))
+
+
+SCENARIO_FUNCTIONS = {
+    "feed": feed_scenario,
+    "apply": apply_scenario,
+    "transitions": transitions_scenario,
+    "chat": chat_scenario,
+    "dashboard": dashboard_scenario,
+}
+
+
+async def run_scenarios(args, fixture: Fixture, names: List[str]) -> List[Recorder]:
+    limits = httpx.Limits(max_connections=args.concurrency + args.storm_size + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as http:
+        ctx = Context(args, fixture, http)
+
+        async def run_one(name: str) -> Recorder:
+            recorder = Recorder(name)
+            started = time.perf_counter()
+            await SCENARIO_FUNCTIONS[name](ctx, recorder, started + args.duration)
+            recorder.elapsed = time.perf_counter() - started
+            return recorder
+
+        if args.mixed:
+            print(f"[INFO] Mezcla simultánea: {', '.join(names)} durante {args.duration}s")
+            return list(await asyncio.gather(*(run_one(name) for name in names)))
+        recorders = []
+        for name in names:
+            print(f"[INFO] Escenario {name} durante {args.duration}s")
+            recorders.append(await run_one(name))
+        return recorders
+
+
+# ============================================
+# Servidor y reporte
+# ============================================
+
+def boot_server(args) -> subprocess.Popen:
+    """uvicorn app.main:app con la misma base y SECRET_KEY que este proceso"""
+    env = os.environ.copy()
+    env["ENVIRONMENT"] = args.environment
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.server_workers), "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"[ERROR] uvicorn terminó con código {process.returncode}")
+        try:
+            if httpx.get(f"{args.base_url}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    process.terminate()
+    raise SystemExit("[ERROR] El servidor no respondió /health en 30s")
+
+
+def report(recorders: List[Recorder], baseline: Optional[dict]) -> dict:
+    results = {}
+    for recorder in recorders:
+        summary = recorder.summary()
+        results[recorder.name] = summary
+        print(f"\nEscenario {recorder.name} ({recorder.elapsed:.1f}s)")
+        print(f"   {'operación':28s} {'n':>7s} {'err':>5s} {'ops/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+        for operation, row in summary.items():
+            if row["p50_ms"] is None:
+                print(f"   {operation:28s} {row['count']:7d} {'':5s} {row['throughput']:8.1f}")
+                continue
+            line = (f"   {operation:28s} {row['count']:7d} {row['errors']:5d} {row['throughput']:8.1f} "
+                    f"{row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f}")
+            before = (baseline or {}).get("scenarios", {}).get(recorder.name, {}).get(operation)
+            if before and before.get("p95_ms") and before.get("throughput"):
+                line += (f"   | p95 {(row['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%"
+                         f" ops/s {(row['throughput'] / before['throughput'] - 1) * 100:+.0f}%")
+            print(line)
+            if row["error_detail"]:
+                print(f"   {'':28s} errores: {row['error_detail']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API y los WebSockets")
+    parser.add_argument("--database-url", help="URL de SQLAlchemy (por defecto la de .env / MYSQL_*)")
+    parser.add_argument("--base-url", help="Servidor ya levantado (si no, se levanta uvicorn)")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto del uvicorn levantado")
+    parser.add_argument("--server-workers", type=int, default=1, help="Procesos de uvicorn")
+    parser.add_argument("--environment", default="loadtest", help="ENVIRONMENT del servidor (development activa echo SQL)")
+    parser.add_argument("--clients", type=int, default=50, help="Clientes a crear")
+    parser.add_argument("--workers", type=int, default=200, help="Trabajadores a crear")
+    parser.add_argument("--jobs", type=int, default=1000, help="Trabajos de historial a crear")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Escenarios: {','.join(SCENARIOS)}")
+    parser.add_argument("--mixed", action="store_true", help="Ejecutar los escenarios a la vez")
+    parser.add_argument("--duration", type=float, default=20, help="Segundos por escenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Usuarios virtuales (feed) y parejas (transitions)")
+    parser.add_argument("--think-ms", type=float, default=0, help="Pausa media entre requests de un usuario")
+    parser.add_argument("--storm-size", type=int, default=50, help="Trabajadores por tormenta de aplicaciones")
+    parser.add_argument("--rooms", type=int, default=10, help="Salas de chat")
+    parser.add_argument("--participants", type=int, default=4, help="Conexiones por sala de chat")
+    parser.add_argument("--message-interval-ms", type=float, default=500, help="Intervalo entre mensajes de un participante")
+    parser.add_argument("--dashboard-sockets", type=int, default=100, help="Dashboards abiertos")
+    parser.add_argument("--ping-interval-ms", type=float, default=1000, help="Intervalo de ping del dashboard")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos y de los usuarios virtuales")
+    parser.add_argument("--output", help="Guardar resultados en este JSON")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Escenarios desconocidos: {', '.join(sorted(unknown))}")
+    if websockets is None and {"chat", "dashboard"} & set(names):
+        print("[WARN] websockets no está instalado: se omiten chat y dashboard")
+        names = [name for name in names if name not in ("chat", "dashboard")]
+
+    if args.database_url:
+        url = args.database_url
+        if url.startswith("sqlite:///") and not url.startswith("sqlite:////"):
+            url = "sqlite:///" + os.path.abspath(url[len("sqlite:///"):])
+        os.environ["DATABASE_URL"] = url
+
+    fixture = seed(args, random.Random(args.seed))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    process = None
+    if not args.base_url:
+        args.base_url = f"http://127.0.0.1:{args.port}"
+        process = boot_server(args)
+    try:
+        recorders = asyncio.run(run_scenarios(args, fixture, names))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    results = report(recorders, baseline)
+    if args.output:
+        config = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "scenarios": results}, f, indent=2, ensure_ascii=False)
+        print(f"\n[OK] Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
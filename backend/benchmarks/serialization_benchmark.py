@@ -0,0 +1,135 @@
+"""
+Benchmark: costo de serialización por elemento de los endpoints de listas
+
+Compara, para listas de trabajos, trabajadores y mensajes:
+- pydantic: el camino de FastAPI con response_model (validación from_attributes
+  -> modo JSON -> jsonable_encoder -> json.dumps)
+- fast: app/utils/fast_json (dict por fila -> orjson)
+
+Trabaja con entidades ORM en memoria (sin BD), así que mide solo la
+serialización. Verifica además que ambos caminos produzcan exactamente los
+mismos bytes.
+
+Ejecutar:
+    python benchmarks/serialization_benchmark.py
+    python benchmarks/serialization_benchmark.py --items 500 --repeat 50
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.models.job import Job, JobStatus, PaymentMethod
+from app.models.message import Message
+from app.models.user import User, UserRole
+from app.models.worker import Worker
+from app.schemas.job import JobResponse
+from app.schemas.message import MessageResponse
+from app.schemas.worker import WorkerResponse
+from app.utils import fast_json
+
+
+def build_fixture(items: int):
+    """Entidades ORM transitorias con las relaciones que embebe cada respuesta"""
+    now = datetime(2026, 10, 19, 12, 30, 15, 123456)
+    client = User(
+        id=1, email="cliente@bench.test", role=UserRole.CLIENT,
+        full_name="Cliente Benchmark", phone="999888777"
+    )
+    workers = [
+        Worker(
+            id=i + 1, user_id=i + 100, full_name=f"Trabajador {i}", phone="987654321",
+            services=["Plomería", "Electricidad"], description="Diez años de experiencia",
+            district="Miraflores", is_available=True, is_verified=i % 2 == 0,
+            is_plus_active=True, plus_expires_at=now + timedelta(days=30),
+            reputation_count=12, reputation_avg=Decimal("4.75"), reputation_score=Decimal("4.42"),
+            created_at=now, updated_at=now
+        )
+        for i in range(items)
+    ]
+    jobs = [
+        Job(
+            id=i + 1, client_id=client.id, worker_id=workers[i].id, client=client, worker=workers[i],
+            title=f"Reparar caño {i}", description="Fuga en la cocina, urgente",
+            service_type="Plomería", payment_method=PaymentMethod.CASH,
+            base_fee=Decimal("80.00"), extras=Decimal("15.50"), total_amount=Decimal("95.50"),
+            address="Av. Larco 123", latitude=Decimal("-12.12345678"), longitude=Decimal("-77.03012345"),
+            status=JobStatus.IN_PROGRESS, scheduled_at=now, started_at=now,
+            created_at=now, updated_at=now
+        )
+        for i in range(items)
+    ]
+    messages = [
+        Message(
+            id=i + 1, job_id=1, sender_id=client.id, sender=client,
+            content=f"Mensaje número {i} ¿llegas a las 3?", has_image=False,
+            created_at=now + timedelta(seconds=i)
+        )
+        for i in range(items)
+    ]
+    return jobs, workers, messages
+
+
+def pydantic_path(adapter: TypeAdapter, objects) -> bytes:
+    """Lo que hace FastAPI con response_model=List[...]"""
+    validated = adapter.validate_python(objects, from_attributes=True)
+    content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return JSONResponse(content).body
+
+
+def fast_path(build, objects) -> bytes:
+    return fast_json.FastJSONResponse([build(obj) for obj in objects]).body
+
+
+def measure(func, repeat: int) -> float:
+    """Mejor tiempo de repeat ejecuciones (segundos)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listas")
+    parser.add_argument("--items", type=int, default=100, help="Elementos por lista")
+    parser.add_argument("--repeat", type=int, default=30, help="Repeticiones (se reporta la mejor)")
+    args = parser.parse_args()
+
+    jobs, workers, messages = build_fixture(args.items)
+    cases = [
+        ("JobResponse", TypeAdapter(List[JobResponse]), fast_json.job_row, jobs),
+        ("WorkerResponse", TypeAdapter(List[WorkerResponse]), fast_json.worker_row, workers),
+        ("MessageResponse", TypeAdapter(List[MessageResponse]), fast_json.message_row, messages),
+    ]
+
+    encoder = "orjson" if fast_json.orjson is not None else "json (orjson no instalado)"
+    print(f"\n{args.items} elementos por lista, mejor de {args.repeat} | codificador rápido: {encoder}")
+    failed = False
+    for name, adapter, build, objects in cases:
+        slow_body = pydantic_path(adapter, objects)
+        fast_body = fast_path(build, objects)
+        same = slow_body == fast_body
+        failed = failed or not same
+
+        slow = measure(lambda: pydantic_path(adapter, objects), args.repeat)
+        fast = measure(lambda: fast_path(build, objects), args.repeat)
+        print(f"   {name:16s} pydantic {slow / args.items * 1e6:7.1f} µs/elem | "
+              f"fast {fast / args.items * 1e6:7.1f} µs/elem | "
+              f"x{slow / fast:4.1f} | {len(fast_body) / args.items:.0f} B/elem | "
+              f"{'[OK] mismos bytes' if same else '[ERROR] salida distinta'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+-- =====================================================
+-- Migración: Un solo trabajo activo por trabajador
+-- Fecha: 2026-10-19
+-- Descripción: Agrega la columna generada jobs.active_worker_id (worker_id
+--              mientras el trabajo está ACCEPTED/IN_ROUTE/ON_SITE/IN_PROGRESS,
+--              NULL en otro caso) con un índice UNIQUE. Así la BD garantiza
+--              que dos aceptaciones concurrentes no asignen dos trabajos
+--              activos al mismo trabajador.
+-- NOTA: Enum(JobStatus) guarda el nombre del estado ('ACCEPTED'), no el valor.
+-- =====================================================
+
+-- 1. Verificar que no haya trabajadores con más de un trabajo activo
+--    (si devuelve filas, resolverlas antes de crear el índice)
+SELECT worker_id, COUNT(*) AS active_jobs
+FROM jobs
+WHERE worker_id IS NOT NULL
+  AND status IN ('ACCEPTED', 'IN_ROUTE', 'ON_SITE', 'IN_PROGRESS')
+GROUP BY worker_id
+HAVING COUNT(*) > 1;
+
+-- 2. Columna generada (VIRTUAL: worker_id tiene FK con ON DELETE SET NULL)
+ALTER TABLE jobs
+    ADD COLUMN active_worker_id INT
+        GENERATED ALWAYS AS (
+            CASE WHEN status IN ('ACCEPTED', 'IN_ROUTE', 'ON_SITE', 'IN_PROGRESS') THEN worker_id END
+        ) VIRTUAL;
+
+-- 3. Índice único (los NULL no compiten entre sí)
+CREATE UNIQUE INDEX uq_jobs_active_worker ON jobs (active_worker_id);
@@ -0,0 +1,29 @@
+-- =====================================================
+-- Migración: Agregados de reputación precalculados
+-- Fecha: 2026-10-19
+-- Descripción: Agrega a workers (reputación como trabajador) y a users
+--              (reputación como cliente) la cantidad, suma, promedio y score
+--              bayesiano de las calificaciones recibidas. RatingService los
+--              mantiene incrementalmente al calificar.
+-- =====================================================
+
+-- 1. Columnas en workers (calificaciones de clientes: ratings.client_rating)
+ALTER TABLE workers
+    ADD COLUMN reputation_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN reputation_sum INT NOT NULL DEFAULT 0,
+    ADD COLUMN reputation_avg DECIMAL(3, 2) NULL,
+    ADD COLUMN reputation_score DECIMAL(4, 3) NOT NULL DEFAULT 3.5;
+
+-- Índice para /api/workers/search/list?sort=rating
+CREATE INDEX ix_workers_reputation_score_id ON workers (reputation_score, id);
+
+-- 2. Columnas en users (calificaciones de trabajadores: ratings.worker_rating)
+ALTER TABLE users
+    ADD COLUMN reputation_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN reputation_sum INT NOT NULL DEFAULT 0,
+    ADD COLUMN reputation_avg DECIMAL(3, 2) NULL,
+    ADD COLUMN reputation_score DECIMAL(4, 3) NOT NULL DEFAULT 3.5;
+
+-- 3. Backfill: después de aplicar esta migración ejecutar
+--    python rebuild_reputation.py
+-- (el DEFAULT 3.5 debe coincidir con REPUTATION_PRIOR_MEAN en config.py)
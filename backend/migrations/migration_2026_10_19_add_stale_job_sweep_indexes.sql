@@ -0,0 +1,10 @@
+-- =====================================================
+-- Migración: Índices para el barrido de trabajos PENDING vencidos
+-- Fecha: 2026-10-19
+-- Descripción: El barrido periódico busca trabajos PENDING creados antes de
+--              un límite o con scheduled_at ya pasado. Sin estos índices cada
+--              ejecución recorre la tabla jobs completa.
+-- =====================================================
+
+CREATE INDEX ix_jobs_status_created_at ON jobs (status, created_at);
+CREATE INDEX ix_jobs_status_scheduled_at ON jobs (status, scheduled_at);
@@ -0,0 +1,11 @@
+-- =====================================================
+-- Migración: Contador de versión de datos por usuario
+-- Fecha: 2026-10-19
+-- Descripción: Agrega users.data_version. Los servicios lo incrementan cuando
+--              cambian los trabajos, aplicaciones, suscripción o comisiones
+--              de un usuario; los endpoints de polling lo usan para calcular
+--              ETags y responder 304 Not Modified.
+-- =====================================================
+
+ALTER TABLE users
+    ADD COLUMN data_version INT NOT NULL DEFAULT 0;
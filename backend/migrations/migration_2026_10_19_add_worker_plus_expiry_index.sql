@@ -0,0 +1,20 @@
+-- =====================================================
+-- Migración: Índice para el vencimiento del Modo Plus
+-- Fecha: 2026-10-19
+-- Descripción: La tarea de expiración carga periódicamente los trabajadores
+--              con Modo Plus activo que vencen en el próximo intervalo
+--              (is_plus_active = 1 AND plus_expires_at <= :limite).
+--              Además, marca como EXPIRED las suscripciones vencidas, que
+--              hasta ahora quedaban en ACTIVE para siempre.
+-- =====================================================
+
+CREATE INDEX ix_workers_plus_active_expires_at ON workers (is_plus_active, plus_expires_at);
+
+-- Poner al día los datos existentes (la tarea lo hace en adelante)
+UPDATE workers
+SET is_plus_active = 0
+WHERE is_plus_active = 1 AND plus_expires_at IS NOT NULL AND plus_expires_at <= UTC_TIMESTAMP();
+
+UPDATE worker_subscriptions
+SET status = 'EXPIRED'
+WHERE status = 'ACTIVE' AND valid_until <= UTC_TIMESTAMP();
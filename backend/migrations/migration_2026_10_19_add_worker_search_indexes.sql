@@ -0,0 +1,14 @@
+-- =====================================================
+-- Migración: Índices para la búsqueda paginada de trabajadores
+-- Fecha: 2026-10-19
+-- Descripción: /api/workers/search/list ahora pagina por cursor ordenando por
+--              (is_verified DESC, id DESC). Estos índices permiten resolver el
+--              ORDER BY + LIMIT recorriendo el índice, sin filesort ni full scan.
+-- =====================================================
+
+CREATE INDEX ix_workers_verified_id ON workers (is_verified, id);
+CREATE INDEX ix_workers_available_verified_id ON workers (is_available, is_verified, id);
+
+-- Verificación (opcional):
+-- SHOW INDEX FROM workers;
+-- EXPLAIN SELECT * FROM workers ORDER BY is_verified DESC, id DESC LIMIT 21;
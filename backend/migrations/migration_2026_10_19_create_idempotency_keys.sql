@@ -0,0 +1,23 @@
+-- =====================================================
+-- Migración: Claves de idempotencia para reintentos de la app móvil
+-- Fecha: 2026-10-19
+-- Descripción: Crea idempotency_keys. POST /api/jobs, /apply, /chat/{id}/send
+--              y /subscriptions/subscribe aceptan el header Idempotency-Key;
+--              un reintento con la misma clave recibe la respuesta guardada
+--              sin volver a ejecutar la operación. Una tarea del scheduler
+--              borra las claves vencidas (expires_at).
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    `key` VARCHAR(100) NOT NULL,
+    request_hash CHAR(64) NOT NULL,
+    response_status INT NULL,
+    response_body MEDIUMTEXT NULL,
+    content_type VARCHAR(100) NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    UNIQUE KEY uq_idempotency_user_key (user_id, `key`),
+    INDEX ix_idempotency_keys_expires_at (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,21 @@
+-- =====================================================
+-- Migración: Outbox transaccional de notificaciones
+-- Fecha: 2026-10-19
+-- Descripción: Crea outbox_events. Los servicios insertan aquí, en la misma
+--              transacción que el cambio (mensaje, estado del trabajo), las
+--              notificaciones en tiempo real. Cada proceso las lee en lotes y
+--              las entrega a sus propias conexiones WebSocket; una tarea del
+--              scheduler borra las que superan la retención.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS outbox_events (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,
+    user_id INT NULL,
+    job_id INT NULL,
+    application_id INT NULL,
+    payload JSON NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_outbox_events_user_id_id (user_id, id),
+    INDEX ix_outbox_events_created_at (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
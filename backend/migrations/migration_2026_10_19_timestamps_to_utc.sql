@@ -0,0 +1,56 @@
+-- =====================================================
+-- Migración: created_at / updated_at en UTC
+-- Fecha: 2026-10-19
+-- Descripción: Hasta ahora created_at/updated_at los llenaba MySQL con NOW()
+--              (hora local de la sesión), mientras que started_at,
+--              completed_at, plus_expires_at, valid_from/valid_until,
+--              expires_at y los límites del barrido de vencidos usan
+--              datetime.utcnow(). Desde esta versión todo se guarda en UTC:
+--              los modelos generan los timestamps con utcnow y cada conexión
+--              de la app fija time_zone = '+00:00' (app/database.py), así que
+--              NOW() también devuelve UTC.
+--              Esta migración convierte los valores escritos con la hora local
+--              (outbox_events e idempotency_keys son nuevas: ya nacen en UTC).
+--
+-- Aplicar UNA sola vez, con la app detenida y ANTES de desplegar la versión
+-- nueva (las filas escritas después ya están en UTC y no deben convertirse).
+--
+-- @source_tz: zona con la que el servidor resolvía NOW(). Verificar con
+--   SELECT @@global.time_zone, @@system_time_zone;
+-- Si ya era UTC ('+00:00' / 'UTC'), no hay nada que convertir: no aplicar.
+-- =====================================================
+
+SET @source_tz = '-05:00';  -- America/Lima (sin horario de verano)
+
+START TRANSACTION;
+
+UPDATE users SET
+    created_at = CONVERT_TZ(created_at, @source_tz, '+00:00'),
+    updated_at = CONVERT_TZ(updated_at, @source_tz, '+00:00');
+
+UPDATE workers SET
+    created_at = CONVERT_TZ(created_at, @source_tz, '+00:00'),
+    updated_at = CONVERT_TZ(updated_at, @source_tz, '+00:00');
+
+UPDATE jobs SET
+    created_at = CONVERT_TZ(created_at, @source_tz, '+00:00'),
+    updated_at = CONVERT_TZ(updated_at, @source_tz, '+00:00');
+
+UPDATE job_applications SET
+    created_at = CONVERT_TZ(created_at, @source_tz, '+00:00'),
+    updated_at = CONVERT_TZ(updated_at, @source_tz, '+00:00');
+
+UPDATE commissions SET
+    created_at = CONVERT_TZ(created_at, @source_tz, '+00:00'),
+    updated_at = CONVERT_TZ(updated_at, @source_tz, '+00:00');
+
+UPDATE worker_subscriptions SET
+    created_at = CONVERT_TZ(created_at, @source_tz, '+00:00'),
+    updated_at = CONVERT_TZ(updated_at, @source_tz, '+00:00');
+
+UPDATE messages SET created_at = CONVERT_TZ(created_at, @source_tz, '+00:00');
+UPDATE ratings SET created_at = CONVERT_TZ(created_at, @source_tz, '+00:00');
+UPDATE job_evidence SET created_at = CONVERT_TZ(created_at, @source_tz, '+00:00');
+UPDATE job_notes SET created_at = CONVERT_TZ(created_at, @source_tz, '+00:00');
+
+COMMIT;
@@ -0,0 +1,35 @@
+"""
+Script para recalcular los agregados de reputación de trabajadores y clientes
+(reputation_count, reputation_sum, reputation_avg, reputation_score)
+a partir de la tabla ratings. Usar después de aplicar la migración
+migration_2026_10_19_add_reputation_aggregates.sql (backfill) o si se sospecha
+que los agregados quedaron desincronizados.
+Ejecutar: python rebuild_reputation.py
+"""
+from app.database import SessionLocal
+from app.services.rating_service import RatingService
+
+
+def rebuild_reputation():
+    """Recalcula la reputación de todos los trabajadores y clientes"""
+    db = SessionLocal()
+    
+    try:
+        print("🔧 Recalculando agregados de reputación...")
+        
+        result = RatingService.rebuild_reputation(db)
+        
+        print(f"\n✅ Reputación recalculada")
+        print(f"   - Trabajadores con calificaciones: {result['workers']}")
+        print(f"   - Clientes con calificaciones: {result['clients']}")
+        
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_reputation()
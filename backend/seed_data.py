@@ -342,9 +342,10 @@ def seed_data():
         )
         
         # Trabajo IN_ROUTE (trabajador en camino)
+        # Cada trabajador tiene como máximo un trabajo activo (ver Job.active_worker_id)
         job3 = Job(
             client_id=client1.id,
-            worker_id=worker1.id,
+            worker_id=worker3.id,
             title="Reparación de tubería rota",
             description="Tubería principal rota en el baño, hay fuga de agua.",
             service_type="Plomería",
@@ -375,14 +376,15 @@ def seed_data():
             longitude=Decimal("-77.0304")
         )
         
-        # Trabajo IN_PROGRESS (en progreso)
+        # Trabajo COMPLETED con comisión en revisión
+        # (worker2 ya tiene job4 activo: un solo trabajo activo por trabajador)
         job5 = Job(
             client_id=client2.id,
             worker_id=worker2.id,
             title="Pintura de sala y comedor",
             description="Pintar sala y comedor, 2 capas, color beige.",
             service_type="Pintura",
-            status=JobStatus.IN_PROGRESS,
+            status=JobStatus.COMPLETED,
             payment_method=PaymentMethod.YAPE,
             base_fee=Decimal("300.00"),
             extras=Decimal("50.00"),  # Extra por materiales adicionales
@@ -390,7 +392,8 @@ def seed_data():
             address="Jr. Las Begonias 567, Miraflores",
             latitude=Decimal("-12.1183"),
             longitude=Decimal("-77.0304"),
-            started_at=datetime.now() - timedelta(hours=2)
+            started_at=datetime.now() - timedelta(hours=5),
+            completed_at=datetime.now() - timedelta(hours=2)
         )
         
         # Trabajo COMPLETED (completado)
@@ -461,10 +464,10 @@ def seed_data():
             is_accepted=True
         )
         
-        # job3 (IN_ROUTE) - worker1
+        # job3 (IN_ROUTE) - worker3
         application2 = JobApplication(
             job_id=job3.id,
-            worker_id=worker1.id,
+            worker_id=worker3.id,
             is_accepted=True
         )
         
@@ -475,7 +478,7 @@ def seed_data():
             is_accepted=True
         )
         
-        # job5 (IN_PROGRESS) - worker2
+        # job5 (COMPLETED) - worker2
         application4 = JobApplication(
             job_id=job5.id,
             worker_id=worker2.id,
@@ -574,7 +577,7 @@ def seed_data():
         message4 = Message(
             job_id=job3.id,
             application_id=application2.id,
-            sender_id=worker_user1.id,
+            sender_id=worker_user3.id,
             content="Ya estoy en camino, llegaré en 15 minutos.",
             created_at=datetime.now() - timedelta(minutes=20)
         )
@@ -0,0 +1,81 @@
+"""
+Aceptación de trabajadores: a lo sumo un trabajo activo por trabajador
+
+Las rondas concurrentes (accept_stress) solo corren contra MySQL; la
+violación de uq_jobs_active_worker también se prueba sobre SQLite.
+"""
+import random
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+import accept_stress
+from app.models.job import Job, JobStatus
+from app.services.job_service import JobService
+
+
+def _accept_violation(session_factory):
+    """Un trabajador aceptado en un trabajo no puede quedar activo en otro"""
+    db = session_factory()
+    prefix = f"test-accept-{uuid.uuid4().hex[:8]}"
+    client_id, worker_user_ids, job_ids, attempts = accept_stress.create_fixture(db, prefix, jobs=2, workers=1)
+    try:
+        (first_job, first_application), (second_job, second_application) = sorted(attempts)
+        accepted = JobService.client_accept_worker(db, first_job, first_application, client_id)
+        assert accepted.status == JobStatus.ACCEPTED
+
+        # Camino del servicio: el IntegrityError del índice se traduce en 400
+        with pytest.raises(HTTPException) as error:
+            JobService.client_accept_worker(db, second_job, second_application, client_id)
+        assert error.value.status_code == 400
+        assert error.value.detail == "Este trabajador ya tiene un trabajo activo"
+
+        # El índice único por sí solo rechaza un segundo trabajo activo
+        with pytest.raises(IntegrityError):
+            db.execute(
+                update(Job)
+                .where(Job.id == second_job)
+                .values(worker_id=accepted.worker_id, status=JobStatus.IN_PROGRESS)
+            )
+            db.flush()
+        db.rollback()
+
+        db.expire_all()
+        assert accept_stress.check_invariants(db, client_id, job_ids, accepted=1) == []
+    finally:
+        db.rollback()
+        accept_stress.cleanup(db, client_id, worker_user_ids)
+        db.close()
+
+
+def test_unique_active_worker_violation_sqlite(db_session):
+    from app.database import SessionLocal
+    _accept_violation(SessionLocal)
+
+
+def test_unique_active_worker_violation_mysql(mysql_sessions):
+    _accept_violation(mysql_sessions)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_concurrent_accepts_keep_invariants_mysql(mysql_sessions, seed):
+    jobs, workers = 10, 5
+    db = mysql_sessions()
+    prefix = f"test-accept-{uuid.uuid4().hex[:8]}"
+    client_id, worker_user_ids, job_ids, attempts = accept_stress.create_fixture(db, prefix, jobs, workers)
+    try:
+        random.Random(seed).shuffle(attempts)
+        outcomes = accept_stress.run_round(client_id, attempts, threads=16)
+
+        accepted = outcomes["accepted"]
+        # Cada trabajador aplicó a todos los trabajos: se llenan todos los trabajadores
+        assert accepted == min(jobs, workers), outcomes
+        assert not [result for result in outcomes if result.startswith("500")], outcomes
+        db.expire_all()
+        assert accept_stress.check_invariants(db, client_id, job_ids, accepted) == []
+    finally:
+        accept_stress.cleanup(db, client_id, worker_user_ids)
+        db.close()
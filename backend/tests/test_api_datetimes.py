@@ -0,0 +1,45 @@
+"""
+Fechas de la API en UTC con zona explícita
+
+Las columnas guardan UTC sin zona; hacia afuera viajan con "Z" (por el camino
+rápido y por el de los schemas) y las fechas que llegan con zona se guardan
+convertidas a UTC.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.config import settings
+from app.models.job import Job
+from app.models.user import User, UserRole
+from conftest import auth
+
+
+@pytest.fixture
+def client_id(db_session):
+    user = User(email="client@test.test", password_hash="x", role=UserRole.CLIENT, full_name="Cliente", phone="911")
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+@pytest.mark.parametrize("fast_json", [True, False], ids=["fast-json", "response-model"])
+def test_job_dates_are_utc_with_zone(client, db_session, client_id, monkeypatch, fast_json):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast_json)
+    response = client.post("/api/jobs", headers=auth(client_id), json={
+        "title": "Trabajo", "service_type": "Plomería", "payment_method": "cash",
+        "base_fee": "50.00", "address": "Av. Test", "scheduled_at": "2026-10-20T09:00:00-05:00",
+    })
+    assert response.status_code == 201, response.text
+    created = response.json()
+
+    # Hora de Lima guardada como UTC
+    assert db_session.get(Job, created["id"]).scheduled_at == datetime(2026, 10, 20, 14, 0)
+    assert created["scheduled_at"] == "2026-10-20T14:00:00Z"
+
+    [listed] = client.get("/api/jobs/my-jobs", headers=auth(client_id)).json()
+    for body in (created, listed):
+        assert body["scheduled_at"] == "2026-10-20T14:00:00Z"
+        assert body["created_at"].endswith("Z")
+        assert body["updated_at"].endswith("Z")
+    assert listed["created_at"] == created["created_at"]
@@ -0,0 +1,45 @@
+"""
+Aplicaciones concurrentes a un trabajo caliente (apply_benchmark)
+
+Las carreras solo corren contra MySQL; el INSERT ... SELECT con sus
+timestamps se prueba también sobre SQLite.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+import apply_benchmark
+from app.models.job_application import JobApplication
+from app.models.worker import Worker
+from app.services.job_service import JobService
+
+
+def test_apply_stores_utc_timestamps(db_session):
+    prefix = f"test-apply-{uuid.uuid4().hex[:8]}"
+    client_id, worker_user_ids, job_id, worker_ids = apply_benchmark.create_fixture(db_session, prefix, workers=1)
+    before = datetime.utcnow()
+    worker = db_session.get(Worker, worker_ids[0])
+    application_id = JobService.apply_to_job(db_session, job_id, worker)
+
+    application = db_session.get(JobApplication, application_id)
+    assert before - timedelta(seconds=1) <= application.created_at <= datetime.utcnow()
+    assert application.updated_at == application.created_at
+
+
+def test_concurrent_duplicate_applies_mysql(mysql_sessions):
+    workers = 40
+    db = mysql_sessions()
+    prefix = f"test-apply-{uuid.uuid4().hex[:8]}"
+    client_id, worker_user_ids, job_id, worker_ids = apply_benchmark.create_fixture(db, prefix, workers)
+    try:
+        outcomes, _, _ = apply_benchmark.run(job_id, worker_ids, threads=16, duplicates=1)
+
+        assert outcomes["applied"] == workers, outcomes
+        assert outcomes["400 Ya has aplicado a este trabajo"] == workers, outcomes
+        db.expire_all()
+        stored = db.query(func.count(JobApplication.id)).filter(JobApplication.job_id == job_id).scalar()
+        assert stored == workers
+    finally:
+        apply_benchmark.cleanup(db, client_id, worker_user_ids)
+        db.close()
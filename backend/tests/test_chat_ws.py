@@ -0,0 +1,47 @@
+"""
+Chat por WebSocket con cambios hechos después de conectar
+
+La conexión dura mucho más que un request: cada mensaje tiene que leer el
+trabajo y el remitente actuales, no los que había al abrir el socket.
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.worker import Worker
+from app.services.pending_job_index import pending_job_index
+from conftest import auth
+
+
+def _post(client, url, user_id, **kwargs):
+    response = client.post(url, headers=auth(user_id), **kwargs)
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def test_ws_message_reads_current_sender(db_session):
+    client_user = User(email="client@test.test", password_hash="x", role=UserRole.CLIENT, full_name="Cliente", phone="911")
+    worker_user = User(email="worker@test.test", password_hash="x", role=UserRole.WORKER, full_name="Trabajador", phone="922")
+    db_session.add_all([client_user, worker_user])
+    db_session.flush()
+    db_session.add(Worker(user_id=worker_user.id, full_name="Trabajador", services=["Plomería"], is_available=True))
+    db_session.commit()
+    pending_job_index.reconcile(db_session)
+
+    with TestClient(app) as client:
+        job = _post(client, "/api/jobs", client_user.id, json={
+            "title": "Trabajo", "service_type": "Plomería", "payment_method": "cash",
+            "base_fee": "50.00", "address": "Av. Test",
+        })
+        with client.websocket_connect(f"/api/chat/ws/{job['id']}", headers=auth(client_user.id)) as websocket:
+            assert websocket.receive_json()["type"] == "connected"
+            websocket.send_text(json.dumps({"content": "Antes"}))
+            assert websocket.receive_json()["data"]["sender"]["full_name"] == "Cliente"
+
+            # Cambio hecho por otro request mientras el socket sigue abierto
+            db_session.get(User, client_user.id).full_name = "Cliente Renombrado"
+            db_session.commit()
+            websocket.send_text(json.dumps({"content": "Después"}))
+            assert websocket.receive_json()["data"]["sender"]["full_name"] == "Cliente Renombrado"
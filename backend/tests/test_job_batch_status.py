@@ -0,0 +1,62 @@
+"""
+Cambios de estado en lote (JobStateMachine.apply_batch)
+
+Un trabajo que otro request lleva al mismo estado entre la validación y el
+UPDATE no debe reportarse como aplicado ni repetir hooks y notificaciones.
+"""
+from decimal import Decimal
+
+from sqlalchemy import update
+
+from app.models.job import Job, JobStatus, PaymentMethod
+from app.models.outbox import OutboxEvent
+from app.models.user import User, UserRole
+from app.services.job_state_machine import JobStateMachine
+from app.services.job_service import JobService
+
+
+def _pending_jobs(db, count):
+    client = User(email="client@test.test", password_hash="x", role=UserRole.CLIENT)
+    manager = User(email="manager@test.test", password_hash="x", role=UserRole.MANAGER)
+    db.add_all([client, manager])
+    db.flush()
+    jobs = [
+        Job(client_id=client.id, title=f"Trabajo {i}", service_type="Plomería", status=JobStatus.PENDING,
+            payment_method=PaymentMethod.CASH, base_fee=Decimal("50.00"), extras=Decimal("0.00"),
+            total_amount=Decimal("50.00"), address="Av. Test")
+        for i in range(count)
+    ]
+    db.add_all(jobs)
+    db.commit()
+    return manager.id, [job.id for job in jobs]
+
+
+def test_batch_reports_only_rows_changed_by_its_update(db_session, monkeypatch):
+    from app.database import SessionLocal
+    manager_id, job_ids = _pending_jobs(db_session, 3)
+    raced = job_ids[1]
+
+    original = JobStateMachine.rejection_for
+
+    def racing_rejection_for(transition, row, worker_id, user_id):
+        rejection = original(transition, row, worker_id, user_id)
+        if row is not None and row.id == raced:
+            # Otro request cancela el trabajo después de la validación del lote
+            other = SessionLocal()
+            other.execute(update(Job).where(Job.id == raced).values(status=JobStatus.CANCELLED))
+            other.commit()
+            other.close()
+        return rejection
+
+    monkeypatch.setattr(JobStateMachine, "rejection_for", staticmethod(racing_rejection_for))
+    results = JobService.update_jobs_status_batch(
+        db_session, [(job_id, JobStatus.CANCELLED) for job_id in job_ids], UserRole.MANAGER, manager_id
+    )
+
+    by_id = {result["job_id"]: result for result in results}
+    assert [job_id for job_id in job_ids if by_id[job_id]["applied"]] == [job_ids[0], job_ids[2]]
+    assert by_id[raced]["status_code"] == 409
+
+    notified = {event.job_id for event in db_session.query(OutboxEvent).all()}
+    assert raced not in notified
+    assert notified == {job_ids[0], job_ids[2]}
@@ -0,0 +1,41 @@
+"""
+Trabajo recién creado sin refresh
+
+create_job devuelve e indexa la entidad en memoria: tiene que verse igual que
+cuando se vuelve a leer de la BD (montos con la escala de la columna, fechas
+sin microsegundos), antes y después de que el índice de pendientes se recargue.
+"""
+import uuid
+
+import apply_benchmark
+from app.services.pending_job_index import pending_job_index
+from conftest import auth
+
+
+def test_created_job_matches_stored_values(client, db_session):
+    prefix = f"test-create-{uuid.uuid4().hex[:8]}"
+    client_id, [worker_user], _, _ = apply_benchmark.create_fixture(db_session, prefix, workers=1)
+    pending_job_index.reconcile(db_session)
+
+    response = client.post("/api/jobs", headers=auth(client_id), json={
+        "title": "Trabajo nuevo", "service_type": "Plomería", "payment_method": "cash",
+        "base_fee": "50.5", "address": "Av. Test", "latitude": "-12.0464", "longitude": "-77.0428",
+        "scheduled_at": "2026-10-20T14:00:00.250000Z",
+    })
+    assert response.status_code == 201, response.text
+    created = response.json()
+
+    def available():
+        jobs = client.get("/api/jobs/available", params={"sort": "recent"}, headers=auth(worker_user)).json()
+        return next(job for job in jobs if job["id"] == created["id"])
+
+    indexed = available()
+    pending_job_index.reconcile(db_session)
+    reloaded = available()
+
+    assert created["base_fee"] == created["total_amount"] == "50.50"
+    assert created["latitude"] == "-12.04640000"
+    assert created["scheduled_at"] == "2026-10-20T14:00:00Z"
+    assert "." not in created["created_at"]
+    for field in ("base_fee", "total_amount", "latitude", "longitude", "scheduled_at", "created_at", "updated_at"):
+        assert indexed[field] == reloaded[field] == created[field], field
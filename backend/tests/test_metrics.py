@@ -0,0 +1,50 @@
+"""
+GET /metrics y hooks de cursor de métricas y consultas lentas
+"""
+import copy
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database import engine
+from app.utils import metrics
+
+
+def test_metrics_requires_token_in_production(client, monkeypatch):
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scraper-secret")
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scraper-secret"})
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+
+
+def test_metrics_open_without_token_outside_production(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert not settings.is_production
+    assert client.get("/metrics").status_code == 200
+
+
+def test_failed_statements_leave_no_state_on_connection(db_session):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        info = copy.deepcopy(conn.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM tabla_que_no_existe"))
+            conn.rollback()
+        assert dict(conn.info) == info
+
+        stats = metrics.RequestStats()
+        token = metrics._current.set(stats)
+        try:
+            conn.execute(text("SELECT 1"))
+        finally:
+            metrics._current.reset(token)
+        assert stats.statements == 1
+        assert 0 <= stats.db_seconds < 1
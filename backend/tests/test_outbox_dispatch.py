@@ -0,0 +1,50 @@
+"""
+Despachador del outbox: arranca con la aplicación (sin scheduler) y entrega
+el primer evento escrito después del arranque
+"""
+import time
+import uuid
+
+import apply_benchmark
+from app.models.outbox import OutboxEvent
+from app.services.outbox import DASHBOARD, outbox_dispatcher
+from app.services.pending_job_index import pending_job_index
+from app.config import settings
+from conftest import auth
+
+
+def _next_notification(websocket, attempts: int = 50) -> dict:
+    """Primera notificación que no sea pong (ping entre intentos: no bloquea si nunca llega)"""
+    for _ in range(attempts):
+        websocket.send_text("ping")
+        message = websocket.receive_json()
+        if message["type"] != "pong":
+            return message
+        time.sleep(0.02)
+    raise AssertionError("La notificación no llegó")
+
+
+def test_first_event_after_startup_is_delivered(db_session):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    assert not settings.SCHEDULER_ENABLED
+    prefix = f"test-outbox-{uuid.uuid4().hex[:8]}"
+    client_id, worker_user_ids, job_id, _ = apply_benchmark.create_fixture(db_session, prefix, workers=1)
+    # Evento anterior al arranque: no se reenvía a las conexiones nuevas
+    db_session.add(OutboxEvent(event_type=DASHBOARD, user_id=client_id, payload={"type": "old", "data": {}}))
+    db_session.commit()
+    pending_job_index.reconcile(db_session)
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/notifications/ws/dashboard", headers=auth(client_id)) as websocket:
+            assert websocket.receive_json()["type"] == "connected"
+
+            response = client.post(f"/api/jobs/{job_id}/apply", headers=auth(worker_user_ids[0]))
+            assert response.status_code == 200
+
+            message = _next_notification(websocket)
+            assert message["type"] == "new_application"
+            assert message["data"]["job_id"] == job_id
+
+    assert outbox_dispatcher._task is None
@@ -0,0 +1,67 @@
+"""
+Modo Plus vencido con el flag todavía encendido
+
+La tarea de expiración apaga is_plus_active con retraso; mientras tanto las
+lecturas que dan acceso deben respetar plus_expires_at.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import apply_benchmark
+from app.models.user import User
+from app.models.worker import Worker
+from app.services.pending_job_index import pending_job_index
+from conftest import auth
+
+
+def _plus_fixture(db, expires_at):
+    prefix = f"test-plus-{uuid.uuid4().hex[:8]}"
+    client_id, worker_user_ids, job_id, worker_ids = apply_benchmark.create_fixture(db, prefix, workers=1)
+    db.get(User, client_id).phone = "999888777"
+    worker = db.get(Worker, worker_ids[0])
+    worker.plus_expires_at = expires_at
+    db.commit()
+    assert worker.is_plus_active
+    return worker_user_ids[0], job_id
+
+
+def _expired_fixture(db):
+    return _plus_fixture(db, datetime.utcnow() - timedelta(minutes=1))
+
+
+def test_apply_rejects_expired_plus(client, db_session):
+    user_id, job_id = _expired_fixture(db_session)
+
+    response = client.post(f"/api/jobs/{job_id}/apply", headers=auth(user_id))
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Necesitas un plan Modo Plus activo para aplicar a trabajos"
+
+
+def test_available_redacts_for_expired_plus(client, db_session):
+    user_id, job_id = _expired_fixture(db_session)
+    pending_job_index.reconcile(db_session)
+
+    response = client.get("/api/jobs/available", params={"sort": "recent"}, headers=auth(user_id))
+
+    assert response.status_code == 200
+    [job] = response.json()
+    assert job["id"] == job_id
+    assert job["client"]["phone"] is None
+
+
+def test_status_reports_expired_plus(client, db_session):
+    user_id, _ = _expired_fixture(db_session)
+
+    response = client.get("/api/subscriptions/me/status", headers=auth(user_id))
+
+    assert response.status_code == 200
+    assert response.json()["is_plus_active"] is False
+
+
+def test_plus_without_expiry_stays_active(client, db_session):
+    # plus_expires_at NULL con el flag encendido: Modo Plus sin vencimiento
+    user_id, job_id = _plus_fixture(db_session, expires_at=None)
+
+    assert client.get("/api/subscriptions/me/status", headers=auth(user_id)).json()["is_plus_active"] is True
+    assert client.post(f"/api/jobs/{job_id}/apply", headers=auth(user_id)).status_code == 200